@@ -1,44 +1,139 @@
 # agentic_workflow_main.py
+from __future__ import annotations
+
 import os
+import copy
+import hashlib
 import json
 import asyncio
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
 
-# Imports from other files in the project
-from app.core.workflow import FounderAnalysisOrchestrator
-from app.agents.analysis_report_agent import create_analysis_agent, run_analysis_agent
+# Imports from other files in the project. The agents (and the provider SDKs they
+# pull in) are imported on first use so importing this module stays cheap.
+from app.core.checkpoints import current_checkpoints
+from app.core.deadline import ANALYSIS_DEADLINE_SECONDS, REPORT_RESERVE_SECONDS, bounded_timeout, deadline_scope
+from app.core.enrichment_cache import get_enrichment_cache
+from app.core.singleflight import EventCallback, SingleFlight
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from app.core.workflow import FounderAnalysisOrchestrator
+
+# Process-wide, so identical payloads submitted at the same time run only once.
+analysis_flights = SingleFlight()
+
+def analysis_payload_key(prospect_data: dict, interview_file: str) -> str:
+    """Hashes the parts of a payload that determine the analysis result."""
+    canonical = json.dumps({"data": prospect_data.get("data"), "interview_file": interview_file}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def load_api_keys() -> tuple[str, str]:
+    """Loads the OpenRouter and Tavily API keys, failing if any required variable is missing."""
+    load_dotenv()
+    openrouter_api_key = os.getenv("API_KEY")
+    tavily_api_key = os.getenv("TAVILY_API_KEY")
+    linkedin_cookie = os.getenv("LINKEDIN_COOKIE")
+
+    if not all([openrouter_api_key, tavily_api_key, linkedin_cookie]):
+        raise ValueError("One or more required environment variables (API_KEY, TAVILY_API_KEY, LINKEDIN_COOKIE) are missing from your .env file.")
+    return openrouter_api_key, tavily_api_key
 
-async def run_founder_analysis(prospect_data: dict, interview_file: str = "output_samples/sample_interview_analysis_input.json"):
+async def run_founder_analysis(
+    prospect_data: dict,
+    interview_file: str = "output_samples/sample_interview_analysis_input.json",
+    on_event: Optional[EventCallback] = None,
+    orchestrator: Optional[FounderAnalysisOrchestrator] = None,
+    report_agent: Optional[Agent] = None,
+    deadline_seconds: Optional[float] = None
+):
     """
-    Run the founder analysis workflow with provided prospect data.
+    Run the founder analysis workflow with provided prospect data. Concurrent calls
+    with the same payload share a single run and its events. Sources still running
+    when the deadline nears are cancelled and the report is written from the data
+    that arrived, with the missing sources listed in `missing_sources`.
     
     Args:
         prospect_data: The data from the frontend POST request
         interview_file: Path to the interview data file (optional)
+        on_event: Optional callback receiving (event_name, data) progress events and
+            partial results: `source_result`, `founder_complete`, `interview_merge`
+            and `report`
+        orchestrator: Long-lived orchestrator to reuse; a new one is built if omitted
+        report_agent: Long-lived report agent to reuse; a new one is built if omitted
+        deadline_seconds: Overall time budget; defaults to ANALYSIS_DEADLINE_SECONDS
+            (<= 0 disables it)
     
     Returns:
         dict: Complete analysis results including the analysis report
     """
-    # Load environment variables
-    load_dotenv()
-    openrouter_api_key = os.getenv("API_KEY")
-    tavily_api_key = os.getenv("TAVILY_API_KEY")
-    linkedin_cookie = os.getenv("LINKEDIN_COOKIE")
+    if deadline_seconds is None:
+        deadline_seconds = ANALYSIS_DEADLINE_SECONDS
+    # Inside a checkpoint_scope, every stage result this caller receives is saved
+    checkpoints = current_checkpoints.get()
+    if checkpoints is not None:
+        on_event = checkpoints.recorder(on_event)
+    # The shared run inherits the deadline of the caller that starts it; callers that
+    # join it still stop waiting at their own deadline
+    with deadline_scope(deadline_seconds):
+        shared_output = await analysis_flights.do(
+            analysis_payload_key(prospect_data, interview_file),
+            lambda emit: _run_founder_analysis(prospect_data, interview_file, emit, orchestrator, report_agent),
+            on_event=on_event
+        )
+    # Every caller gets its own copy, keeping its own request metadata
+    final_output = copy.deepcopy(shared_output)
+    for field in ("id", "received_at"):
+        if field in prospect_data:
+            final_output[field] = prospect_data[field]
+    return final_output
 
-    if not all([openrouter_api_key, tavily_api_key, linkedin_cookie]):
-        raise ValueError("One or more required environment variables (API_KEY, TAVILY_API_KEY, LINKEDIN_COOKIE) are missing from your .env file.")
+async def _run_founder_analysis(
+    prospect_data: dict,
+    interview_file: str,
+    on_event: EventCallback,
+    orchestrator: Optional[FounderAnalysisOrchestrator],
+    report_agent: Optional[Agent]
+):
+    """Runs the enrichment, interview merge and report stages for one payload."""
+    if orchestrator is None:
+        from app.core.workflow import FounderAnalysisOrchestrator
 
-    # Initialize and run the orchestrator with the provided data
-    orchestrator = FounderAnalysisOrchestrator(
-        openrouter_api_key=openrouter_api_key,
-        tavily_api_key=tavily_api_key
-    )
+        # Initialize the orchestrator for this run only
+        openrouter_api_key, tavily_api_key = load_api_keys()
+        orchestrator = FounderAnalysisOrchestrator(
+            openrouter_api_key=openrouter_api_key,
+            tavily_api_key=tavily_api_key,
+            cache=get_enrichment_cache()
+        )
     
+    def emit(event: str, **data):
+        on_event(event, data)
+
     # Run the workflow with the prospect data from the POST request
-    final_output = await orchestrator.run(prospect_data)
+    emit("stage", stage="enrichment", status="running")
+    # Sources must finish early enough to leave the report its share of the deadline
+    with deadline_scope(reserve=REPORT_RESERVE_SECONDS):
+        final_output = await orchestrator.run(prospect_data, on_event=on_event)
+    final_output["missing_sources"] = [
+        {"founder_id": founder.get("id"), "founder_name": founder.get("name"), "source": source, "reason": reason}
+        for founder in final_output["data"]["teamList"]
+        for source, reason in (founder.get("missing_sources") or {}).items()
+    ]
+    emit("stage", stage="enrichment", status="completed", missing_sources=final_output["missing_sources"])
 
     # Load interview data if file exists
-    if os.path.exists(interview_file):
+    emit("stage", stage="interview_merge", status="running")
+    # Stages a previous run of this job finished are taken from its checkpoints
+    checkpoints = current_checkpoints.get()
+    merged = checkpoints.load("interview_merge") if checkpoints is not None else None
+    if merged is not None:
+        print("[Checkpoint] Reusing the interview merge")
+        inter_dict = {item["founder_id"]: item["interview_analysis"] for item in merged if item.get("interview_analysis") is not None}
+        for founder in final_output["data"]["teamList"]:
+            if founder["id"] in inter_dict:
+                founder["interview_analysis"] = inter_dict[founder["id"]]
+    elif os.path.exists(interview_file):
         with open(interview_file, "r") as f:
             interview_data = json.load(f)
         inter_dict = {item["id"]: item for item in interview_data}
@@ -49,21 +144,47 @@ async def run_founder_analysis(prospect_data: dict, interview_file: str = "outpu
                 founder["interview_analysis"] = inter_dict[founder["id"]]
     else:
         print(f"Interview file '{interview_file}' not found. Skipping interview analysis.")
+    emit("interview_merge", founders=[
+        {"founder_id": founder.get("id"), "interview_analysis": founder.get("interview_analysis")}
+        for founder in final_output["data"]["teamList"]
+    ])
+    emit("stage", stage="interview_merge", status="completed")
 
     # Generate analysis report
+    emit("stage", stage="report", status="running")
+    saved_report = checkpoints.load("report") if checkpoints is not None else None
+    if saved_report is not None:
+        print("[Checkpoint] Reusing the analysis report")
+        final_output["analysis_report"] = saved_report
+    else:
+        final_output["analysis_report"] = await _generate_report(final_output, report_agent)
+    emit("report", report=final_output["analysis_report"])
+    emit("stage", stage="report", status="failed" if "error" in final_output["analysis_report"] else "completed")
+
+    return final_output
+
+async def _generate_report(final_output: dict, report_agent: Optional[Agent]) -> dict:
+    """Runs the report agent on the enriched team, within what is left of the deadline."""
+    from app.agents.analysis_report_agent import create_analysis_agent, run_analysis_agent
+
     try:
-        a_agent = create_analysis_agent()
-        report = await run_analysis_agent(a_agent, json.dumps(final_output["data"]["teamList"]))
-        report_json = report.dict()
-        
-        # Add the analysis report to the final output
-        final_output["analysis_report"] = report_json
-        
+        a_agent = report_agent or create_analysis_agent()
+        # Missing sources reach the prompt once, as the run-level note, not again per founder
+        team_list = [
+            {key: value for key, value in founder.items() if key != "missing_sources"}
+            for founder in final_output["data"]["teamList"]
+        ]
+        report = await asyncio.wait_for(
+            run_analysis_agent(a_agent, json.dumps(team_list), final_output["missing_sources"]),
+            timeout=bounded_timeout(None)
+        )
+        return report.dict()
+    except asyncio.TimeoutError:
+        print("Analysis report was cut off by the analysis deadline")
+        return {"error": "Report generation did not finish before the analysis deadline", "status": "deadline_exceeded"}
     except Exception as e:
         print(f"Error generating analysis report: {e}")
-        final_output["analysis_report"] = {"error": f"Failed to generate report: {str(e)}"}
-
-    return final_output
+        return {"error": f"Failed to generate report: {str(e)}"}
 
 async def main(input_file="output_samples/sample_frontend_input.json", interview_file="output_samples/sample_interview_analysis_input.json"):
     """
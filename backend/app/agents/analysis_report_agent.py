@@ -1,14 +1,20 @@
 import asyncio
+import json
 import os
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
 from pydantic_ai import Agent
 from pydantic_ai.mcp import MCPServerStdio
 
-load_dotenv()
+from app.core.llm_cache import get_llm_cache, llm_cache_key
+from app.core.prompt_loader import load_prompt
+from app.core.resilience import call_with_retries
+from app.core.scheduler import agent_run_tokens, estimate_tokens, scheduler
+
+
+ANALYSIS_MODEL = "anthropic:claude-4-sonnet-20250514"
 
 # Define the output schema for AI responses
 class AnalysisReport(BaseModel):
@@ -21,20 +27,53 @@ class AnalysisReport(BaseModel):
 def create_analysis_agent() -> Agent:
     """Create an agent for generating analysis reports."""
     # Load the system prompt from the new prompts directory
-    with open("backend/app/core/prompts/analysis_report_system.txt", "r") as prompt_file:
-        system_prompt = prompt_file.read()
+    system_prompt = load_prompt("analysis_report_system.txt")
 
     agent = Agent(
-        model="anthropic:claude-4-sonnet-20250514",
+        model=ANALYSIS_MODEL,
         output_type=AnalysisReport,
         system_prompt=system_prompt,
     )
     return agent
 
-async def run_analysis_agent(agent: Agent, teams_data: str):
+def missing_sources_note(missing_sources: List[Dict[str, Any]]) -> str:
+    """Prompt section listing the founder sources that returned no data."""
+    if not missing_sources:
+        return ""
+    return (
+        "\n\nThe following sources returned no data for this run (timed out, cut off by the analysis "
+        "deadline, or failed). Treat them as unknown, not as a negative signal:\n"
+        + json.dumps(missing_sources)
+    )
+
+async def run_analysis_agent(agent: Agent, teams_data: str, missing_sources: Optional[List[Dict[str, Any]]] = None):
     """Ask the agent to call the appropriate LinkedIn tool to fetch a profile for a URL."""
 
-    with open("backend/app/core/prompts/analysis_report_search.txt", "r") as prompt_file:
-        prompt = prompt_file.read()
-    agent_response = await agent.run(prompt+ teams_data)
+    prompt = load_prompt("analysis_report_search.txt")
+    teams_data += missing_sources_note(missing_sources or [])
+
+    # Reuse the report for an identical team when the LLM response cache is enabled
+    cache = get_llm_cache()
+    if cache is not None:
+        cache_key = llm_cache_key(
+            ANALYSIS_MODEL,
+            system_prompt=load_prompt("analysis_report_system.txt"),
+            prompt=prompt + teams_data,
+            output_schema=AnalysisReport.model_json_schema(),
+        )
+        cached = cache.get("analysis_report", cache_key)
+        if cached is not None:
+            return AnalysisReport.model_validate(cached)
+
+    async def run_once():
+        async with scheduler.slot("anthropic", tokens=estimate_tokens(prompt + teams_data)) as lease:
+            result = await agent.run(prompt + teams_data)
+            used = agent_run_tokens(result)
+            if used:
+                lease.report_tokens(used)
+            return result
+
+    agent_response = await call_with_retries("anthropic", run_once)
+    if cache is not None:
+        cache.set("analysis_report", cache_key, agent_response.output.model_dump())
     return agent_response.output
\ No newline at end of file
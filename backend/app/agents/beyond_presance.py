@@ -1,14 +1,21 @@
 import argparse
 import json
 import os
+import sys
 from datetime import datetime
 from typing import Dict, Any, Optional
 
 import requests
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+# Add the project root directory to the Python path, so the script also runs directly
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(PROJECT_ROOT)
+
+from app.core.llm_cache import generate_json_cached
+
 API_URL = "https://api.bey.dev/v1"
+GEMINI_MODEL = "gemini-1.5-flash"
 
 
 def create_compatibility_analysis_prompt(transcript1: Dict, transcript2: Dict) -> str:
@@ -61,10 +68,13 @@ def analyze_founder_compatibility(transcript1: Dict, transcript2: Dict, google_a
     Returns:
         Dictionary containing compatibility analysis results
     """
+    # Imported here so loading this module does not pull in the Gemini SDK
+    import google.generativeai as genai
+
     try:
         # Configure Gemini API
         genai.configure(api_key=google_api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        model = genai.GenerativeModel(GEMINI_MODEL)
         
         # Create analysis prompt
         prompt = create_compatibility_analysis_prompt(transcript1, transcript2)
@@ -76,22 +86,12 @@ def analyze_founder_compatibility(transcript1: Dict, transcript2: Dict, google_a
             "max_output_tokens": 4000,  # Sufficient for streamlined response
             "temperature": 0.1,         # Low temperature for consistent JSON
         }
-        response = model.generate_content(prompt, generation_config=generation_config)
-        
-        # Clean the response text to extract JSON (remove code blocks if present)
-        response_text = response.text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]  # Remove ```json
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]  # Remove ```
-        response_text = response_text.strip()
-        
-        # Parse JSON response
-        analysis_result = json.loads(response_text)
+        # Reuse the analysis of identical transcripts when the LLM response cache is enabled
+        analysis_result = generate_json_cached(model, prompt, generation_config)
         
         # Add metadata
         analysis_result["metadata"] = {
-            "model_used": "gemini-1.5-flash",
+            "model_used": GEMINI_MODEL,
             "analysis_timestamp": datetime.now().isoformat(),
             "founder1_id": transcript1.get("actor", "unknown"),
             "founder2_id": transcript2.get("actor", "unknown")
@@ -107,7 +107,7 @@ def analyze_founder_compatibility(transcript1: Dict, transcript2: Dict, google_a
             "success": False,
             "error": "json_decode_error",
             "message": f"Failed to parse Gemini response as JSON: {str(e)}",
-            "raw_response": response_text if 'response_text' in locals() else (response.text if 'response' in locals() else None)
+            "raw_response": e.doc
         }
     except Exception as e:
         return {
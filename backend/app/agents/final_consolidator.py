@@ -12,7 +12,9 @@ from app.core.base_openrouter_agent import BaseOpenRouterAgent
 
 
 # --- The Master Prompt is defined as a constant within the file ---
-FINAL_ANALYSIS_PROMPT = """
+# The rubric and schema never change, so they form the system message and are
+# cached by the provider; the per-request data follows in FINAL_ANALYSIS_CONTEXT.
+FINAL_ANALYSIS_SYSTEM_PROMPT = """
 You are a Senior Investment Partner at a top-tier venture capital firm called "Unicorn Radar". Your task is to synthesize preliminary research and founder interview analyses into a single, comprehensive, and data-driven investment report for the executive committee.
 
 You will be provided with two JSON objects:
@@ -21,22 +23,11 @@ You will be provided with two JSON objects:
 
 Your job is to act as the final human-in-the-loop, combining these quantitative and qualitative data points into a polished, final report.
 
-**CONTEXTUAL DATA:**
----
-<RESEARCH_DATA>
-{research_data}
-</RESEARCH_DATA>
-
-<INTERVIEW_ANALYSIS>
-{interview_analysis}
-</INTERVIEW_ANALYSIS>
----
-
 **YOUR TASK:**
-Carefully review all the provided data and generate a single, valid JSON object that strictly adheres to the following schema. Do NOT add any text or markdown before or after the JSON object.
+Carefully review all the provided data (given in the user message) and generate a single, valid JSON object that strictly adheres to the following schema. Do NOT add any text or markdown before or after the JSON object.
 
 **JSON OUTPUT SCHEMA:**
-{{
+{
   "overallScore": <A float from 0.0 to 10.0 representing the overall investment potential. Use the following strict scale:
     - 0: Fundamentally non-viable business.
     - 1: Severe red flags in all areas.
@@ -85,12 +76,12 @@ Carefully review all the provided data and generate a single, valid JSON object
     - 8: Strong, distinct expertise in all critical domains.
     - 9: Each founder is a 10/10 in their respective, essential domain.
     - 10: Perfect yin-yang, the ideal blend of visionary, builder, and seller.>,
-  "researchDepth": {{
+  "researchDepth": {
     "hIndex": <An integer representing the highest h-index found among the founders from the research data, or 0 if not available.>
-  }},
+  },
   "founderHighlights": [
     // For each founder, create an object.
-    {{
+    {
       "name": "<The founder's full name>",
       "highlights": [
         "<A key highlight based on their LinkedIn profile (e.g., 'Ex-Google AI researcher with 5 years of experience in NLP').>",
@@ -98,11 +89,11 @@ Carefully review all the provided data and generate a single, valid JSON object
         "<A key highlight based on their educational background (e.g., 'PhD in Computer Science from Stanford University').>"
       ],
       "comments": "<A 1-2 sentence summary of the founder's strengths and potential weaknesses based on the research data.>"
-    }}
+    }
   ],
   "interviewHighlights": [
     // For each key question/theme from the interview analysis, create an object.
-    {{
+    {
       "question": "<The core question or theme from the interview (e.g., 'Co-founder Conflict Resolution').>",
       "summary": "<A concise summary of the founder's response and the AI's analysis of it.>",
       "keyInsights": [
@@ -111,9 +102,9 @@ Carefully review all the provided data and generate a single, valid JSON object
       ],
       "score": <A float score from 0.0 to 10.0 for this specific interview aspect. Use the scale: 0=Terrible, 5=Average, 10=Exceptional.>,
       "person": "<The name of the founder who was asked or whose response is being highlighted.>"
-    }}
+    }
   ]
-}}
+}
 
 **INSTRUCTIONS:**
 - Adhere strictly to the scoring rubrics provided for each metric.
@@ -124,16 +115,47 @@ Carefully review all the provided data and generate a single, valid JSON object
 - Ensure all floating-point numbers have one decimal place.
 """
 
+FINAL_ANALYSIS_CONTEXT = """
+**CONTEXTUAL DATA:**
+---
+<RESEARCH_DATA>
+{research_data}
+</RESEARCH_DATA>
+
+<INTERVIEW_ANALYSIS>
+{interview_analysis}
+</INTERVIEW_ANALYSIS>
+---
+"""
+
 
 class ConsolidatorAgent(BaseOpenRouterAgent):
     """
     An agent that synthesizes research and interview data into a final
     investment report for the front end.
     """
+    cache_namespace = "consolidator"
+
     def __init__(self, openrouter_api_key: str):
         # Using a powerful model for this complex synthesis task
         super().__init__(api_key=openrouter_api_key, model="anthropic/claude-3.7-sonnet")
 
+    def _build_messages(self, research_data: Dict[str, Any], interview_analysis: Dict[str, Any]) -> list[dict]:
+        # Convert the input dictionaries to formatted JSON strings for the prompt
+        research_data_str = json.dumps(research_data, indent=2)
+        interview_analysis_str = json.dumps(interview_analysis, indent=2)
+
+        # The variable context goes last so the static prefix stays cacheable
+        context = FINAL_ANALYSIS_CONTEXT.format(
+            research_data=research_data_str,
+            interview_analysis=interview_analysis_str
+        )
+
+        return [
+            self._cacheable_system_message(FINAL_ANALYSIS_SYSTEM_PROMPT),
+            {"role": "user", "content": context}
+        ]
+
     def synthesize_report(self, research_data: Dict[str, Any], interview_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generates the final analysis report by synthesizing all available data.
@@ -147,23 +169,21 @@ class ConsolidatorAgent(BaseOpenRouterAgent):
         """
         print("Agent [Consolidator]: Starting final synthesis...")
 
-        # Convert the input dictionaries to formatted JSON strings for the prompt
-        research_data_str = json.dumps(research_data, indent=2)
-        interview_analysis_str = json.dumps(interview_analysis, indent=2)
+        # Send the request to the LLM and get the structured JSON output
+        final_report = self._send_llm_request(self._build_messages(research_data, interview_analysis))
 
-        # Populate the master prompt with the context
-        prompt = FINAL_ANALYSIS_PROMPT.format(
-            research_data=research_data_str,
-            interview_analysis=interview_analysis_str
-        )
+        if "error" in final_report:
+            print(f"Agent [Consolidator]: Failed to generate report. Error: {final_report['error']}")
+            return final_report
+        
+        print("Agent [Consolidator]: Synthesis complete.")
+        return final_report
 
-        messages = [
-            {"role": "system", "content": "You are a VC investment partner creating a final JSON report according to a strict schema and rubric."},
-            {"role": "user", "content": prompt}
-        ]
+    async def asynthesize_report(self, research_data: Dict[str, Any], interview_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of synthesize_report for use inside the event loop."""
+        print("Agent [Consolidator]: Starting final synthesis...")
 
-        # Send the request to the LLM and get the structured JSON output
-        final_report = self._send_llm_request(messages)
+        final_report = await self._asend_llm_request(self._build_messages(research_data, interview_analysis))
 
         if "error" in final_report:
             print(f"Agent [Consolidator]: Failed to generate report. Error: {final_report['error']}")
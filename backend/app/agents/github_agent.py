@@ -1,24 +1,28 @@
 # /Complete workflow/agents/research/github_agent.py
+import asyncio
 import os
 import sys
 import json
+from typing import Optional
+
+import httpx
 from dotenv import load_dotenv
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient
 
 # Add the project root directory to the Python path
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.append(PROJECT_ROOT)
 
+from app.agents.github_api import GitHubAPIClient, GitHubAPIError, format_profile_context, get_github_api_client
+from app.agents.github_repo_parser import extract_repo_urls, profile_owner
 from app.core.base_openrouter_agent import BaseOpenRouterAgent
+from app.core.scheduler import scheduler
 
 # --- Prompt is now a constant inside the Python file ---
-GITHUB_ANALYSIS_PROMPT = """
-You are an expert CTO performing technical due diligence on a software developer's GitHub profile. Based *only* on the provided detailed context, which includes a profile overview and summaries of their featured repositories, your task is to perform a comprehensive analysis.
-
-**SEARCH CONTEXT:**
----
-{search_context}
----
+# The instructions and schema are static and sent as a cacheable system message;
+# the extracted profile content follows in GITHUB_ANALYSIS_CONTEXT.
+GITHUB_ANALYSIS_SYSTEM_PROMPT = """
+You are an expert CTO performing technical due diligence on a software developer's GitHub profile. Based *only* on the provided detailed context (given in the user message), which includes a profile overview and summaries of their featured repositories, your task is to perform a comprehensive analysis.
 
 **Your Task:**
 Extract, analyze, and summarize the developer's GitHub presence into a structured JSON object. Focus on tangible evidence of skill, project complexity, and influence.
@@ -30,13 +34,20 @@ Extract, analyze, and summarize the developer's GitHub presence into a structure
 - If no information is found for a field, use an empty list or "N/A".
 
 Your response must be a single JSON object with this exact schema:
-{{
+{
   "User_Profile": "<A concise summary of their profile, e.g., 'A software engineer with a focus on open-source contributions and web development.'>",
   "key_languages": ["<List of languages, e.g., 'Python', 'TypeScript'>"],
   "notable_repositories": ["<List of repo names, e.g., 'unicorn-radar-backend'>"],
   "project_complexity_assessment": "<Analyze the complexity and purpose of their key projects based on the README summaries. Is this a simple portfolio or complex software?>",
   "technical_focus": "<A concise summary of their likely expertise, e.g., 'Frontend Development with a focus on data visualization.'>"
-}}
+}
+"""
+
+GITHUB_ANALYSIS_CONTEXT = """
+**SEARCH CONTEXT:**
+---
+{search_context}
+---
 """
 
 class GithubAgent(BaseOpenRouterAgent):
@@ -45,17 +56,18 @@ class GithubAgent(BaseOpenRouterAgent):
     It directly extracts content from the profile and featured repositories to
     provide a rich context for LLM analysis.
     """
-    def __init__(self, openrouter_api_key: str, tavily_api_key: str):
+    cache_namespace = "github_agent"
+
+    def __init__(self, openrouter_api_key: str, tavily_api_key: str, github_api: Optional[GitHubAPIClient] = None):
         super().__init__(api_key=openrouter_api_key)
         if not tavily_api_key:
             raise ValueError("Tavily API key is not set.")
-        self.tavily_client = TavilyClient(api_key=tavily_api_key)
+        self.async_tavily_client = AsyncTavilyClient(api_key=tavily_api_key)
+        # Native GitHub API source; Tavily scraping is the fallback when it fails
+        self.github_api = github_api or get_github_api_client()
         # The prompt path is no longer needed.
 
-    def _extract_repo_urls_from_content(self, profile_content: str, base_url: str) -> list[str]:
-        """Uses an LLM to parse the raw content and find repository URLs."""
-        print("  -> Using LLM to extract repository URLs from profile content...")
-        
+    def _build_repo_extraction_messages(self, profile_content: str, base_url: str) -> list[dict]:
         prompt = f"""
         From the following raw web page content of a GitHub profile, extract the full URLs of the user's pinned or featured repositories.
         The base URL for the profile is {base_url}. The repository URLs will start with this base URL.
@@ -69,72 +81,125 @@ class GithubAgent(BaseOpenRouterAgent):
         Example: {{"repository_urls": ["https://github.com/user/repo1", "https://github.com/user/repo2"]}}
         """
         
-        messages = [
+        return [
             {"role": "system", "content": "You are a precise information extraction tool. Your only task is to find GitHub repository URLs in text and return them as a JSON list."},
             {"role": "user", "content": prompt}
         ]
-        
-        response = self._send_llm_request(messages)
+
+    async def _extract_repo_urls_from_content(self, profile_content: str, base_url: str) -> list[str]:
+        """Uses an LLM to parse the raw content and find repository URLs."""
+        print("  -> Using LLM to extract repository URLs from profile content...")
+        response = await self._asend_llm_request(self._build_repo_extraction_messages(profile_content, base_url))
         return response.get("repository_urls", []) if isinstance(response, dict) else []
 
+    async def _find_repo_urls(self, profile_content: str, base_url: str) -> list[str]:
+        """Parses repository URLs locally, asking the LLM only when the parser finds none."""
+        repo_urls = extract_repo_urls(profile_content, base_url)
+        if repo_urls:
+            print(f"  -> Parsed {len(repo_urls)} repository URLs from profile content.")
+            return repo_urls
+        return await self._extract_repo_urls_from_content(profile_content, base_url)
+
+    @staticmethod
+    def _profile_content(github_url: str, profile_extract_result: dict) -> tuple[str, dict]:
+        """Returns the raw profile page content, or an error dict if there is none."""
+        if not profile_extract_result or not profile_extract_result.get('results'):
+            return "", {"error": f"Failed to extract content from {github_url}"}
+        
+        profile_content = profile_extract_result['results'][0].get('raw_content', '')
+        if not profile_content:
+            return "", {"error": "Extracted content was empty."}
+        return profile_content, {}
+
+    @staticmethod
+    def _consolidate_repos_content(repo_extract_results: dict) -> str:
+        content_parts = []
+        for result in repo_extract_results.get('results', []):
+            content_parts.append(f"--- REPO: {result['url']} ---\n{result.get('raw_content', 'No content found.')}\n\n")
+        return "".join(content_parts)
+
+    @staticmethod
+    def _build_context_messages(search_context: str) -> list[dict]:
+        # Static instructions first, extracted content last, so the prefix is cacheable
+        context = GITHUB_ANALYSIS_CONTEXT.format(search_context=search_context)
+        return [BaseOpenRouterAgent._cacheable_system_message(GITHUB_ANALYSIS_SYSTEM_PROMPT), {"role": "user", "content": context}]
+
+    @staticmethod
+    def _build_analysis_messages(profile_content: str, consolidated_repos_content: str) -> list[dict]:
+        print("  -> Stage 4: Consolidating all extracted content for final analysis...")
+        final_context = (
+            f"**Main Profile Page Content:**\n{profile_content[:5000]}\n\n"
+            f"**Featured Repositories Content (from their READMEs):**\n{consolidated_repos_content}"
+        )
+        return GithubAgent._build_context_messages(final_context)
+
+    async def _aanalyze_via_api(self, github_url: str) -> Optional[dict]:
+        """Analyses the profile from GitHub API data; returns None if the API is unavailable."""
+        login = profile_owner(github_url)
+        if not login:
+            return None
+        try:
+            profile = await self.github_api.fetch_profile(login)
+        except (GitHubAPIError, httpx.HTTPError) as e:
+            print(f"  -> GitHub API unavailable for {login} ({e}), falling back to page extraction.")
+            return None
+        print(f"  -> Fetched profile of {login} from the GitHub API ({profile['source']}).")
+        return await self._asend_llm_request(self._build_context_messages(format_profile_context(profile)))
+
     def analyze_profile(self, github_url: str) -> dict:
+        """
+        Blocking variant of aanalyze_profile for scripts; it must not be called from
+        a running event loop.
+        """
+        async def run() -> dict:
+            try:
+                return await self.aanalyze_profile(github_url)
+            finally:
+                # The pooled HTTP clients are bound to this loop, which asyncio.run closes
+                await self.github_api.aclose()
+                await BaseOpenRouterAgent.aclose_shared_client()
+
+        return asyncio.run(run())
+
+    async def aanalyze_profile(self, github_url: str) -> dict:
+        """
+        Analyses a GitHub profile. Uses the GitHub API when it is reachable and falls
+        back to Tavily page extraction otherwise.
+        """
         print(f"Agent [GitHub]: Starting direct extraction analysis for: {github_url}")
         if not github_url or "github.com" not in github_url:
             return {"error": "Invalid GitHub URL provided."}
             
         try:
+            api_analysis = await self._aanalyze_via_api(github_url)
+            if api_analysis is not None:
+                print(f"Agent [GitHub]: Finished analysis for {github_url}")
+                return api_analysis
+
             # --- Stage 1: Extract content from the main profile page ---
-            print(f"  -> Stage 1: Extracting content from main profile URL...")
-            profile_extract_result = self.tavily_client.extract([github_url], extract_depth='advanced')
-            
-            if not profile_extract_result or not profile_extract_result.get('results'):
-                return {"error": f"Failed to extract content from {github_url}"}
-            
-            profile_content = profile_extract_result['results'][0].get('raw_content', '')
-            if not profile_content:
-                return {"error": "Extracted content was empty."}
+            print("  -> Stage 1: Extracting content from main profile URL...")
+            async with scheduler.slot("tavily"):
+                profile_extract_result = await self.async_tavily_client.extract([github_url], extract_depth='advanced')
+            profile_content, error = self._profile_content(github_url, profile_extract_result)
+            if error:
+                return error
 
             # --- Stage 2: Parse the profile content to find repository URLs ---
-            top_repo_urls = self._extract_repo_urls_from_content(profile_content, github_url)
+            top_repo_urls = await self._find_repo_urls(profile_content, github_url)
 
             # --- Stage 3: Extract content from the discovered repositories ---
             consolidated_repos_content = "No specific repositories were analyzed."
             if top_repo_urls:
                 print(f"  -> Stage 3: Found {len(top_repo_urls)} repos. Extracting their content: {top_repo_urls}")
-                repo_extract_results = self.tavily_client.extract(top_repo_urls, extract_depth='advanced')
-                
-                content_parts = []
-                for result in repo_extract_results.get('results', []):
-                    content_parts.append(f"--- REPO: {result['url']} ---\n{result.get('raw_content', 'No content found.')}\n\n")
-                consolidated_repos_content = "".join(content_parts)
+                async with scheduler.slot("tavily"):
+                    repo_extract_results = await self.async_tavily_client.extract(top_repo_urls, extract_depth='advanced')
+                consolidated_repos_content = self._consolidate_repos_content(repo_extract_results)
             else:
-                print("  -> Stage 3: No featured repository URLs found by the LLM.")
+                print("  -> Stage 3: No featured repository URLs found.")
 
             # --- Stage 4: Consolidate all content and generate the final analysis ---
-            print("  -> Stage 4: Consolidating all extracted content for final analysis...")
-            final_context = (
-                f"**Main Profile Page Content:**\n{profile_content[:5000]}\n\n"
-                f"**Featured Repositories Content (from their READMEs):**\n{consolidated_repos_content}"
-            )
-
-            # Use the in-file prompt constant directly
-
-
-
-
-
-
-
-
-
-
-
-
-
-            prompt = GITHUB_ANALYSIS_PROMPT.format(search_context=final_context)
-            messages = [{"role": "system", "content": "You are a CTO analyzing GitHub activity from extracted web content, outputting a JSON object."}, {"role": "user", "content": prompt}]
-            
-            final_analysis = self._send_llm_request(messages)
+            messages = self._build_analysis_messages(profile_content, consolidated_repos_content)
+            final_analysis = await self._asend_llm_request(messages)
             print(f"Agent [GitHub]: Finished analysis for {github_url}")
             return final_analysis
 
@@ -5,7 +5,9 @@ from pydantic_ai import Agent
 from pydantic_ai.mcp import MCPServerStdio
 from dotenv import load_dotenv
 
-load_dotenv()
+from app.core.mcp_pool import CachedToolsMCPServerStdio, MCPServerPool
+from app.core.prompt_loader import load_prompt
+from app.core.scheduler import agent_run_tokens, estimate_tokens, scheduler
 
 class GitHubProfile(BaseModel):
     """Schema for author metrics from Github."""
@@ -15,9 +17,9 @@ class GitHubProfile(BaseModel):
     total_contributions: int = Field(..., description="Total number of contributions in the last year.")
     top_languages: List[str] = Field(..., description="List of top programming languages used in the repositories.")
 
-def create_github_agent() -> Agent:
-    """Create an agent for interacting with GitHub."""
-    github_server = MCPServerStdio(
+def create_github_server() -> MCPServerStdio:
+    """Create the stdio MCP server that runs the local GitHub MCP server."""
+    return CachedToolsMCPServerStdio(
             command="uv",
             args=[
                 "run", "python3",
@@ -27,40 +29,65 @@ def create_github_agent() -> Agent:
             timeout=30
         )
 
+def create_github_pool() -> MCPServerPool:
+    """Pool of warm GitHub MCP servers, sized by GITHUB_MCP_POOL_* env vars."""
+    return MCPServerPool(
+        "github",
+        create_github_server,
+        max_size=int(os.getenv("GITHUB_MCP_POOL_SIZE", "2")),
+        min_size=int(os.getenv("GITHUB_MCP_POOL_MIN_SIZE", "1")),
+        idle_timeout=float(os.getenv("GITHUB_MCP_POOL_IDLE_SECONDS", "300")),
+    )
+
+def create_github_agent(github_server: Optional[MCPServerStdio] = None, pooled: bool = False) -> Agent:
+    """Create an agent for interacting with GitHub."""
+    if github_server is None and not pooled:
+        github_server = create_github_server()
+
     # Load the system prompt
-    with open("backend/app/core/prompts/github_system.txt", "r") as prompt_file:
-        system_prompt = prompt_file.read()
+    system_prompt = load_prompt("github_system.txt")
 
     agent = Agent(
         model="anthropic:claude-3-7-sonnet-latest",
         output_type=GitHubProfile,
         system_prompt=system_prompt,
-        toolsets=[github_server],
+        toolsets=[] if pooled else [github_server],
     )
     return agent
 
-async def fetch_githuib_info(agent: Agent, github_repo_url: Optional[str] = None):
+async def fetch_githuib_info(agent: Agent, github_repo_url: Optional[str] = None, pool: Optional[MCPServerPool] = None):
     """Fetch author metrics using the OpenAlex agent."""
-    with open("backend/app/core/prompts/github_search.txt", "r") as prompt_file:
-        prompt_template = prompt_file.read()
+    prompt_template = load_prompt("github_search.txt")
 
     prompt = prompt_template.format(
         github_repo_url=github_repo_url if github_repo_url else "any"
     )
 
-    agent_response = await agent.run(prompt)
-    return agent_response.output
+    async def run_model(toolsets):
+        # The agent's model calls count against the Anthropic budget as well
+        async with scheduler.slot("anthropic", tokens=estimate_tokens(prompt)) as lease:
+            result = await agent.run(prompt, toolsets=toolsets)
+            used = agent_run_tokens(result)
+            if used:
+                lease.report_tokens(used)
+            return result
 
-# if __name__ == "__main__":
-    # Example usage
-agent = create_github_agent()
+    # The scarce MCP slot comes first; the Anthropic slot is only taken once a server is leased
+    async with scheduler.slot("github_mcp"):
+        if pool is None:
+            agent_response = await run_model(None)
+        else:
+            async with pool.lease() as server:
+                agent_response = await run_model([server])
+    return agent_response.output
 
+if __name__ == "__main__":
+    import asyncio
 
-# Test with a well-known researcher
-github_url = "https://github.com/OmranKaddah"
-async def run(agent, github_url):
-    response = await fetch_githuib_info(agent, github_url)
-    return response
+    load_dotenv()
 
-import asyncio
-response = asyncio.run(run(agent, github_url))
\ No newline at end of file
+    # Example usage: test with a well-known developer
+    agent = create_github_agent()
+    github_url = "https://github.com/OmranKaddah"
+    response = asyncio.run(fetch_githuib_info(agent, github_url))
+    print(response)
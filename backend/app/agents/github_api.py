@@ -0,0 +1,290 @@
+# /Complete workflow/agents/github_api.py
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.cache import DiskCache
+from app.core.metrics import metrics
+from app.core.scheduler import scheduler
+
+GITHUB_API_URL = "https://api.github.com"
+
+# One query for everything the GitHub analysis needs
+PROFILE_QUERY = """
+query($login: String!) {
+  user(login: $login) {
+    login
+    name
+    bio
+    company
+    location
+    followers { totalCount }
+    following { totalCount }
+    pinnedItems(first: 6, types: REPOSITORY) {
+      nodes { ...repo }
+    }
+    repositories(first: 20, ownerAffiliations: OWNER, isFork: false, orderBy: {field: STARGAZERS, direction: DESC}) {
+      totalCount
+      nodes { ...repo }
+    }
+    contributionsCollection {
+      contributionCalendar { totalContributions }
+    }
+  }
+}
+
+fragment repo on Repository {
+  name
+  url
+  description
+  stargazerCount
+  forkCount
+  primaryLanguage { name }
+  languages(first: 5, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+}
+"""
+
+
+class GitHubAPIError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _graphql_repo(node: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": node.get("name"),
+        "url": node.get("url"),
+        "description": node.get("description"),
+        "stars": node.get("stargazerCount") or 0,
+        "forks": node.get("forkCount") or 0,
+        "primary_language": (node.get("primaryLanguage") or {}).get("name"),
+        "languages": {
+            edge["node"]["name"]: edge["size"]
+            for edge in (node.get("languages") or {}).get("edges", [])
+        },
+    }
+
+
+def _rest_repo(repo: Dict[str, Any], languages: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    return {
+        "name": repo.get("name"),
+        "url": repo.get("html_url"),
+        "description": repo.get("description"),
+        "stars": repo.get("stargazers_count") or 0,
+        "forks": repo.get("forks_count") or 0,
+        "primary_language": repo.get("language"),
+        "languages": languages or {},
+    }
+
+
+def _top_languages(repos: list[Dict[str, Any]], limit: int = 5) -> list[str]:
+    totals: Dict[str, int] = {}
+    for repo in repos:
+        languages = repo["languages"] or ({repo["primary_language"]: 1} if repo["primary_language"] else {})
+        for language, size in languages.items():
+            totals[language] = totals.get(language, 0) + size
+    return [language for language, _ in sorted(totals.items(), key=lambda item: -item[1])[:limit]]
+
+
+class GitHubAPIClient:
+    """
+    Fetches a developer's GitHub profile from the GitHub API: one GraphQL query when
+    a token is available, otherwise (or when GraphQL fails) the REST endpoints. GraphQL
+    has no conditional requests, so its profiles are cached per login for
+    `graphql_ttl` seconds. REST responses are cached with their ETag and revalidated
+    with If-None-Match; GitHub does not count 304 responses against the rate limit.
+    """
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: str = GITHUB_API_URL,
+        etag_cache: Optional[DiskCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_repos: int = 6,
+        graphql_ttl: float = 6 * 60 * 60,
+    ):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.etag_cache = etag_cache
+        self.max_repos = max_repos
+        self.graphql_ttl = graphql_ttl
+        self._client = http_client
+        self._owns_client = http_client is None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=10.0))
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    async def fetch_profile(self, login: str) -> Dict[str, Any]:
+        """Returns the normalised profile of `login`; raises GitHubAPIError on failure."""
+        if self.token:
+            try:
+                return await self._fetch_graphql(login)
+            except GitHubAPIError as e:
+                if e.status_code == 404:
+                    raise
+                print(f"  -> [GitHub API] GraphQL failed ({e}), falling back to REST")
+        return await self._fetch_rest(login)
+
+    async def _fetch_graphql(self, login: str) -> Dict[str, Any]:
+        cache_key = f"github_graphql:{login.lower()}"
+        cached = self.etag_cache.get(cache_key) if self.etag_cache and self.graphql_ttl > 0 else None
+        if cached is not None:
+            metrics.increment("github_api_cache_hits_total", api="graphql")
+            return cached.value
+
+        metrics.increment("github_api_requests_total", api="graphql")
+        async with scheduler.slot("github"):
+            response = await self.client.post(
+                f"{self.base_url}/graphql",
+                json={"query": PROFILE_QUERY, "variables": {"login": login}},
+                headers=self._headers(),
+            )
+        if response.status_code != 200:
+            raise GitHubAPIError(f"GraphQL request failed with HTTP {response.status_code}", response.status_code)
+        body = response.json()
+        user = (body.get("data") or {}).get("user")
+        if user is None:
+            errors = body.get("errors") or []
+            not_found = any(error.get("type") == "NOT_FOUND" for error in errors)
+            message = "; ".join(error.get("message", "") for error in errors) or "no user in response"
+            raise GitHubAPIError(message, 404 if not_found else None)
+
+        pinned = [_graphql_repo(node) for node in user["pinnedItems"]["nodes"] if node]
+        owned = [_graphql_repo(node) for node in user["repositories"]["nodes"] if node]
+        profile = {
+            "login": user["login"],
+            "name": user.get("name"),
+            "bio": user.get("bio"),
+            "company": user.get("company"),
+            "location": user.get("location"),
+            "followers": user["followers"]["totalCount"],
+            "following": user["following"]["totalCount"],
+            "public_repos": user["repositories"]["totalCount"],
+            "total_stars": sum(repo["stars"] for repo in owned),
+            "contributions_last_year": user["contributionsCollection"]["contributionCalendar"]["totalContributions"],
+            "pinned_repositories": pinned,
+            "top_repositories": owned[:self.max_repos],
+            "top_languages": _top_languages(pinned + owned),
+            "source": "graphql",
+        }
+        if self.etag_cache is not None and self.graphql_ttl > 0:
+            self.etag_cache.set(cache_key, profile, ttl=self.graphql_ttl)
+        return profile
+
+    async def _fetch_rest(self, login: str) -> Dict[str, Any]:
+        user = await self._get(f"/users/{login}")
+        repos = await self._get(f"/users/{login}/repos", {"type": "owner", "per_page": "100", "sort": "pushed"})
+        owned = sorted((r for r in repos if not r.get("fork")), key=lambda r: -(r.get("stargazers_count") or 0))
+        top = owned[:self.max_repos]
+        languages = await asyncio.gather(
+            *(self._get(f"/repos/{login}/{repo['name']}/languages") for repo in top),
+            return_exceptions=True,
+        )
+        top_repos = [
+            _rest_repo(repo, langs if isinstance(langs, dict) else None)
+            for repo, langs in zip(top, languages)
+        ]
+        return {
+            "login": user.get("login"),
+            "name": user.get("name"),
+            "bio": user.get("bio"),
+            "company": user.get("company"),
+            "location": user.get("location"),
+            "followers": user.get("followers", 0),
+            "following": user.get("following", 0),
+            "public_repos": user.get("public_repos", 0),
+            "total_stars": sum(r.get("stargazers_count") or 0 for r in owned),
+            # Not available over REST
+            "contributions_last_year": None,
+            # REST has no pinned items; the most starred repositories stand in for them
+            "pinned_repositories": [],
+            "top_repositories": top_repos,
+            "top_languages": _top_languages(top_repos + [_rest_repo(r) for r in owned[self.max_repos:]]),
+            "source": "rest",
+        }
+
+    async def _get(self, path: str, params: Optional[Dict[str, str]] = None) -> Any:
+        """GET with ETag revalidation against the cached copy of the response."""
+        url = f"{self.base_url}{path}"
+        cache_key = "github_etag:" + str(httpx.URL(url, params=params))
+        cached = self.etag_cache.get(cache_key) if self.etag_cache else None
+        headers = self._headers()
+        if cached is not None:
+            headers["If-None-Match"] = cached.value["etag"]
+
+        metrics.increment("github_api_requests_total", api="rest")
+        async with scheduler.slot("github"):
+            response = await self.client.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            metrics.increment("github_api_not_modified_total")
+            return cached.value["body"]
+        if response.status_code != 200:
+            raise GitHubAPIError(f"GET {path} failed with HTTP {response.status_code}", response.status_code)
+
+        body = response.json()
+        etag = response.headers.get("etag")
+        if self.etag_cache is not None and etag:
+            self.etag_cache.set(cache_key, {"etag": etag, "body": body}, ttl=30 * 24 * 60 * 60)
+        return body
+
+
+def format_profile_context(profile: Dict[str, Any]) -> str:
+    """Renders a fetched profile as the search context of the GitHub analysis prompt."""
+    lines = [
+        f"**Profile:** {profile.get('name') or profile['login']} (@{profile['login']})",
+        f"- Bio: {profile.get('bio') or 'N/A'}",
+        f"- Company: {profile.get('company') or 'N/A'}; Location: {profile.get('location') or 'N/A'}",
+        f"- Followers: {profile['followers']}; Following: {profile['following']}",
+        f"- Public repositories: {profile['public_repos']}; Total stars: {profile['total_stars']}",
+        f"- Contributions in the last year: {profile['contributions_last_year'] if profile['contributions_last_year'] is not None else 'N/A'}",
+        f"- Top languages: {', '.join(profile['top_languages']) or 'N/A'}",
+    ]
+    for title, repos in (("Pinned Repositories", profile["pinned_repositories"]), ("Most Starred Repositories", profile["top_repositories"])):
+        if not repos:
+            continue
+        lines.append(f"\n**{title}:**")
+        for repo in repos:
+            languages = ", ".join(repo["languages"]) or repo["primary_language"] or "N/A"
+            lines.append(
+                f"- {repo['name']} ({repo['url']}): {repo['description'] or 'No description.'} "
+                f"[stars: {repo['stars']}, forks: {repo['forks']}, languages: {languages}]"
+            )
+    return "\n".join(lines)
+
+
+_default_etag_cache: Optional[DiskCache] = None
+
+
+def get_github_api_client() -> GitHubAPIClient:
+    """
+    Client configured from GITHUB_PERSONAL_ACCESS_TOKEN, GITHUB_API_URL,
+    GITHUB_API_CACHE_PATH and GITHUB_GRAPHQL_CACHE_TTL_SECONDS.
+    """
+    global _default_etag_cache
+    if _default_etag_cache is None:
+        _default_etag_cache = DiskCache(
+            os.getenv("GITHUB_API_CACHE_PATH", "data_storage/github_api_cache.db"),
+            max_bytes=int(os.getenv("GITHUB_API_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        )
+    return GitHubAPIClient(
+        token=os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN"),
+        base_url=os.getenv("GITHUB_API_URL", GITHUB_API_URL),
+        etag_cache=_default_etag_cache,
+        graphql_ttl=float(os.getenv("GITHUB_GRAPHQL_CACHE_TTL_SECONDS", str(6 * 60 * 60))),
+    )
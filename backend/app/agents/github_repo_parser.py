@@ -0,0 +1,109 @@
+# /Complete workflow/agents/github_repo_parser.py
+import re
+from typing import Optional
+from urllib.parse import urlsplit
+
+# Second path segments of github.com/<owner>/... that are profile pages, not repositories
+NON_REPO_SEGMENTS = {
+    "repositories", "projects", "packages", "stars", "followers", "following",
+    "sponsoring", "achievements", "organizations",
+}
+
+# Headings that start the featured repositories block of a profile page
+FEATURED_START = re.compile(r"\b(pinned|popular repositories)\b", re.IGNORECASE)
+FEATURED_END = re.compile(r"contributions? in the last year|contribution activity", re.IGNORECASE)
+
+# "⭐ 1.2k", "★ 40", "1,024 stars", or the count after a stargazers link in HTML
+STARS_PATTERNS = [
+    re.compile(r"(?:⭐|★|☆)\s*([\d.,]+\s*[kKmM]?)"),
+    re.compile(r"([\d.,]+\s*[kKmM]?)\s+stars?\b", re.IGNORECASE),
+    re.compile(r"/stargazers[^>]*>(?:\s|<[^>]+>)*([\d.,]+\s*[kKmM]?)"),
+]
+
+
+def profile_owner(base_url: str) -> Optional[str]:
+    """Returns the user name of a https://github.com/<owner> profile URL."""
+    url = base_url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    return segments[0] if segments else None
+
+
+def parse_star_count(text: str) -> int:
+    """Parses counts such as "1,024", "1.2k" or "3M"."""
+    text = text.replace(",", "").replace(" ", "").lower()
+    multiplier = 1
+    if text.endswith("k"):
+        multiplier, text = 1000, text[:-1]
+    elif text.endswith("m"):
+        multiplier, text = 1000000, text[:-1]
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        return 0
+
+
+def _repo_link_pattern(owner: str) -> re.Pattern:
+    # Absolute links, relative markdown links and relative HTML hrefs to /<owner>/<repo>
+    return re.compile(
+        r"(?:https?://(?:www\.)?github\.com|\]\(|href=[\"'])/?(?P<owner>" + re.escape(owner) + r")/(?P<repo>[A-Za-z0-9._-]+)",
+        re.IGNORECASE,
+    )
+
+
+def _stars_near(text: str) -> Optional[int]:
+    for pattern in STARS_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return parse_star_count(match.group(1))
+    return None
+
+
+def extract_repo_urls(profile_content: str, base_url: str, max_repos: int = 6) -> list[str]:
+    """
+    Finds the owner's repository links in the raw content (markdown or HTML) of a
+    GitHub profile page. Repositories in the "Pinned"/"Popular repositories" block
+    come first in page order, the rest follow by star count where one is shown.
+    Returns an empty list when nothing is found.
+    """
+    owner = profile_owner(base_url)
+    if not owner or not profile_content:
+        return []
+
+    featured_start = FEATURED_START.search(profile_content)
+    featured_end = FEATURED_END.search(profile_content, featured_start.end()) if featured_start else None
+    featured_span = (
+        featured_start.start() if featured_start else -1,
+        featured_end.start() if featured_end else len(profile_content),
+    )
+
+    matches = list(_repo_link_pattern(owner).finditer(profile_content))
+    repos: dict[str, dict] = {}
+    for index, match in enumerate(matches):
+        repo = match.group("repo")
+        if repo.endswith(".git"):
+            repo = repo[:-4]
+        # The <owner>/<owner> repository only holds the profile README
+        if not repo or repo.lower() in NON_REPO_SEGMENTS or repo.lower() == owner.lower():
+            continue
+        name = repo.lower()
+        next_start = matches[index + 1].start() if index + 1 < len(matches) else len(profile_content)
+        stars = _stars_near(profile_content[match.end():next_start])
+        featured = featured_span[0] <= match.start() < featured_span[1]
+
+        entry = repos.setdefault(name, {
+            "url": f"https://github.com/{match.group('owner')}/{repo}",
+            "order": len(repos),
+            "featured": False,
+            "stars": None,
+        })
+        entry["featured"] = entry["featured"] or featured
+        if stars is not None:
+            entry["stars"] = max(stars, entry["stars"] or 0)
+
+    ranked = sorted(
+        repos.values(),
+        key=lambda r: (not r["featured"], r["order"] if r["featured"] else -(r["stars"] or 0), r["order"]),
+    )
+    return [r["url"] for r in ranked[:max_repos]]
@@ -1,14 +1,17 @@
 import asyncio
 import os
-from typing import List
+from typing import List, Optional
 
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
 from pydantic_ai import Agent
 from pydantic_ai.mcp import MCPServerStdio
 
-load_dotenv()
+from app.core.mcp_pool import CachedToolsMCPServerStdio, MCPServerPool
+from app.core.prompt_loader import load_prompt
+from app.core.resilience import call_with_retries
+from app.core.scheduler import agent_run_tokens, estimate_tokens, scheduler
+
 
 # Define the output schema for AI responses
 class ProfileSummary(BaseModel):
@@ -18,12 +21,13 @@ class ProfileSummary(BaseModel):
     top_skills: List[str] = Field(..., description="List of top skills")
     notable_positions: List[str] = Field(..., description="List of notable positions held")
 
-def create_linkedin_agent() -> Agent:
+def create_linkedin_server() -> MCPServerStdio:
+    """Create the stdio MCP server that runs the LinkedIn scraper container."""
     linkedin_cookie = os.getenv("LINKEDIN_COOKIE")
     if not linkedin_cookie:
         raise ValueError("LINKEDIN_COOKIE environment variable is not set.")
 
-    linkedIn_server = MCPServerStdio( 
+    return CachedToolsMCPServerStdio( 
         "docker",
         args=[
             "run", "--rm", "-i",
@@ -34,23 +38,60 @@ def create_linkedin_agent() -> Agent:
         timeout=60
     )
 
+def create_linkedin_agent(linkedIn_server: Optional[MCPServerStdio] = None, pooled: bool = False) -> Agent:
+    """
+    Creates the LinkedIn agent. With `pooled=True` the agent has no MCP server of its
+    own; fetch_profile_via_agent passes one leased from an MCPServerPool per run.
+    """
+    if linkedIn_server is None and not pooled:
+        linkedIn_server = create_linkedin_server()
+
     # Load the system prompt from the new prompts directory
-    with open("backend/app/core/prompts/linkedIn_system.txt", "r") as prompt_file:
-        system_prompt = prompt_file.read()
+    system_prompt = load_prompt("linkedIn_system.txt")
 
     agent = Agent(
         model="anthropic:claude-3-7-sonnet-latest",
         output_type=ProfileSummary,
         system_prompt=system_prompt,
-        toolsets=[linkedIn_server],
+        toolsets=[] if pooled else [linkedIn_server],
     )
     return agent
 
-async def fetch_profile_via_agent(agent: Agent, url: str):
+def create_linkedin_pool() -> MCPServerPool:
+    """Pool of warm LinkedIn MCP containers, sized by LINKEDIN_MCP_POOL_* env vars."""
+    return MCPServerPool(
+        "linkedin",
+        create_linkedin_server,
+        max_size=int(os.getenv("LINKEDIN_MCP_POOL_SIZE", "2")),
+        min_size=int(os.getenv("LINKEDIN_MCP_POOL_MIN_SIZE", "1")),
+        idle_timeout=float(os.getenv("LINKEDIN_MCP_POOL_IDLE_SECONDS", "300")),
+    )
+
+async def fetch_profile_via_agent(agent: Agent, url: str, pool: Optional[MCPServerPool] = None):
     """Ask the agent to call the appropriate LinkedIn tool to fetch a profile for a URL."""
     print(f"Fetching LinkedIn profile for URL: {url}")
-    with open("backend/app/core/prompts/linkedIn_run.txt", "r") as prompt_file:
-        prompt = prompt_file.read()
+    prompt = load_prompt("linkedIn_run.txt")
     # prompt.format({"url": url})
-    agent_response = await agent.run(prompt + url)
-    return agent_response.output
\ No newline at end of file
+
+    async def run_model(toolsets):
+        # The agent's model calls count against the Anthropic budget as well
+        async with scheduler.slot("anthropic", tokens=estimate_tokens(prompt + url)) as lease:
+            result = await agent.run(prompt + url, toolsets=toolsets)
+            used = agent_run_tokens(result)
+            if used:
+                lease.report_tokens(used)
+            return result
+
+    async def run_once():
+        # The scarce MCP slot comes first; the Anthropic slot is only taken once a server is leased
+        async with scheduler.slot("linkedin_mcp"):
+            if pool is None:
+                return await run_model(None)
+            # Each attempt leases its own server, so a retry does not reuse a crashed one
+            async with pool.lease() as server:
+                return await run_model([server])
+
+    # Keyed on the MCP server, so a LinkedIn container outage opens its own circuit
+    # rather than the Anthropic one the report agent depends on
+    agent_response = await call_with_retries("linkedin_mcp", run_once)
+    return agent_response.output
@@ -0,0 +1,64 @@
+# /Complete workflow/agents/openalex_abstracts.py
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+
+# OpenAlex ships abstracts as {word: [positions]}. Positions are normally dense
+# (0..n-1 for n tokens), so the text is rebuilt by writing every word straight
+# into its slot of a list with one slot per token: linear, with no sort and no
+# per-token tuple. Indexes with gaps or several words at one position take a
+# slower path with the same output as sorting the (position, word) pairs.
+
+# Above this many slots per token an index is treated as malformed and sorted
+# instead, so a stray huge position cannot force a huge allocation.
+MAX_GAP_FACTOR = 4
+
+InvertedIndex = Dict[str, List[int]]
+
+
+def _reconstruct_sorted(inverted_index: InvertedIndex) -> str:
+    word_positions = sorted((pos, word) for word, positions in inverted_index.items() for pos in positions)
+    return " ".join(word for _, word in word_positions)
+
+
+def _reconstruct_with_gaps(inverted_index: InvertedIndex, tokens: int) -> str:
+    size = max(chain.from_iterable(inverted_index.values())) + 1
+    if size > MAX_GAP_FACTOR * tokens:
+        return _reconstruct_sorted(inverted_index)
+    slots: list = [None] * size
+    for word, positions in inverted_index.items():
+        for pos in positions:
+            slots[pos] = word
+    if size - slots.count(None) != tokens:
+        # Several words share a position; keep them all
+        return _reconstruct_sorted(inverted_index)
+    # Empty-string tokens are words too; only the unfilled slots are gaps
+    return " ".join(word for word in slots if word is not None)
+
+
+def reconstruct_abstract(inverted_index: Optional[InvertedIndex]) -> Optional[str]:
+    """Rebuilds abstract text from an OpenAlex `abstract_inverted_index`."""
+    if not inverted_index:
+        return None
+    tokens = sum(map(len, inverted_index.values()))
+    if not tokens:
+        return None
+    if min(chain.from_iterable(inverted_index.values())) < 0:
+        # A negative position would index the list from the end
+        return _reconstruct_sorted(inverted_index)
+    slots: list = [None] * tokens
+    try:
+        for word, positions in inverted_index.items():
+            for pos in positions:
+                slots[pos] = word
+    except IndexError:
+        # A position past the token count means there are gaps
+        return _reconstruct_with_gaps(inverted_index, tokens)
+    if None in slots:
+        # Every position is in range but some slot is empty: two words collided
+        return _reconstruct_sorted(inverted_index)
+    return " ".join(slots)
+
+
+def reconstruct_abstracts(inverted_indexes: Iterable[Optional[InvertedIndex]]) -> List[Optional[str]]:
+    """Batch form of `reconstruct_abstract`, e.g. for a page of works."""
+    return list(map(reconstruct_abstract, inverted_indexes))
@@ -0,0 +1,332 @@
+# /Complete workflow/agents/openalex_api.py
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from app.agents.openalex_abstracts import reconstruct_abstracts
+from app.agents.openalex_institutions import InstitutionIndex
+from app.agents.openalex_stats import CitationStats
+from app.core.cache import DiskCache
+from app.core.metrics import metrics
+from app.core.resilience import call_with_retries
+from app.core.scheduler import scheduler
+
+OPENALEX_API_URL = "https://api.openalex.org"
+ABSTRACT_NOT_AVAILABLE = "Abstract not available."
+
+# Only the fields the analysis reads; everything else in a record is dropped server-side
+AUTHOR_FIELDS = "id,display_name,works_count,cited_by_count,summary_stats,last_known_institutions,orcid"
+WORK_FIELDS = "id,title,cited_by_count,abstract_inverted_index"
+INSTITUTION_FIELDS = "id,display_name,ror,works_count,display_name_alternatives,display_name_acronyms"
+# Streaming leaves abstracts out; only the top works' abstracts are fetched afterwards
+STREAM_WORK_FIELDS = "id,title,cited_by_count,publication_year,counts_by_year"
+
+
+class OpenAlexAPIError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RateLimiter:
+    """
+    Spaces requests so that at most `rate` start per second, across every coroutine
+    sharing the limiter. OpenAlex asks polite-pool clients to stay under 10 per second.
+    """
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        # Reserving the slot does not await, so no lock is needed on one event loop
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def _institution_names(author: Dict[str, Any]) -> list[str]:
+    # `last_known_institution` is deprecated in favour of the `last_known_institutions` list
+    institutions = list(author.get("last_known_institutions") or [])
+    if author.get("last_known_institution"):
+        institutions.append(author["last_known_institution"])
+    return [i.get("display_name") or "" for i in institutions if i]
+
+
+def _short_id(openalex_id: str) -> str:
+    return openalex_id.rstrip("/").split("/")[-1]
+
+
+class OpenAlexClient:
+    """
+    Async OpenAlex client. All requests share one keep-alive connection pool, carry
+    the `mailto` parameter that puts them in OpenAlex's polite pool, and go through
+    a rate limiter shared by the founders analysed concurrently.
+    """
+    def __init__(
+        self,
+        mailto: Optional[str] = None,
+        base_url: str = OPENALEX_API_URL,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_requests_per_second: float = 10.0,
+        max_connections: int = 10,
+        institutions: Optional[InstitutionIndex] = None,
+    ):
+        self.mailto = mailto
+        self.institutions = institutions
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+        self._client = http_client
+        self._owns_client = http_client is None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(30.0, connect=10.0),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET with the polite-pool parameter, rate limiting and retries; raises OpenAlexAPIError."""
+        params = dict(params or {})
+        if self.mailto:
+            params["mailto"] = self.mailto
+
+        async def attempt():
+            async with scheduler.slot("openalex"):
+                await self.rate_limiter.acquire()
+                metrics.increment("openalex_requests_total")
+                response = await self.client.get(f"{self.base_url}{path}", params=params)
+            if response.status_code != 200:
+                error = OpenAlexAPIError(f"GET {path} failed with HTTP {response.status_code}", response.status_code)
+                # Lets the retry loop honour Retry-After on 429s
+                error.response = response
+                raise error
+            return response.json()
+
+        return await call_with_retries("openalex", attempt)
+
+    async def resolve_institution(self, affiliation: str) -> Optional[Dict[str, Any]]:
+        """
+        The OpenAlex institution `affiliation` names, from the local index when it
+        knows it, otherwise from one institution search whose answer is remembered.
+        """
+        if self.institutions is None or not affiliation:
+            return None
+        found = self.institutions.resolve(affiliation)
+        if found is not None:
+            metrics.increment("openalex_institution_lookups_total", result="local")
+            return found
+        if self.institutions.known_miss(affiliation):
+            metrics.increment("openalex_institution_lookups_total", result="cached_miss")
+            return None
+        try:
+            params = {"search": affiliation, "select": INSTITUTION_FIELDS, "per-page": 5}
+            results = (await self._get("/institutions", params)).get("results", [])
+        except Exception as e:
+            print(f"  -> [OpenAlex] Institution search failed for '{affiliation}': {e}")
+            return None
+        for record in results:
+            self.institutions.add(record)
+        # Only a hit that matches the affiliation is used; filtering the author search
+        # on an unrelated institution would find the wrong author, or none
+        found = self.institutions.resolve(affiliation)
+        metrics.increment("openalex_institution_lookups_total", result="remote" if found else "miss")
+        if found is not None:
+            self.institutions.remember(affiliation, found)
+        else:
+            self.institutions.remember_miss(affiliation)
+        return found
+
+    async def search_author(self, name: str, affiliation: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Best author match for `name`. When `affiliation` resolves to an OpenAlex
+        institution, the search is filtered server-side to authors last seen
+        there and returns one record; otherwise a page of name matches is
+        checked against `affiliation` locally. Search hits are full author
+        records, metrics included.
+        """
+        institution = await self.resolve_institution(affiliation) if affiliation else None
+        if institution is not None:
+            params = {
+                "search": name,
+                "filter": f"last_known_institutions.id:{institution['id']}",
+                "select": AUTHOR_FIELDS,
+                "per-page": 1,
+            }
+            results = (await self._get("/authors", params)).get("results", [])
+            if results:
+                return results[0]
+            # The author may have moved since; search by name alone
+
+        results = (await self._get("/authors", {"search": name, "select": AUTHOR_FIELDS})).get("results", [])
+        if not results:
+            return None
+        if affiliation:
+            wanted = affiliation.lower()
+            for author in results:
+                if any(wanted in institution.lower() for institution in _institution_names(author)):
+                    return author
+        return results[0]
+
+    async def get_works(self, author_id: str, limit: int) -> list[Dict[str, Any]]:
+        """The author's most cited works, abstracts included."""
+        params = {
+            "filter": f"author.id:{_short_id(author_id)}",
+            "sort": "cited_by_count:desc",
+            "per-page": min(limit, 200),
+            "select": WORK_FIELDS,
+        }
+        return (await self._get("/works", params)).get("results", [])[:limit]
+
+    async def stream_works(self, author_id: str, fields: str = STREAM_WORK_FIELDS, max_works: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yields every work of the author, 200 per request, following OpenAlex's `cursor` paging."""
+        params = {"filter": f"author.id:{_short_id(author_id)}", "per-page": 200, "select": fields, "cursor": "*"}
+        seen = 0
+        while params["cursor"]:
+            page = await self._get("/works", params)
+            results = page.get("results", [])
+            for work in results:
+                if max_works is not None and seen >= max_works:
+                    return
+                seen += 1
+                yield work
+            if not results:
+                return
+            params["cursor"] = (page.get("meta") or {}).get("next_cursor")
+
+    async def get_works_by_id(self, work_ids: list[str], fields: str = WORK_FIELDS) -> list[Dict[str, Any]]:
+        """Looks up to 100 works up in one request with an OR filter on their ids."""
+        if not work_ids:
+            return []
+        params = {"filter": "openalex:" + "|".join(_short_id(w) for w in work_ids[:100]), "per-page": 100, "select": fields}
+        return (await self._get("/works", params)).get("results", [])
+
+    async def stream_research_metrics(self, author_id: str, top_n: int = 10, max_works: Optional[int] = None) -> tuple[Dict[str, Any], list[Dict[str, Any]]]:
+        """
+        Walks all of the author's works once, computing citation metrics locally.
+        Returns the metrics and the `top_n` most cited works with abstracts, or
+        without them if the abstract lookup fails.
+        """
+        stats = CitationStats(top_n=top_n)
+        async for work in self.stream_works(author_id, max_works=max_works):
+            stats.add(work)
+        top = stats.top_works()
+        try:
+            with_abstracts = {w.get("id"): w for w in await self.get_works_by_id([w["id"] for w in top if w.get("id")])}
+        except Exception as e:
+            # The metrics cost the whole walk; keep them and report the works without abstracts
+            print(f"  -> [OpenAlex] Could not fetch abstracts of the top works of {author_id}: {e}")
+            with_abstracts = {}
+        return stats.summary(), [with_abstracts.get(w.get("id"), w) for w in top]
+
+    async def fetch_author_data(
+        self,
+        name: str,
+        affiliation: Optional[str] = None,
+        top_n_publications: int = 10,
+        stream_works: bool = False,
+        max_streamed_works: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Author metrics and most cited publications with their abstracts, in two
+        requests: the author search and the works listing. With `stream_works`,
+        all of the author's works are paged through instead and the result gains
+        locally computed `research_metrics`.
+        """
+        try:
+            author = await self.search_author(name, affiliation)
+        except Exception as e:
+            print(f"API request error during author search: {e}")
+            author = None
+        if not author:
+            return {"error": f"Author '{name}' not found."}
+
+        research_metrics = None
+        try:
+            if stream_works:
+                research_metrics, works = await self.stream_research_metrics(author["id"], top_n_publications, max_streamed_works)
+            else:
+                works = await self.get_works(author["id"], top_n_publications)
+        except Exception as e:
+            print(f"  -> [OpenAlex] Could not fetch works of {author['id']}: {e}")
+            works = []
+        abstracts = reconstruct_abstracts(work.get("abstract_inverted_index") for work in works)
+        publications = [
+            {
+                "title": work.get("title"),
+                "abstract": abstract or ABSTRACT_NOT_AVAILABLE,
+                "cited_by_count": work.get("cited_by_count", 0),
+            }
+            for work, abstract in zip(works, abstracts)
+        ]
+        data = {"author_metrics": author_metrics_from(author), "top_publications": publications}
+        if research_metrics is not None:
+            data["research_metrics"] = research_metrics
+        return data
+
+
+def author_metrics_from(author: Dict[str, Any]) -> Dict[str, Any]:
+    """The author summary reported to the analysis, from an OpenAlex author record."""
+    summary = author.get("summary_stats") or {}
+    institutions = _institution_names(author)
+    return {
+        "openalex_id": author.get("id"),
+        "display_name": author.get("display_name"),
+        "works_count": author.get("works_count"),
+        "cited_by_count": author.get("cited_by_count"),
+        "h_index": summary.get("h_index"),
+        "i10_index": summary.get("i10_index"),
+        "last_known_institution": institutions[0] if institutions else None,
+        "orcid": author.get("orcid"),
+    }
+
+
+_default_client: Optional[OpenAlexClient] = None
+
+
+def create_openalex_client() -> OpenAlexClient:
+    """
+    New client configured from the OPENALEX_* environment variables, with its own
+    institution index over the on-disk institution cache. The caller closes it.
+    """
+    institutions = InstitutionIndex(DiskCache(
+        os.getenv("OPENALEX_INSTITUTIONS_CACHE_PATH", "data_storage/openalex_institutions.db"),
+        max_bytes=16 * 1024 * 1024,
+    ))
+    if os.getenv("OPENALEX_INSTITUTIONS_PATH"):
+        # Institutions of an OpenAlex snapshot, so common names resolve without a request
+        count = institutions.load(os.getenv("OPENALEX_INSTITUTIONS_PATH"))
+        print(f"  -> [OpenAlex] Loaded {count} institutions into the local index")
+    return OpenAlexClient(
+        mailto=os.getenv("OPENALEX_MAILTO"),
+        base_url=os.getenv("OPENALEX_API_URL", OPENALEX_API_URL),
+        max_requests_per_second=float(os.getenv("OPENALEX_MAX_RPS", "10")),
+        institutions=institutions,
+    )
+
+
+def get_openalex_client() -> OpenAlexClient:
+    """Process-wide client, built by `create_openalex_client` on first use."""
+    global _default_client
+    if _default_client is None:
+        _default_client = create_openalex_client()
+    return _default_client
+
+
+async def aclose_openalex_client() -> None:
+    """Closes the process-wide client's connection pool; call on application shutdown."""
+    if _default_client is not None:
+        await _default_client.aclose()
@@ -0,0 +1,162 @@
+# /Complete workflow/agents/openalex_institutions.py
+import difflib
+import glob
+import gzip
+import json
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from app.core.cache import DiskCache
+from app.core.enrichment_cache import normalize_text
+
+# Words that say what kind of institution it is rather than which one, so that
+# "Cambridge", "University of Cambridge" and "Cambridge University" share a key
+GENERIC_WORDS = {
+    "the", "of", "at", "and", "in", "for", "university", "college", "institute", "school",
+    "universidad", "universidade", "universita", "universite", "universitat", "universiteit",
+    "uni", "univ",
+}
+
+# Fuzzy matching only considers names with a word starting like one of the query's
+WORD_PREFIX_LENGTH = 4
+# ... and of those, only the ones sharing the most prefixes with it
+MAX_FUZZY_CANDIDATES = 200
+
+RESOLUTION_TTL_SECONDS = 180 * 24 * 60 * 60
+# Names nothing matched are retried after this long, in case OpenAlex adds them
+MISS_TTL_SECONDS = 6 * 60 * 60
+
+
+def _short_id(openalex_id: str) -> str:
+    return openalex_id.rstrip("/").split("/")[-1]
+
+
+def _core_key(key: str) -> str:
+    return " ".join(word for word in key.split() if word not in GENERIC_WORDS)
+
+
+def institution_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of an OpenAlex institution record the index keeps."""
+    return {
+        "id": _short_id(record["id"]),
+        "display_name": record.get("display_name"),
+        "ror": record.get("ror"),
+        "works_count": record.get("works_count") or 0,
+    }
+
+
+class InstitutionIndex:
+    """
+    Maps free-text university names to OpenAlex institution ids. Names, known
+    alternatives and acronyms are indexed in normalised form, with and without
+    generic words; anything else is matched fuzzily (difflib) against the names
+    with a word starting like one of its own, and a name sharing no such word
+    prefix with any indexed one does not match. Resolutions learned from the
+    live API, and names it did not know, can be kept in a DiskCache so they
+    survive restarts.
+    """
+    def __init__(self, cache: Optional[DiskCache] = None, cutoff: float = 0.85):
+        self.cache = cache
+        self.cutoff = cutoff
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        # word prefix -> keys containing a word that starts with it, to keep fuzzy
+        # matching off the full key set
+        self._keys_by_prefix: Dict[str, set] = {}
+        # normalised name -> monotonic expiry of a remembered miss (when there is no cache)
+        self._misses: Dict[str, float] = {}
+
+    def _index(self, key: str, entry: Dict[str, Any]) -> None:
+        if not key:
+            return
+        existing = self._by_key.get(key)
+        # A name shared by several institutions goes to the one with the most works
+        if existing is None or entry["works_count"] > existing["works_count"]:
+            self._by_key[key] = entry
+        for word in key.split():
+            # Generic words would put most names in the same few buckets
+            if word not in GENERIC_WORDS:
+                self._keys_by_prefix.setdefault(word[:WORD_PREFIX_LENGTH], set()).add(key)
+
+    def add(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Indexes an OpenAlex institution record; returns its entry."""
+        entry = institution_entry(record)
+        names = [record.get("display_name")]
+        names += list(record.get("display_name_alternatives") or [])
+        names += list(record.get("display_name_acronyms") or [])
+        for name in names:
+            if name:
+                key = normalize_text(name)
+                self._index(key, entry)
+                self._index(_core_key(key), entry)
+        return entry
+
+    def load(self, path: str) -> int:
+        """Indexes institution records from a JSON Lines file (optionally gzipped) or a directory of them."""
+        paths = sorted(glob.glob(os.path.join(path, "**", "*.gz"), recursive=True)) if os.path.isdir(path) else [path]
+        count = 0
+        for file_path in paths:
+            opener = gzip.open if file_path.endswith(".gz") else open
+            with opener(file_path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self.add(json.loads(line))
+                        count += 1
+        return count
+
+    def resolve(self, text: str) -> Optional[Dict[str, Any]]:
+        """The institution `text` names, or None if nothing is close enough."""
+        key = normalize_text(text or "")
+        if not key:
+            return None
+        core = _core_key(key)
+        for candidate in (key, core):
+            if candidate in self._by_key:
+                return self._by_key[candidate]
+        if self.cache is not None:
+            cached = self.cache.get(f"openalex_institution:{key}")
+            if cached is not None and cached.value is not None:
+                return cached.value
+
+        shared = Counter()
+        for prefix in {word[:WORD_PREFIX_LENGTH] for word in (core or key).split()}:
+            shared.update(self._keys_by_prefix.get(prefix, ()))
+        if not shared:
+            return None
+        candidates = [candidate for candidate, _ in shared.most_common(MAX_FUZZY_CANDIDATES)]
+        for candidate in (key, core):
+            if not candidate:
+                continue
+            matches = difflib.get_close_matches(candidate, candidates, n=1, cutoff=self.cutoff)
+            if matches:
+                return self._by_key[matches[0]]
+        return None
+
+    def remember(self, text: str, entry: Dict[str, Any]) -> None:
+        """Records that `text` names the institution `entry`, persistently when there is a cache."""
+        key = normalize_text(text or "")
+        if not key:
+            return
+        self._index(key, entry)
+        if self.cache is not None:
+            self.cache.set(f"openalex_institution:{key}", entry, ttl=RESOLUTION_TTL_SECONDS)
+
+    def remember_miss(self, text: str, ttl: float = MISS_TTL_SECONDS) -> None:
+        """Records that nothing matched `text`, so it is not looked up again for `ttl` seconds."""
+        key = normalize_text(text or "")
+        if not key:
+            return
+        if self.cache is not None:
+            self.cache.set(f"openalex_institution:{key}", None, ttl=ttl)
+        else:
+            self._misses[key] = time.monotonic() + ttl
+
+    def known_miss(self, text: str) -> bool:
+        """True while a miss remembered for `text` has not expired."""
+        key = normalize_text(text or "")
+        if self.cache is not None:
+            cached = self.cache.get(f"openalex_institution:{key}")
+            return cached is not None and cached.value is None
+        expires_at = self._misses.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
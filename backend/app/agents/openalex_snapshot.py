@@ -0,0 +1,339 @@
+# /Complete workflow/agents/openalex_snapshot.py
+import argparse
+import glob
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app.agents.openalex_abstracts import reconstruct_abstract
+from app.core.enrichment_cache import normalize_text
+from app.core.metrics import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    id TEXT PRIMARY KEY,
+    display_name TEXT,
+    orcid TEXT,
+    works_count INTEGER,
+    cited_by_count INTEGER,
+    h_index INTEGER,
+    i10_index INTEGER,
+    -- 1 when h_index and i10_index were computed from the stored works
+    local_stats INTEGER NOT NULL DEFAULT 0,
+    institution TEXT
+);
+CREATE TABLE IF NOT EXISTS author_names (
+    name_key TEXT NOT NULL,
+    author_id TEXT NOT NULL,
+    PRIMARY KEY (name_key, author_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_author_names_author ON author_names (author_id);
+CREATE TABLE IF NOT EXISTS author_institutions (
+    author_id TEXT NOT NULL,
+    institution_id TEXT NOT NULL,
+    institution_key TEXT NOT NULL,
+    PRIMARY KEY (author_id, institution_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_author_institutions_key ON author_institutions (institution_key);
+CREATE TABLE IF NOT EXISTS works (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    publication_year INTEGER,
+    cited_by_count INTEGER NOT NULL,
+    abstract TEXT
+);
+CREATE TABLE IF NOT EXISTS authorships (
+    author_id TEXT NOT NULL,
+    work_id TEXT NOT NULL,
+    cited_by_count INTEGER NOT NULL,
+    PRIMARY KEY (author_id, work_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_authorships_top ON authorships (author_id, cited_by_count DESC);
+CREATE INDEX IF NOT EXISTS idx_authorships_work ON authorships (work_id);
+CREATE TABLE IF NOT EXISTS partitions (
+    path TEXT PRIMARY KEY,
+    entity TEXT NOT NULL,
+    records INTEGER NOT NULL,
+    ingested_at REAL NOT NULL
+);
+"""
+
+OPENALEX_ID_PREFIX = "https://openalex.org/"
+
+
+def _short_id(openalex_id: Optional[str]) -> Optional[str]:
+    return openalex_id.rstrip("/").split("/")[-1] if openalex_id else None
+
+
+def _read_partition(path: str) -> Iterator[Dict[str, Any]]:
+    """Records of one snapshot partition: gzipped JSON Lines, one entity per line."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _author_institutions(author: Dict[str, Any]) -> List[Dict[str, Any]]:
+    institutions = list(author.get("last_known_institutions") or [])
+    if author.get("last_known_institution"):
+        institutions.append(author["last_known_institution"])
+    institutions += [a.get("institution") or {} for a in author.get("affiliations") or []]
+    return [i for i in institutions if i.get("id") and i.get("display_name")]
+
+
+def _h_and_i10(citations: Iterable[int]) -> tuple[int, int]:
+    h = i10 = 0
+    for rank, cited in enumerate(sorted(citations, reverse=True), start=1):
+        if cited >= rank:
+            h = rank
+        if cited >= 10:
+            i10 += 1
+    return h, i10
+
+
+class OpenAlexSnapshot:
+    """
+    Local, indexed copy of an OpenAlex snapshot subset (authors and works) in
+    SQLite, so author lookups need no network. Authors are indexed by normalised
+    display name (and alternatives) and by institution; each author's works are
+    indexed by citation count, with abstracts stored as text.
+
+        snapshot = OpenAlexSnapshot("data_storage/openalex_snapshot.db")
+        snapshot.ingest("openalex-snapshot/data")   # only new partitions are read
+        snapshot.author_data("Jane Doe", "University of Cambridge")
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection per thread; sqlite3 connections must not be shared.
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- Ingestion ---
+
+    def ingest(self, snapshot_dir: str) -> Dict[str, int]:
+        """
+        Loads every partition under `snapshot_dir`/authors and `snapshot_dir`/works
+        that has not been ingested yet, oldest first. Returns the record counts.
+        """
+        counts = {"partitions": 0, "authors": 0, "works": 0}
+        for entity in ("authors", "works"):
+            paths = sorted(glob.glob(os.path.join(snapshot_dir, entity, "**", "*.gz"), recursive=True))
+            for path in paths:
+                records = self.ingest_partition(entity, path, key=os.path.relpath(path, snapshot_dir))
+                if records is not None:
+                    counts["partitions"] += 1
+                    counts[entity] += records
+        return counts
+
+    def ingest_partition(self, entity: str, path: str, key: Optional[str] = None) -> Optional[int]:
+        """Loads one partition in a single transaction; returns None if it was already loaded."""
+        key = key or path
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM partitions WHERE path = ?", (key,)).fetchone():
+            return None
+        started = time.monotonic()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if entity == "authors":
+                records = self._ingest_authors(conn, _read_partition(path))
+            elif entity == "works":
+                records = self._ingest_works(conn, _read_partition(path))
+            else:
+                raise ValueError(f"Unknown OpenAlex entity '{entity}'")
+            conn.execute(
+                "INSERT INTO partitions (path, entity, records, ingested_at) VALUES (?, ?, ?, ?)",
+                (key, entity, records, time.time())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        print(f"  -> [OpenAlex snapshot] Ingested {records} {entity} from {key} in {time.monotonic() - started:.1f}s")
+        return records
+
+    def _ingest_authors(self, conn: sqlite3.Connection, authors: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        without_stats = []
+        for author in authors:
+            author_id = _short_id(author.get("id"))
+            if not author_id:
+                continue
+            summary = author.get("summary_stats") or {}
+            if summary.get("h_index") is None:
+                without_stats.append(author_id)
+            institutions = _author_institutions(author)
+            conn.execute(
+                "INSERT OR REPLACE INTO authors (id, display_name, orcid, works_count, cited_by_count, h_index, i10_index, institution) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    author_id, author.get("display_name"), author.get("orcid"),
+                    author.get("works_count"), author.get("cited_by_count"),
+                    summary.get("h_index"), summary.get("i10_index"),
+                    institutions[0]["display_name"] if institutions else None,
+                )
+            )
+            # A newer record replaces the old names and institutions
+            conn.execute("DELETE FROM author_names WHERE author_id = ?", (author_id,))
+            conn.execute("DELETE FROM author_institutions WHERE author_id = ?", (author_id,))
+            names = {normalize_text(n) for n in [author.get("display_name")] + list(author.get("display_name_alternatives") or []) if n}
+            conn.executemany(
+                "INSERT OR IGNORE INTO author_names (name_key, author_id) VALUES (?, ?)",
+                [(name, author_id) for name in names if name]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO author_institutions (author_id, institution_id, institution_key) VALUES (?, ?, ?)",
+                [(author_id, _short_id(i["id"]), normalize_text(i["display_name"])) for i in institutions]
+            )
+            count += 1
+        self._fill_missing_stats(conn, without_stats)
+        return count
+
+    def _ingest_works(self, conn: sqlite3.Connection, works: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        touched: set[str] = set()
+        for work in works:
+            work_id = _short_id(work.get("id"))
+            if not work_id:
+                continue
+            cited = work.get("cited_by_count") or 0
+            conn.execute(
+                "INSERT OR REPLACE INTO works (id, title, publication_year, cited_by_count, abstract) VALUES (?, ?, ?, ?, ?)",
+                (work_id, work.get("title") or work.get("display_name"), work.get("publication_year"), cited,
+                 reconstruct_abstract(work.get("abstract_inverted_index")))
+            )
+            authors = {_short_id((a.get("author") or {}).get("id")) for a in work.get("authorships") or []}
+            authors.discard(None)
+            conn.execute("DELETE FROM authorships WHERE work_id = ?", (work_id,))
+            conn.executemany(
+                "INSERT INTO authorships (author_id, work_id, cited_by_count) VALUES (?, ?, ?)",
+                [(author_id, work_id, cited) for author_id in authors]
+            )
+            touched |= authors
+            count += 1
+        self._fill_missing_stats(conn, touched)
+        return count
+
+    def _fill_missing_stats(self, conn: sqlite3.Connection, author_ids: Iterable[str]) -> None:
+        """Computes h-index and i10 from the stored works for authors whose record had no summary_stats."""
+        for author_id in author_ids:
+            row = conn.execute("SELECT h_index, local_stats FROM authors WHERE id = ?", (author_id,)).fetchone()
+            if row is None or (row[0] is not None and not row[1]):
+                continue
+            citations = [c for (c,) in conn.execute("SELECT cited_by_count FROM authorships WHERE author_id = ?", (author_id,))]
+            h_index, i10_index = _h_and_i10(citations)
+            conn.execute(
+                "UPDATE authors SET h_index = ?, i10_index = ?, local_stats = 1 WHERE id = ?",
+                (h_index, i10_index, author_id)
+            )
+
+    # --- Lookups ---
+
+    def find_author(self, name: str, affiliation: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The best stored author for `name`, preferring one whose institution matches `affiliation`."""
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT a.id, a.display_name, a.orcid, a.works_count, a.cited_by_count, a.h_index, a.i10_index, a.institution "
+            "FROM author_names n JOIN authors a ON a.id = n.author_id "
+            "WHERE n.name_key = ? ORDER BY a.works_count DESC LIMIT 25",
+            (normalize_text(name),)
+        ).fetchall()
+        if not rows:
+            return None
+        best = rows[0]
+        if affiliation and len(rows) > 1:
+            wanted = normalize_text(affiliation)
+            placeholders = ",".join("?" * len(rows))
+            matching = {
+                author_id for (author_id,) in conn.execute(
+                    f"SELECT DISTINCT author_id FROM author_institutions WHERE author_id IN ({placeholders}) "
+                    "AND institution_key LIKE '%' || ? || '%'",
+                    [row[0] for row in rows] + [wanted]
+                )
+            }
+            best = next((row for row in rows if row[0] in matching), best)
+        keys = ("id", "display_name", "orcid", "works_count", "cited_by_count", "h_index", "i10_index", "institution")
+        return dict(zip(keys, best))
+
+    def top_works(self, author_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT w.title, w.cited_by_count, w.abstract FROM authorships s JOIN works w ON w.id = s.work_id "
+            "WHERE s.author_id = ? ORDER BY s.cited_by_count DESC LIMIT ?",
+            (author_id, limit)
+        ).fetchall()
+        return [{"title": title, "cited_by_count": cited, "abstract": abstract} for title, cited, abstract in rows]
+
+    def author_data(self, name: str, affiliation: Optional[str] = None, top_n_publications: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        The same result as OpenAlexClient.fetch_author_data, served from the
+        snapshot, or None when the author (or their works) are not in it.
+        """
+        author = self.find_author(name, affiliation)
+        works = self.top_works(author["id"], top_n_publications) if author else []
+        if author is None or (author["works_count"] and not works):
+            metrics.increment("openalex_snapshot_lookups_total", result="miss")
+            return None
+        metrics.increment("openalex_snapshot_lookups_total", result="hit")
+        return {
+            "author_metrics": {
+                "openalex_id": OPENALEX_ID_PREFIX + author["id"],
+                "display_name": author["display_name"],
+                "works_count": author["works_count"],
+                "cited_by_count": author["cited_by_count"],
+                "h_index": author["h_index"],
+                "i10_index": author["i10_index"],
+                "last_known_institution": author["institution"],
+                "orcid": author["orcid"],
+            },
+            "top_publications": [
+                {"title": w["title"], "abstract": w["abstract"] or "Abstract not available.", "cited_by_count": w["cited_by_count"]}
+                for w in works
+            ],
+        }
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connection()
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("authors", "works", "partitions")
+        }
+
+
+_default_snapshot: Optional[OpenAlexSnapshot] = None
+
+
+def get_openalex_snapshot() -> Optional[OpenAlexSnapshot]:
+    """The snapshot at OPENALEX_SNAPSHOT_PATH, or None when snapshot mode is not set up."""
+    global _default_snapshot
+    path = os.getenv("OPENALEX_SNAPSHOT_PATH")
+    if not path or not os.path.exists(path):
+        return None
+    if _default_snapshot is None or _default_snapshot.db_path != path:
+        _default_snapshot = OpenAlexSnapshot(path)
+    return _default_snapshot
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest new OpenAlex snapshot partitions into the local store.")
+    parser.add_argument("snapshot_dir", help="directory holding authors/ and works/ partitions (the snapshot's data/)")
+    parser.add_argument("--db", default=os.getenv("OPENALEX_SNAPSHOT_PATH", "data_storage/openalex_snapshot.db"))
+    args = parser.parse_args()
+    snapshot = OpenAlexSnapshot(args.db)
+    print(snapshot.ingest(args.snapshot_dir))
+    print(snapshot.stats())
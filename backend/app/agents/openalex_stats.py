@@ -0,0 +1,87 @@
+# /Complete workflow/agents/openalex_stats.py
+import heapq
+import math
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+# Citations of a work count half as much every this many years after publication
+RECENCY_HALF_LIFE_YEARS = 5.0
+
+
+class CitationStats:
+    """
+    Single-pass accumulator of research-depth metrics over an author's works, in
+    any order. Memory is bounded by the h-index, the number of publication years
+    and `top_n`, not by the number of works, so authors with thousands of works
+    can be streamed page by page.
+
+        stats = CitationStats(top_n=10)
+        for work in works:
+            stats.add(work)
+        stats.summary()
+    """
+    def __init__(self, top_n: int = 10, current_year: Optional[int] = None, half_life_years: float = RECENCY_HALF_LIFE_YEARS):
+        self.top_n = top_n
+        self.current_year = current_year or date.today().year
+        self.decay = math.log(2) / half_life_years
+        self.works_count = 0
+        self.total_citations = 0
+        self.i10_index = 0
+        self.recency_weighted_impact = 0.0
+        # Citations received per calendar year (OpenAlex `counts_by_year`)
+        self.citations_by_year: Dict[int, int] = {}
+        # Works published per year
+        self.works_by_year: Dict[int, int] = {}
+        # Min-heap of the citation counts that make up the h-index; its size is h
+        self._h_heap: List[int] = []
+        # Min-heap of (citations, sequence, work) for the most cited works
+        self._top: List[tuple] = []
+        self._sequence = 0
+
+    @property
+    def h_index(self) -> int:
+        return len(self._h_heap)
+
+    def add(self, work: Dict[str, Any]) -> None:
+        cited = work.get("cited_by_count") or 0
+        year = work.get("publication_year")
+        self.works_count += 1
+        self.total_citations += cited
+        if cited >= 10:
+            self.i10_index += 1
+
+        # h grows by one when a work beats the current h and the h+1 most cited
+        # works all have at least h+1 citations
+        if cited > self.h_index:
+            heapq.heappush(self._h_heap, cited)
+            if self._h_heap[0] < len(self._h_heap):
+                heapq.heappop(self._h_heap)
+
+        if year:
+            self.works_by_year[year] = self.works_by_year.get(year, 0) + 1
+            age = max(0, self.current_year - year)
+            self.recency_weighted_impact += cited * math.exp(-self.decay * age)
+        for count in work.get("counts_by_year") or []:
+            self.citations_by_year[count["year"]] = self.citations_by_year.get(count["year"], 0) + count.get("cited_by_count", 0)
+
+        self._sequence += 1
+        entry = (cited, -self._sequence, work)
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, entry)
+        elif entry[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, entry)
+
+    def top_works(self) -> List[Dict[str, Any]]:
+        """The `top_n` most cited works, most cited first (earliest seen first on ties)."""
+        return [work for _, _, work in sorted(self._top, key=lambda entry: entry[:2], reverse=True)]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "works_counted": self.works_count,
+            "total_citations": self.total_citations,
+            "h_index": self.h_index,
+            "i10_index": self.i10_index,
+            "citations_per_year": dict(sorted(self.citations_by_year.items())),
+            "works_per_year": dict(sorted(self.works_by_year.items())),
+            "recency_weighted_impact": round(self.recency_weighted_impact, 2),
+        }
@@ -1,13 +1,22 @@
 import argparse
 import json
 import os
+import sys
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import glob
 
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+# Add the project root directory to the Python path, so the script also runs directly
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(PROJECT_ROOT)
+
+from app.core.llm_cache import generate_json_cached
+
+# Pro for the more complex group analysis
+GEMINI_MODEL = "gemini-1.5-pro"
+
 
 def create_group_analysis_prompt(transcripts: List[Dict]) -> str:
     """
@@ -91,10 +100,13 @@ def analyze_group_dynamics(transcripts: List[Dict], google_api_key: str) -> Dict
     Returns:
         Dictionary containing group analysis results
     """
+    # Imported here so loading this module does not pull in the Gemini SDK
+    import google.generativeai as genai
+
     try:
         # Configure Gemini API
         genai.configure(api_key=google_api_key)
-        model = genai.GenerativeModel('gemini-1.5-pro')  # Using pro for more complex analysis
+        model = genai.GenerativeModel(GEMINI_MODEL)
         
         # Create analysis prompt
         prompt = create_group_analysis_prompt(transcripts)
@@ -107,22 +119,12 @@ def analyze_group_dynamics(transcripts: List[Dict], google_api_key: str) -> Dict
             "max_output_tokens": 8000,  # Larger for comprehensive group analysis
             "temperature": 0.2,         # Low temperature for consistent JSON
         }
-        response = model.generate_content(prompt, generation_config=generation_config)
-        
-        # Clean the response text to extract JSON (remove code blocks if present)
-        response_text = response.text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]  # Remove ```json
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]  # Remove ```
-        response_text = response_text.strip()
-        
-        # Parse JSON response
-        analysis_result = json.loads(response_text)
+        # Reuse the analysis of identical transcripts when the LLM response cache is enabled
+        analysis_result = generate_json_cached(model, prompt, generation_config)
         
         # Add metadata
         analysis_result["metadata"] = {
-            "model_used": "gemini-1.5-pro",
+            "model_used": GEMINI_MODEL,
             "analysis_timestamp": datetime.now().isoformat(),
             "transcript_count": len(transcripts),
             "transcript_sources": [t.get("conversation_id", "unknown") for t in transcripts]
@@ -138,7 +140,7 @@ def analyze_group_dynamics(transcripts: List[Dict], google_api_key: str) -> Dict
             "success": False,
             "error": "json_decode_error",
             "message": f"Failed to parse Gemini response as JSON: {str(e)}",
-            "raw_response": response_text if 'response_text' in locals() else (response.text if 'response' in locals() else None)
+            "raw_response": e.doc
         }
     except Exception as e:
         return {
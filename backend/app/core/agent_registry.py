@@ -0,0 +1,97 @@
+# /Complete workflow/core/agent_registry.py
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.agents.analysis_report_agent import create_analysis_agent
+from app.agents.linkedin_agent import create_linkedin_agent, create_linkedin_pool
+from app.agents.openalex_api import aclose_openalex_client
+from app.core.base_openrouter_agent import BaseOpenRouterAgent
+from app.core.enrichment_cache import get_enrichment_cache
+from app.core.mcp_pool import MCPServerPool
+from app.core.workflow import FounderAnalysisOrchestrator
+
+
+class AgentRegistry:
+    """
+    Builds the agents once at server startup and shares them across requests. LinkedIn
+    lookups lease warm MCP containers from a pool; a background health check pings the
+    idle ones and replaces those that stop answering.
+    """
+    def __init__(
+        self,
+        openrouter_api_key: str,
+        tavily_api_key: str,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 15.0,
+    ):
+        self.openrouter_api_key = openrouter_api_key
+        self.tavily_api_key = tavily_api_key
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.orchestrator: Optional[FounderAnalysisOrchestrator] = None
+        self.report_agent = None
+        self.linkedin_pool: Optional[MCPServerPool] = None
+        self.status: Dict[str, Any] = {"linkedin_mcp": "stopped", "checked_at": None, "restarts": 0}
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        print("Starting shared agents...")
+        self.linkedin_pool = create_linkedin_pool()
+        self.linkedin_pool.ping_timeout = self.health_check_timeout
+        await self.linkedin_pool.start()
+        self.orchestrator = FounderAnalysisOrchestrator(
+            openrouter_api_key=self.openrouter_api_key,
+            tavily_api_key=self.tavily_api_key,
+            cache=get_enrichment_cache(),
+            linkedin_agent=create_linkedin_agent(pooled=True),
+            linkedin_pool=self.linkedin_pool
+        )
+        self.report_agent = create_analysis_agent()
+        self._update_status()
+        self._health_task = asyncio.create_task(self._health_loop())
+        print("Shared agents started.")
+
+    async def stop(self) -> None:
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+        if self.linkedin_pool is not None:
+            await self.linkedin_pool.stop()
+        if self.orchestrator is not None:
+            await self.orchestrator.github_agent.github_api.aclose()
+        await BaseOpenRouterAgent.aclose_shared_client()
+        await aclose_openalex_client()
+        self.status["linkedin_mcp"] = "stopped"
+
+    async def check_health(self) -> Dict[str, Any]:
+        """Pings the idle LinkedIn MCP servers, replacing any that do not answer."""
+        try:
+            await self.linkedin_pool.check_health()
+        except Exception as e:
+            print(f"Failed to restart LinkedIn MCP server: {e}")
+            self.status["linkedin_mcp"] = f"unhealthy: {e}"
+            return dict(self.status)
+        self._update_status()
+        return dict(self.status)
+
+    def _update_status(self) -> None:
+        pool = self.linkedin_pool.stats()
+        self.status["linkedin_mcp"] = linkedin_pool_status(pool)
+        self.status["restarts"] = pool["replacements"]
+        self.status["linkedin_mcp_pool"] = pool
+        self.status["checked_at"] = datetime.now().isoformat()
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check_health()
+
+
+def linkedin_pool_status(pool: Dict[str, Any]) -> str:
+    """Health of the LinkedIn MCP pool from its stats: `running`, or `degraded: <reason>`."""
+    if pool["start_failures"]:
+        return f"degraded: last {pool['start_failures']} server start(s) failed"
+    if pool["min_size"] and pool["idle"] + pool["in_use"] == 0:
+        return "degraded: no live servers"
+    return "running"
@@ -1,44 +1,180 @@
 # /Complete workflow/core/base_openrouter_agent.py
 import json
-from openai import OpenAI
+import os
+import time
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.llm_cache import get_llm_cache, llm_cache_key
+from app.core.metrics import metrics
+from app.core.resilience import call_with_retries, call_with_retries_sync
+from app.core.scheduler import estimate_tokens, scheduler
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+RESPONSE_FORMAT = {"type": "json_object"}
 
 class BaseOpenRouterAgent:
     """A base class for Agents that use the OpenRouter API."""
+
+    # One pooled HTTP client shared by the async clients of every agent instance.
+    # It is created lazily so it binds to the event loop that first uses it.
+    _shared_http_client: Optional[httpx.AsyncClient] = None
+
+    # Subclasses opt in to the LLM response cache by naming their namespace,
+    # which also selects their TTL (see app.core.llm_cache.DEFAULT_TTLS).
+    cache_namespace: Optional[str] = None
+
     def __init__(self, api_key: str, model: str = "anthropic/claude-3.7-sonnet"):
         if not api_key:
             raise ValueError("OpenRouter API key (API_KEY) is not set.")
-        
+
+        self.api_key = api_key
+        # Retries are handled by app.core.resilience, not by the SDK
         self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            base_url=OPENROUTER_BASE_URL,
             api_key=api_key,
+            max_retries=0,
         )
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_client_pool: Optional[httpx.AsyncClient] = None
         self.model = model
         self.extra_headers = {
-            "HTTP-Referer": "https://unicorn-radar.app", 
+            "HTTP-Referer": "https://unicorn-radar.app",
             "X-Title": "Unicorn Radar Founder Analysis",
         }
 
+    @classmethod
+    def _get_shared_http_client(cls) -> httpx.AsyncClient:
+        if BaseOpenRouterAgent._shared_http_client is None or BaseOpenRouterAgent._shared_http_client.is_closed:
+            BaseOpenRouterAgent._shared_http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "100")),
+                    max_keepalive_connections=int(os.getenv("OPENROUTER_MAX_KEEPALIVE_CONNECTIONS", "20")),
+                ),
+                timeout=httpx.Timeout(float(os.getenv("OPENROUTER_TIMEOUT_SECONDS", "120")), connect=10.0),
+            )
+        return BaseOpenRouterAgent._shared_http_client
+
+    @classmethod
+    async def aclose_shared_client(cls) -> None:
+        """Closes the pooled HTTP client; call on application shutdown."""
+        if BaseOpenRouterAgent._shared_http_client is not None:
+            await BaseOpenRouterAgent._shared_http_client.aclose()
+            BaseOpenRouterAgent._shared_http_client = None
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI client for this agent's key, backed by the shared connection pool."""
+        http_client = self._get_shared_http_client()
+        if self._async_client is None or self._async_client_pool is not http_client:
+            self._async_client_pool = http_client
+            self._async_client = AsyncOpenAI(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=self.api_key,
+                http_client=http_client,
+                max_retries=0,
+            )
+        return self._async_client
+
+    @staticmethod
+    def _cacheable_system_message(text: str) -> dict:
+        """
+        System message marked as a provider-side prompt cache breakpoint. Providers
+        that cache automatically ignore the hint; Anthropic models need it.
+        """
+        return {
+            "role": "system",
+            "content": [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}],
+        }
+
+    def _record_usage(self, completion, elapsed: float) -> None:
+        """Records latency and prompt token usage, including prompt cache hits."""
+        usage = getattr(completion, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        cache_hit = "true" if cached_tokens else "false"
+        metrics.observe("llm_request_seconds", elapsed, model=self.model, prompt_cache_hit=cache_hit)
+        if usage is not None:
+            metrics.increment("llm_prompt_tokens_total", usage.prompt_tokens or 0, model=self.model)
+            metrics.increment("llm_cached_prompt_tokens_total", cached_tokens, model=self.model)
+            metrics.increment("llm_completion_tokens_total", usage.completion_tokens or 0, model=self.model)
+
+    def _parse_completion(self, completion) -> dict:
+        """Parses the JSON body of a completion or returns an error dict."""
+        response_content = completion.choices[0].message.content
+        if not response_content:
+            return {"error": "LLM returned empty content."}
+        try:
+            return json.loads(response_content)
+        except json.JSONDecodeError:
+            error_msg = f"Failed to decode LLM JSON. Raw response: '{response_content}'"
+            print(f"ERROR: {error_msg}")
+            return {"error": error_msg}
+
+    def _cache_lookup(self, messages: list[dict]) -> tuple[Optional[str], Optional[dict]]:
+        """Returns (cache key, cached response); the key is None when caching is off."""
+        cache = get_llm_cache() if self.cache_namespace else None
+        if cache is None:
+            return None, None
+        key = llm_cache_key(self.model, messages=messages, response_format=RESPONSE_FORMAT)
+        return key, cache.get(self.cache_namespace, key)
+
+    def _cache_store(self, key: Optional[str], response: dict) -> None:
+        cache = get_llm_cache()
+        if key is not None and cache is not None and "error" not in response:
+            cache.set(self.cache_namespace, key, response)
+
     def _send_llm_request(self, messages: list[dict]) -> dict:
         """Sends a request to the LLM and returns a parsed JSON object or an error dict."""
-        response_content = None
+        cache_key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            return cached
         try:
-            completion = self.client.chat.completions.create(
+            started = time.perf_counter()
+            completion = call_with_retries_sync("openrouter", lambda: self.client.chat.completions.create(
                 extra_headers=self.extra_headers,
                 model=self.model,
                 messages=messages,
-                response_format={"type": "json_object"}
-            )
-            response_content = completion.choices[0].message.content
-            if not response_content:
-                return {"error": "LLM returned empty content."}
-            return json.loads(response_content)
-        # --- START: IMPROVED ERROR HANDLING ---
-        except json.JSONDecodeError:
-            error_msg = f"Failed to decode LLM JSON. Raw response: '{response_content}'"
+                response_format=RESPONSE_FORMAT
+            ))
+            self._record_usage(completion, time.perf_counter() - started)
+            response = self._parse_completion(completion)
+        except Exception as e:
+            error_msg = f"An API error occurred with OpenRouter: {e}"
             print(f"ERROR: {error_msg}")
             return {"error": error_msg}
+        self._cache_store(cache_key, response)
+        return response
+
+    async def _asend_llm_request(self, messages: list[dict]) -> dict:
+        """Async variant of _send_llm_request that does not block the event loop."""
+        cache_key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            return cached
+        async def attempt():
+            prompt_tokens = estimate_tokens(json.dumps(messages))
+            async with scheduler.slot("openrouter", tokens=prompt_tokens) as lease:
+                completion = await self.async_client.chat.completions.create(
+                    extra_headers=self.extra_headers,
+                    model=self.model,
+                    messages=messages,
+                    response_format=RESPONSE_FORMAT
+                )
+                usage = getattr(completion, "usage", None)
+                if usage is not None and usage.total_tokens:
+                    lease.report_tokens(usage.total_tokens)
+                return completion
+
+        try:
+            started = time.perf_counter()
+            completion = await call_with_retries("openrouter", attempt)
+            self._record_usage(completion, time.perf_counter() - started)
+            response = self._parse_completion(completion)
         except Exception as e:
             error_msg = f"An API error occurred with OpenRouter: {e}"
             print(f"ERROR: {error_msg}")
             return {"error": error_msg}
-        # --- END: IMPROVED ERROR HANDLING ---
\ No newline at end of file
+        self._cache_store(cache_key, response)
+        return response
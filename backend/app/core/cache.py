@@ -0,0 +1,133 @@
+# /Complete workflow/core/cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (name, value) VALUES ('total_bytes', 0);
+"""
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    created_at: float
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class DiskCache:
+    """
+    A JSON value cache stored in SQLite (WAL mode). The total size of the stored
+    values is bounded by `max_bytes`; least recently used entries are evicted first.
+    """
+    def __init__(self, db_path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection per thread; sqlite3 connections must not be shared.
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[CacheEntry]:
+        """
+        Returns the entry stored under `key` and marks it as recently used. Expired
+        entries are only returned when `allow_expired` is set.
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, created_at, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(json.loads(row[0]), row[1], row[2])
+        if entry.expired and not allow_expired:
+            return None
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Stores `value` under `key` for `ttl` seconds, evicting old entries if needed."""
+        serialized = json.dumps(value, default=str)
+        size = len(serialized.encode("utf-8"))
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, serialized, size, now, now + ttl, now)
+            )
+            conn.execute(
+                "UPDATE stats SET value = value + ? WHERE name = 'total_bytes'",
+                (size - (old[0] if old else 0),)
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.execute("UPDATE stats SET value = value - ? WHERE name = 'total_bytes'", (old[0],))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def total_bytes(self) -> int:
+        (value,) = self._connection().execute("SELECT value FROM stats WHERE name = 'total_bytes'").fetchone()
+        return value
+
+    def _evict(self, conn: sqlite3.Connection, batch_size: int = 100) -> None:
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        (total,) = conn.execute("SELECT value FROM stats WHERE name = 'total_bytes'").fetchone()
+        while total > self.max_bytes:
+            victims = conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?", (batch_size,)
+            ).fetchall()
+            if not victims:
+                break
+            for key, size in victims:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+            conn.execute("UPDATE stats SET value = ? WHERE name = 'total_bytes'", (total,))
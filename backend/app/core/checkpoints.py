@@ -0,0 +1,185 @@
+# /Complete workflow/core/checkpoints.py
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.singleflight import EventCallback
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS stages (
+    job_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    value TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (job_id, stage)
+);
+"""
+
+
+def source_stage(founder_id: Any, source: str) -> str:
+    """Checkpoint name of one source result of one founder."""
+    return f"source:{founder_id}:{source}"
+
+
+class CheckpointStore:
+    """
+    SQLite (WAL mode) store of analysis jobs and the results of their finished
+    stages. A job is recorded as `running` when it is submitted and marked
+    `completed` or `failed` when it ends, so the jobs still `running` at startup
+    are the ones a restart interrupted.
+    """
+    def __init__(self, db_path: str = "data_storage/checkpoints.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection per thread; sqlite3 connections must not be shared.
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def start_job(self, job_id: str, payload: Any) -> None:
+        """Records a job with what is needed to run it again. Existing checkpoints are kept."""
+        now = time.time()
+        self._connection().execute(
+            "INSERT INTO jobs (job_id, payload, status, created_at, updated_at) VALUES (?, ?, 'running', ?, ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at",
+            (job_id, json.dumps(payload, default=str), now, now)
+        )
+
+    def finish_job(self, job_id: str, status: str = "completed") -> None:
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?", (status, time.time(), job_id)
+        )
+
+    def unfinished_jobs(self, max_age_seconds: Optional[float] = None) -> List[Tuple[str, Any]]:
+        """(job_id, payload) of the jobs still marked running, oldest first."""
+        query = "SELECT job_id, payload FROM jobs WHERE status = 'running'"
+        params: tuple = ()
+        if max_age_seconds is not None:
+            query += " AND created_at >= ?"
+            params = (time.time() - max_age_seconds,)
+        rows = self._connection().execute(query + " ORDER BY created_at", params).fetchall()
+        return [(job_id, json.loads(payload)) for job_id, payload in rows]
+
+    def save(self, job_id: str, stage: str, value: Any) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO stages (job_id, stage, value, saved_at) VALUES (?, ?, ?, ?)",
+            (job_id, stage, json.dumps(value, default=str), time.time())
+        )
+
+    def load(self, job_id: str, stage: str) -> Optional[Any]:
+        """The saved result of a stage, or None if it has not finished."""
+        row = self._connection().execute(
+            "SELECT value FROM stages WHERE job_id = ? AND stage = ?", (job_id, stage)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stages(self, job_id: str) -> List[str]:
+        rows = self._connection().execute(
+            "SELECT stage FROM stages WHERE job_id = ? ORDER BY saved_at", (job_id,)
+        ).fetchall()
+        return [stage for (stage,) in rows]
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Deletes jobs (and their checkpoints) last updated more than `older_than_seconds` ago."""
+        cutoff = time.time() - older_than_seconds
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM stages WHERE job_id IN (SELECT job_id FROM jobs WHERE updated_at < ?)", (cutoff,))
+            deleted = conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,)).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return deleted
+
+
+class JobCheckpoints:
+    """The checkpoints of one job, as seen by the workflow."""
+    def __init__(self, store: CheckpointStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def load(self, stage: str) -> Optional[Any]:
+        return self.store.load(self.job_id, stage)
+
+    def save(self, stage: str, value: Any) -> None:
+        self.store.save(self.job_id, stage, value)
+
+    def record(self, event: str, data: Dict[str, Any]) -> None:
+        """
+        Workflow event callback that saves every successful stage result as it is
+        published: each founder's source results, the interview merge and the report.
+        """
+        if event == "source_result" and not _is_error(data.get("result")):
+            self.save(source_stage(data.get("founder_id"), data["source"]), data["result"])
+        elif event == "interview_merge":
+            self.save("interview_merge", data["founders"])
+        elif event == "report" and not _is_error(data.get("report")):
+            self.save("report", data["report"])
+
+    def recorder(self, on_event: Optional[EventCallback]) -> EventCallback:
+        """Wraps an event callback so the events also checkpoint their results."""
+        def record_and_forward(event: str, data: Dict[str, Any]) -> None:
+            self.record(event, data)
+            if on_event:
+                on_event(event, data)
+        return record_and_forward
+
+
+def _is_error(result: Any) -> bool:
+    return not isinstance(result, (dict, list)) or (isinstance(result, dict) and "error" in result)
+
+
+# Checkpoints of the analysis job the current task works for; set by `checkpoint_scope`
+current_checkpoints: contextvars.ContextVar[Optional[JobCheckpoints]] = contextvars.ContextVar("checkpoints", default=None)
+
+
+@contextmanager
+def checkpoint_scope(store: Optional[CheckpointStore], job_id: str) -> Iterator[Optional[JobCheckpoints]]:
+    """Makes the workflow inside the block save and reuse the stage results of `job_id`."""
+    checkpoints = JobCheckpoints(store, job_id) if store is not None else None
+    token = current_checkpoints.set(checkpoints)
+    try:
+        yield checkpoints
+    finally:
+        current_checkpoints.reset(token)
+
+
+_default_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """
+    Returns the process-wide checkpoint store, or None when checkpointing is
+    disabled with CHECKPOINTS_ENABLED=false.
+    """
+    global _default_store
+    if os.getenv("CHECKPOINTS_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _default_store is None:
+        _default_store = CheckpointStore(os.getenv("CHECKPOINT_PATH", "data_storage/checkpoints.db"))
+    return _default_store
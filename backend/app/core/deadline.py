@@ -0,0 +1,50 @@
+# /Complete workflow/core/deadline.py
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Overall budget of one analysis run, and the part of it kept back for the report
+# stage. Values <= 0 turn the deadline off.
+ANALYSIS_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_DEADLINE_SECONDS", "180"))
+REPORT_RESERVE_SECONDS = float(os.getenv("ANALYSIS_REPORT_RESERVE_SECONDS", "45"))
+
+# Monotonic time by which the current task's work must be done, or None. Child
+# tasks inherit it, so a deadline set around a workflow reaches every agent call.
+current_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float] = None, reserve: float = 0.0) -> Iterator[Optional[float]]:
+    """
+    Runs the block under a deadline `seconds` from now, minus `reserve` seconds
+    kept back for the caller. An enclosing deadline is never extended. Yields the
+    deadline in effect.
+    """
+    deadline = current_deadline.get()
+    if seconds is not None and seconds > 0:
+        own = time.monotonic() + seconds
+        deadline = own if deadline is None else min(deadline, own)
+    if deadline is not None and reserve:
+        deadline -= reserve
+    token = current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        current_deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (possibly negative), or None without one."""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def bounded_timeout(timeout: Optional[float]) -> Optional[float]:
+    """`timeout` shortened to what is left of the current deadline, never below zero."""
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(0.0, left)
+    return left if timeout is None else min(timeout, left)
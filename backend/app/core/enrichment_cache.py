@@ -0,0 +1,142 @@
+# /Complete workflow/core/enrichment_cache.py
+import asyncio
+import os
+import re
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from app.core.cache import DiskCache
+from app.core.deadline import current_deadline
+
+DAY = 24 * 60 * 60
+
+# How long a cached result counts as fresh, per source.
+DEFAULT_TTLS = {
+    "linkedin_analysis": float(os.getenv("LINKEDIN_CACHE_TTL_SECONDS", str(7 * DAY))),
+    "github_analysis": float(os.getenv("GITHUB_CACHE_TTL_SECONDS", str(1 * DAY))),
+    "openalex_analysis": float(os.getenv("OPENALEX_CACHE_TTL_SECONDS", str(7 * DAY))),
+}
+
+# How long after expiry a stale result may still be served while it is refreshed.
+DEFAULT_MAX_STALE_SECONDS = float(os.getenv("ENRICHMENT_CACHE_MAX_STALE_SECONDS", str(30 * DAY)))
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduces a profile URL to a stable form, e.g. "https://www.LinkedIn.com/in/Jane/?trk=x"
+    and "linkedin.com/in/jane" both become "linkedin.com/in/jane".
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    host = re.sub(r"^(www|m|mobile)\.", "", host)
+    path = re.sub(r"/+", "/", parts.path).rstrip("/").lower()
+    return host + path
+
+
+def normalize_text(text: str) -> str:
+    """Lower-cases, strips accents and punctuation, and collapses whitespace."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w\s]", " ", text.casefold())
+    return " ".join(text.split())
+
+
+def enrichment_cache_key(source: str, founder_data: Dict[str, Any]) -> Optional[str]:
+    """Builds the cache key of a founder for one source, or None if it has no identity."""
+    if source == "linkedin_analysis" and founder_data.get("linkedin"):
+        return f"{source}:{canonicalize_url(founder_data['linkedin'])}"
+    if source == "github_analysis" and founder_data.get("github"):
+        return f"{source}:{canonicalize_url(founder_data['github'])}"
+    if source == "openalex_analysis" and founder_data.get("name"):
+        affiliation = normalize_text(founder_data.get("university") or "")
+        return f"{source}:{normalize_text(founder_data['name'])}|{affiliation}"
+    return None
+
+
+class EnrichmentCache:
+    """
+    Persistent cache of per-founder enrichment results with stale-while-revalidate:
+    fresh hits are returned directly, stale hits are returned immediately while a
+    background task refreshes them, and misses are fetched inline. Error results
+    are never cached.
+    """
+    def __init__(
+        self,
+        db_path: str = "data_storage/enrichment_cache.db",
+        ttls: Optional[Dict[str, float]] = None,
+        max_stale_seconds: float = DEFAULT_MAX_STALE_SECONDS,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.store = DiskCache(db_path, max_bytes=max_bytes)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_stale_seconds = max_stale_seconds
+        # Keys with a refresh in flight, and references that keep those tasks alive
+        self._refreshing: set[str] = set()
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    def _ttl(self, source: str) -> float:
+        return self.ttls.get(source, DAY)
+
+    async def get_or_fetch(self, source: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Returns the cached result for `key`, calling `fetch` on a miss or to revalidate."""
+        entry = self.store.get(key, allow_expired=True)
+        if entry is not None:
+            if not entry.expired:
+                print(f"  -> [Cache] HIT for {key}")
+                return entry.value
+            if time.time() - entry.expires_at < self.max_stale_seconds:
+                print(f"  -> [Cache] STALE for {key}, refreshing in background")
+                self._schedule_refresh(source, key, fetch)
+                return entry.value
+
+        print(f"  -> [Cache] MISS for {key}")
+        return await self._fetch_and_store(source, key, fetch)
+
+    async def _fetch_and_store(self, source: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        result = await fetch()
+        if not (isinstance(result, dict) and "error" in result):
+            self.store.set(key, result, ttl=self._ttl(source))
+        return result
+
+    def _schedule_refresh(self, source: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            # Runs on its own time, not under the deadline of the request that found the stale entry
+            current_deadline.set(None)
+            try:
+                await self._fetch_and_store(source, key, fetch)
+            except Exception as e:
+                print(f"  -> [Cache] Background refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+
+_default_cache: Optional[EnrichmentCache] = None
+
+
+def get_enrichment_cache() -> Optional[EnrichmentCache]:
+    """
+    Returns the process-wide enrichment cache, or None when it is disabled with
+    ENRICHMENT_CACHE_ENABLED=false.
+    """
+    global _default_cache
+    if os.getenv("ENRICHMENT_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is None:
+        _default_cache = EnrichmentCache(
+            db_path=os.getenv("ENRICHMENT_CACHE_PATH", "data_storage/enrichment_cache.db"),
+            max_bytes=int(os.getenv("ENRICHMENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        )
+    return _default_cache
@@ -0,0 +1,164 @@
+# /Complete workflow/core/jobs.py
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+# Ordered stages of the analysis workflow, used for per-stage progress reporting.
+ANALYSIS_STAGES = ["enrichment", "interview_merge", "report"]
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class AnalysisJob:
+    """
+    A single submitted analysis run and its progress.
+    """
+    def __init__(self, payload: Dict[str, Any], context: Any = None, job_id: Optional[str] = None):
+        # An explicit id resumes a job recorded before a restart
+        self.id = job_id or uuid.uuid4().hex
+        self.payload = payload
+        # Extra data the runner needs (e.g. the original request model)
+        self.context = context
+        self.status = "queued"
+        self.stages = {stage: "pending" for stage in ANALYSIS_STAGES}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.submitted_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        # Ordered log of workflow events; subscribers wait on _new_event for more.
+        self.events: list[Dict[str, Any]] = []
+        self._new_event = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def fail_unfinished_stages(self) -> None:
+        """Marks every stage that did not complete as failed, once the job has failed."""
+        for stage, status in self.stages.items():
+            if status != "completed":
+                self.stages[stage] = "failed"
+
+    def record_event(self, event: str, data: Dict[str, Any]) -> None:
+        """
+        Workflow event callback. Appends the event to the job's log, wakes up any
+        streaming subscribers and keeps the per-stage progress up to date.
+        """
+        if event == "stage" and data.get("stage") in self.stages:
+            self.stages[data["stage"]] = data.get("status", "running")
+        self.events.append({"id": len(self.events) + 1, "event": event, "data": data})
+        self._new_event.set()
+        self._new_event = asyncio.Event()
+
+    async def stream_events(self, after: int = 0, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yields the events logged after event id `after`, then follows new ones until
+        the job is done. Yields None whenever `heartbeat` seconds pass without an
+        event so the caller can keep the connection alive.
+        """
+        position = max(after, 0)
+        while True:
+            while position < len(self.events):
+                yield self.events[position]
+                position += 1
+            if self.done:
+                return
+            try:
+                await asyncio.wait_for(self._new_event.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stages": dict(self.stages),
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class AnalysisJobManager:
+    """
+    Runs analysis jobs on a fixed number of worker tasks. Submissions beyond the
+    worker count wait in a bounded queue instead of starting more workflows.
+    """
+    def __init__(
+        self,
+        runner: Callable[[AnalysisJob], Awaitable[Dict[str, Any]]],
+        max_workers: int = 2,
+        max_queue_size: int = 100,
+        max_retained_jobs: int = 500,
+    ):
+        self.runner = runner
+        self.max_workers = max_workers
+        self.max_retained_jobs = max_retained_jobs
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Starts the worker tasks. Must be called from within the running event loop."""
+        if self._workers:
+            return
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.max_workers)]
+        print(f"Analysis job manager started with {self.max_workers} workers.")
+
+    async def stop(self) -> None:
+        """Cancels the worker tasks and waits for them to exit."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, payload: Dict[str, Any], context: Any = None, job_id: Optional[str] = None) -> AnalysisJob:
+        """Queues a new job and returns it immediately."""
+        job = AnalysisJob(payload, context, job_id)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFullError("Too many analysis jobs are queued. Please retry later.")
+        self.jobs[job.id] = job
+        self._evict_finished_jobs()
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return self.jobs.get(job_id)
+
+    def _evict_finished_jobs(self) -> None:
+        """Drops the oldest finished jobs once more than max_retained_jobs are held."""
+        excess = len(self.jobs) - self.max_retained_jobs
+        for job_id in [jid for jid, job in self.jobs.items() if job.done][:max(excess, 0)]:
+            del self.jobs[job_id]
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job = await self.queue.get()
+            job.status = "running"
+            job.started_at = datetime.now().isoformat()
+            job.record_event("status", {"status": job.status})
+            print(f"[worker {worker_id}] Starting analysis job {job.id}")
+            try:
+                job.result = await self.runner(job)
+                job.status = "completed"
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "Job was cancelled."
+                raise
+            except Exception as e:
+                print(f"[worker {worker_id}] Analysis job {job.id} failed: {e}")
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                if job.status == "failed":
+                    job.fail_unfinished_stages()
+                job.finished_at = datetime.now().isoformat()
+                job.record_event(job.status, {"result": job.result, "error": job.error})
+                self.queue.task_done()
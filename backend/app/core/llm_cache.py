@@ -0,0 +1,103 @@
+# /Complete workflow/core/llm_cache.py
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from app.core.cache import DiskCache
+from app.core.metrics import metrics
+from app.core.resilience import call_with_retries_sync
+
+DAY = 24 * 60 * 60
+
+# How long a cached LLM response is reused, per agent. Agents without an entry use DAY.
+DEFAULT_TTLS = {
+    "github_agent": float(os.getenv("GITHUB_LLM_CACHE_TTL_SECONDS", str(1 * DAY))),
+    "consolidator": float(os.getenv("CONSOLIDATOR_LLM_CACHE_TTL_SECONDS", str(7 * DAY))),
+    "analysis_report": float(os.getenv("ANALYSIS_REPORT_LLM_CACHE_TTL_SECONDS", str(7 * DAY))),
+    "gemini": float(os.getenv("GEMINI_LLM_CACHE_TTL_SECONDS", str(7 * DAY))),
+}
+
+
+def llm_cache_key(model: str, **request: Any) -> str:
+    """
+    Content address of an LLM request: a SHA-256 of the model and every request
+    field (messages, response format, generation config, ...), in canonical JSON.
+    """
+    canonical = json.dumps({"model": model, **request}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Disk cache of parsed LLM responses, keyed by llm_cache_key and namespaced per
+    agent so each agent can have its own TTL. Bounded in size with LRU eviction.
+    Callers should only store successful responses.
+    """
+    def __init__(
+        self,
+        db_path: str = "data_storage/llm_cache.db",
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.store = DiskCache(db_path, max_bytes=max_bytes)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+
+    def ttl(self, namespace: str) -> float:
+        return self.ttls.get(namespace, DAY)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self.store.get(f"{namespace}:{key}")
+        if entry is None:
+            metrics.increment("llm_cache_misses_total", namespace=namespace)
+            return None
+        metrics.increment("llm_cache_hits_total", namespace=namespace)
+        print(f"  -> [LLM Cache] HIT for {namespace}")
+        return entry.value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        self.store.set(f"{namespace}:{key}", value, ttl=self.ttl(namespace))
+
+
+_default_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Returns the process-wide LLM response cache. It is opt-in: None unless
+    LLM_CACHE_ENABLED=true.
+    """
+    global _default_cache
+    if os.getenv("LLM_CACHE_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    if _default_cache is None:
+        _default_cache = LLMResponseCache(
+            db_path=os.getenv("LLM_CACHE_PATH", "data_storage/llm_cache.db"),
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+        )
+    return _default_cache
+
+
+def generate_json_cached(model: Any, prompt: str, generation_config: Dict[str, Any], namespace: str = "gemini") -> Any:
+    """
+    Runs `prompt` on a Gemini model and parses its JSON answer (a ```json fence
+    is stripped). Identical requests to the same `model.model_name` are served
+    from the LLM response cache when it is enabled. Raises json.JSONDecodeError,
+    whose `doc` is the raw answer, when the model does not return JSON.
+    """
+    cache = get_llm_cache()
+    cache_key = llm_cache_key(model.model_name, prompt=prompt, generation_config=generation_config) if cache else None
+    cached = cache.get(namespace, cache_key) if cache else None
+    if cached is not None:
+        return cached
+
+    response = call_with_retries_sync("gemini", lambda: model.generate_content(prompt, generation_config=generation_config))
+    text = response.text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.endswith("```"):
+        text = text[:-3]
+    result = json.loads(text.strip())
+    if cache:
+        cache.set(namespace, cache_key, result)
+    return result
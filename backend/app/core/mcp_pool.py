@@ -0,0 +1,289 @@
+# /Complete workflow/core/mcp_pool.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from pydantic_ai.mcp import MCPServerStdio
+
+from app.core.metrics import metrics
+
+
+class CachedToolsMCPServerStdio(MCPServerStdio):
+    """
+    MCPServerStdio that lists the server's tools once per process instead of once per
+    agent run. `refresh_tools` re-lists them and doubles as a liveness ping.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_tools: Optional[list] = None
+
+    async def list_tools(self):
+        if self._cached_tools is None:
+            self._cached_tools = await super().list_tools()
+        return self._cached_tools
+
+    async def refresh_tools(self):
+        self._cached_tools = await super().list_tools()
+        return self._cached_tools
+
+
+class _PooledServer:
+    """
+    One MCP server process. The server context is entered and exited by a dedicated
+    owner task, because the stdio transport's task group must be closed by the task
+    that opened it; leases only use the already running session.
+    """
+    def __init__(self, server: MCPServerStdio):
+        self.server = server
+        self.last_used = time.monotonic()
+        self.leases = 0
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> None:
+        ready = asyncio.get_running_loop().create_future()
+
+        async def own():
+            try:
+                async with self.server:
+                    ready.set_result(None)
+                    await self._stop.wait()
+            except BaseException as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                raise
+
+        self._task = asyncio.create_task(own())
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), timeout=timeout)
+            # Warm the tool schema cache so the first run does not pay for it
+            await asyncio.wait_for(self.ping(), timeout=timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def ping(self) -> None:
+        refresh = getattr(self.server, "refresh_tools", None) or self.server.list_tools
+        await refresh()
+
+    async def close(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPServerPool:
+    """
+    A pool of warm MCP stdio server processes shared by concurrent agent runs. Each
+    `lease()` gets exclusive use of one process, so up to `max_size` runs proceed in
+    parallel and the rest wait. Processes idle for longer than `idle_timeout` are
+    closed (keeping `min_size` warm), and processes that stop answering are replaced.
+
+        async with pool.lease() as server:
+            await agent.run(prompt, toolsets=[server])
+    """
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], MCPServerStdio],
+        max_size: int = 2,
+        min_size: int = 1,
+        idle_timeout: float = 300.0,
+        start_timeout: float = 120.0,
+        ping_timeout: float = 15.0,
+    ):
+        self.name = name
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self.idle_timeout = idle_timeout
+        self.start_timeout = start_timeout
+        self.ping_timeout = ping_timeout
+        self.replacements = 0
+        # Server starts that failed since the last one that succeeded
+        self.start_failures = 0
+        self._idle: list[_PooledServer] = []
+        self._size = 0
+        self._waiting = 0
+        self._condition = asyncio.Condition()
+        self._closed = False
+        self._evict_task: Optional[asyncio.Task] = None
+        # Replacements of servers whose lease was cancelled, closed in the background
+        self._retiring: set = set()
+
+    async def start(self) -> None:
+        """Starts `min_size` processes and the idle eviction loop."""
+        self._closed = False
+        for _ in range(self.min_size):
+            pooled = await self._create()
+            async with self._condition:
+                self._idle.append(pooled)
+        self._evict_task = asyncio.create_task(self._evict_loop())
+        print(f"MCP pool '{self.name}' started with {self.min_size} warm server(s).")
+
+    async def stop(self) -> None:
+        self._closed = True
+        if self._evict_task:
+            self._evict_task.cancel()
+            await asyncio.gather(self._evict_task, return_exceptions=True)
+        async with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        await asyncio.gather(*(pooled.close() for pooled in idle))
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+
+    async def _create(self) -> _PooledServer:
+        async with self._condition:
+            self._size += 1
+        pooled = _PooledServer(self.factory())
+        try:
+            await pooled.start(self.start_timeout)
+        except BaseException:
+            self.start_failures += 1
+            await self._discard(pooled, close=False)
+            raise
+        self.start_failures = 0
+        metrics.increment("mcp_pool_started_total", pool=self.name)
+        return pooled
+
+    async def _discard(self, pooled: _PooledServer, close: bool = True) -> None:
+        if close:
+            await pooled.close()
+        async with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    async def _acquire(self) -> _PooledServer:
+        while True:
+            async with self._condition:
+                if self._closed:
+                    raise RuntimeError(f"MCP pool '{self.name}' is stopped")
+                if not self._idle and self._size >= self.max_size:
+                    self._waiting += 1
+                    metrics.set_gauge("mcp_pool_waiting", self._waiting, pool=self.name)
+                    try:
+                        await self._condition.wait()
+                    finally:
+                        self._waiting -= 1
+                        metrics.set_gauge("mcp_pool_waiting", self._waiting, pool=self.name)
+                    continue
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                return await self._create()
+            if pooled.alive:
+                return pooled
+            # The process exited while idle
+            await self._replace(pooled)
+
+    async def _replace(self, pooled: _PooledServer, reason: str = "unresponsive") -> None:
+        print(f"MCP pool '{self.name}': replacing a server ({reason}).")
+        self.replacements += 1
+        metrics.increment("mcp_pool_replacements_total", pool=self.name)
+        await self._discard(pooled)
+
+    async def _release(self, pooled: _PooledServer) -> None:
+        pooled.last_used = time.monotonic()
+        if self._closed or not pooled.alive:
+            await self._discard(pooled)
+            return
+        async with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    async def _healthy(self, pooled: _PooledServer) -> bool:
+        if not pooled.alive:
+            return False
+        try:
+            await asyncio.wait_for(pooled.ping(), timeout=self.ping_timeout)
+            return True
+        except Exception as e:
+            print(f"MCP pool '{self.name}': health ping failed: {e!r}")
+            return False
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[MCPServerStdio]:
+        """Borrows a running server for the duration of the block."""
+        pooled = await self._acquire()
+        pooled.leases += 1
+        metrics.increment("mcp_pool_leases_total", pool=self.name)
+        try:
+            yield pooled.server
+        except asyncio.CancelledError:
+            # The abandoned tool call may still be running in the process, so it must
+            # not go to the next lease. Closing it happens in the background so the
+            # cancelled caller (e.g. a source cut off at the deadline) is not held up.
+            self._retire(pooled)
+            raise
+        except BaseException:
+            # The run failed; only reuse the process if it still answers
+            if await self._healthy(pooled):
+                await self._release(pooled)
+            else:
+                await self._replace(pooled)
+            raise
+        else:
+            await self._release(pooled)
+
+    def _retire(self, pooled: _PooledServer) -> None:
+        task = asyncio.create_task(self._replace(pooled, reason="lease cancelled"))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def check_health(self) -> Dict[str, Any]:
+        """Pings the idle servers, replaces dead ones and tops the pool up to min_size."""
+        async with self._condition:
+            idle, self._idle = self._idle, []
+        healthy = []
+        for pooled in idle:
+            if await self._healthy(pooled):
+                healthy.append(pooled)
+            else:
+                await self._replace(pooled)
+        async with self._condition:
+            self._idle.extend(healthy)
+            self._condition.notify(len(healthy))
+            missing = self.min_size - self._size
+        for _ in range(max(0, missing)):
+            await self._release(await self._create())
+        return self.stats()
+
+    async def evict_idle(self) -> int:
+        """Closes servers idle for longer than idle_timeout, keeping min_size; returns how many."""
+        now = time.monotonic()
+        async with self._condition:
+            evict, keep = [], []
+            # Oldest first, so the most recently used servers stay warm
+            for pooled in sorted(self._idle, key=lambda p: p.last_used):
+                removable = self._size - len(evict) > self.min_size
+                if removable and now - pooled.last_used > self.idle_timeout:
+                    evict.append(pooled)
+                else:
+                    keep.append(pooled)
+            self._idle = keep
+        for pooled in evict:
+            metrics.increment("mcp_pool_evictions_total", pool=self.name)
+            await self._discard(pooled)
+        return len(evict)
+
+    async def _evict_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 2))
+            await self.evict_idle()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._size - len(self._idle),
+            "waiting": self._waiting,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "replacements": self.replacements,
+            "start_failures": self.start_failures,
+        }
@@ -0,0 +1,12 @@
+# /Complete workflow/core/prompt_loader.py
+import os
+from functools import lru_cache
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+
+
+@lru_cache(maxsize=None)
+def load_prompt(filename: str) -> str:
+    """Reads a prompt file from core/prompts once and serves it from memory afterwards."""
+    with open(os.path.join(PROMPTS_DIR, filename), "r") as prompt_file:
+        return prompt_file.read()
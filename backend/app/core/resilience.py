@@ -0,0 +1,238 @@
+# /Complete workflow/core/resilience.py
+import asyncio
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.deadline import remaining
+from app.core.metrics import metrics
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open."""
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"Circuit breaker for '{provider}' is open; retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, capped at `max_delay` seconds per wait. A
+    provider asking (with Retry-After) for a longer wait than `max_delay` is given
+    up on rather than retried early.
+    """
+    def __init__(
+        self,
+        max_attempts: int = int(os.getenv("LLM_MAX_ATTEMPTS", "4")),
+        base_delay: float = float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "1")),
+        max_delay: float = float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "30")),
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds to wait after failed attempt number `attempt` (starting at 1), or
+        None when the provider's Retry-After is longer than `max_delay`.
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            # The provider told us when to come back; never retry earlier than that
+            if retry_after > self.max_delay:
+                return None
+            return max(retry_after, backoff)
+        return backoff
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker. After `failure_threshold` consecutive provider
+    failures the circuit opens and calls fail fast for `reset_timeout` seconds; then
+    one trial call is let through and its outcome closes or re-opens the circuit.
+    """
+    def __init__(
+        self,
+        provider: str,
+        failure_threshold: int = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")),
+        reset_timeout: float = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30")),
+    ):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed >= self.reset_timeout:
+                # Let one trial call through; another one is allowed only if this
+                # one has not reported back within reset_timeout
+                self.state = "half_open"
+                self.opened_at = time.monotonic()
+                return
+            metrics.increment("llm_circuit_rejections_total", provider=self.provider)
+            raise CircuitOpenError(self.provider, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"  -> [Resilience] Circuit for '{self.provider}' opened after {self.failures} failures")
+                    metrics.increment("llm_circuit_opened_total", provider=self.provider)
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+
+def breaker_states() -> Dict[str, str]:
+    with _breakers_lock:
+        return {provider: breaker.state for provider, breaker in _breakers.items()}
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """Finds the HTTP status of an OpenAI, Anthropic, httpx, pydantic_ai or Google API error."""
+    for candidate in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "code"):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for rate limits, server errors, timeouts and dropped connections."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    # SDK transport errors (APIConnectionError, APITimeoutError, httpx.ReadTimeout, ...)
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Reads the Retry-After header of an HTTP error, in seconds or as an HTTP date."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _on_failure(provider: str, breaker: CircuitBreaker, policy: RetryPolicy, attempt: int, exc: Exception) -> Optional[float]:
+    """Records a failed attempt. Returns how long to wait before retrying, or None to give up."""
+    retryable = is_retryable(exc)
+    if retryable:
+        breaker.record_failure()
+    else:
+        # The provider answered (e.g. a 400), so it is up
+        breaker.record_success()
+    if not retryable or attempt >= policy.max_attempts:
+        metrics.increment("llm_give_ups_total", provider=provider)
+        print(f"  -> [Resilience] Giving up on '{provider}' after {attempt} attempt(s): {exc}")
+        return None
+    delay = policy.delay(attempt, retry_after_seconds(exc))
+    if delay is None:
+        metrics.increment("llm_give_ups_total", provider=provider)
+        print(f"  -> [Resilience] Giving up on '{provider}' after {attempt} attempt(s), Retry-After too long: {exc}")
+        return None
+    left = remaining()
+    if left is not None and delay >= left:
+        # The retry could not start before the caller's deadline
+        metrics.increment("llm_give_ups_total", provider=provider)
+        print(f"  -> [Resilience] Giving up on '{provider}' after {attempt} attempt(s), deadline too close: {exc}")
+        return None
+    metrics.increment("llm_retries_total", provider=provider)
+    print(f"  -> [Resilience] '{provider}' attempt {attempt} failed ({exc}); retrying in {delay:.1f}s")
+    return delay
+
+
+async def call_with_retries(
+    provider: str,
+    fn: Callable[[], Awaitable[Any]],
+    policy: Optional[RetryPolicy] = None,
+) -> Any:
+    """Awaits `fn()` with retries and the provider's circuit breaker; re-raises the last error."""
+    policy = policy or RetryPolicy()
+    breaker = get_circuit_breaker(provider)
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        metrics.increment("llm_attempts_total", provider=provider)
+        try:
+            result = await fn()
+        except Exception as e:
+            delay = _on_failure(provider, breaker, policy, attempt, e)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+def call_with_retries_sync(
+    provider: str,
+    fn: Callable[[], Any],
+    policy: Optional[RetryPolicy] = None,
+) -> Any:
+    """Blocking variant of call_with_retries for synchronous SDK clients."""
+    policy = policy or RetryPolicy()
+    breaker = get_circuit_breaker(provider)
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        metrics.increment("llm_attempts_total", provider=provider)
+        try:
+            result = fn()
+        except Exception as e:
+            delay = _on_failure(provider, breaker, policy, attempt, e)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
@@ -0,0 +1,266 @@
+# /Complete workflow/core/scheduler.py
+import asyncio
+import contextvars
+import os
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from app.core.metrics import metrics
+
+# Per-provider defaults: (max concurrent calls, requests per second, tokens per minute).
+# None means unlimited. Each value can be overridden with SCHEDULER_<PROVIDER>_CONCURRENCY,
+# SCHEDULER_<PROVIDER>_RPS and SCHEDULER_<PROVIDER>_TPM.
+DEFAULT_LIMITS = {
+    "linkedin_mcp": (2, None, None),
+    "github_mcp": (2, None, None),
+    "tavily": (4, 5.0, None),
+    "github": (8, None, None),
+    "openrouter": (16, None, None),
+    "anthropic": (8, None, None),
+    "openalex": (10, None, None),
+}
+FALLBACK_LIMITS = (8, None, None)
+
+# Order in which `Scheduler.slots` takes several providers' slots, lowest rank first.
+# Scarce MCP servers come before the model driving them, so a call queued for a
+# server does not hold a model slot (and its budgets) while it waits.
+SLOT_RANKS = {"linkedin_mcp": 0, "github_mcp": 0}
+DEFAULT_SLOT_RANK = 1
+
+# The analysis job the current task works for; set by `job_scope`
+current_job: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("scheduler_job", default=None)
+DEFAULT_JOB = "_default"
+
+
+@contextmanager
+def job_scope(job_id: str) -> Iterator[None]:
+    """Attributes the provider calls made inside the block (and its child tasks) to `job_id`."""
+    token = current_job.set(job_id)
+    try:
+        yield
+    finally:
+        current_job.reset(token)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt, about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def agent_run_tokens(result: Any) -> int:
+    """Total tokens a pydantic_ai agent run used, or 0 when it does not say."""
+    usage = getattr(result, "usage", None)
+    usage = usage() if callable(usage) else usage
+    return getattr(usage, "total_tokens", None) or 0
+
+
+class ProviderLimits:
+    def __init__(self, concurrency: Optional[int] = None, requests_per_second: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+
+    @classmethod
+    def from_env(cls, provider: str) -> "ProviderLimits":
+        concurrency, rps, tpm = DEFAULT_LIMITS.get(provider, FALLBACK_LIMITS)
+        prefix = f"SCHEDULER_{provider.upper()}_"
+
+        def read(name: str, default, cast):
+            value = os.getenv(prefix + name)
+            if value is None:
+                return default
+            return cast(value) if value.strip().lower() not in ("", "none", "0") else None
+
+        return cls(read("CONCURRENCY", concurrency, int), read("RPS", rps, float), read("TPM", tpm, float))
+
+
+class TokenBucket:
+    """
+    Refills at `rate` units per second up to `capacity`. Callers reserve units up
+    front and sleep until the balance covers them, so concurrent callers queue in
+    arrival order without a lock.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.balance = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.balance = min(self.capacity, self.balance + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        self._refill()
+        self.balance -= amount
+        if self.balance < 0:
+            await asyncio.sleep(-self.balance / self.rate)
+
+    def credit(self, amount: float) -> None:
+        """Returns unused units (or, if negative, charges extra ones)."""
+        self._refill()
+        self.balance = min(self.capacity, self.balance + amount)
+
+
+class _ProviderQueue:
+    """
+    Concurrency slots of one provider. When all are taken, callers wait in one
+    queue per job and freed slots go to the jobs in turn, so a large job cannot
+    starve the ones that arrive after it.
+    """
+    def __init__(self, provider: str, limits: ProviderLimits):
+        self.provider = provider
+        self.limits = limits
+        self.in_flight = 0
+        self.waiting = 0
+        self._queues: Dict[str, deque] = {}
+        # Jobs with waiters, in the order they are next served
+        self._turns: deque = deque()
+        self.requests = TokenBucket(limits.requests_per_second) if limits.requests_per_second else None
+        self.tokens = TokenBucket(limits.tokens_per_minute / 60.0, limits.tokens_per_minute) if limits.tokens_per_minute else None
+
+    def _publish(self) -> None:
+        metrics.set_gauge("scheduler_in_flight", self.in_flight, provider=self.provider)
+        metrics.set_gauge("scheduler_queue_depth", self.waiting, provider=self.provider)
+
+    def _has_capacity(self) -> bool:
+        return self.limits.concurrency is None or self.in_flight < self.limits.concurrency
+
+    async def acquire(self) -> None:
+        if self._has_capacity() and not self.waiting:
+            self.in_flight += 1
+            self._publish()
+            return
+        job = current_job.get() or DEFAULT_JOB
+        waiter = asyncio.get_running_loop().create_future()
+        if job not in self._queues:
+            self._queues[job] = deque()
+            self._turns.append(job)
+        self._queues[job].append(waiter)
+        self.waiting += 1
+        self._publish()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release()
+            else:
+                self._remove(job, waiter)
+            raise
+
+    def _remove(self, job: str, waiter: asyncio.Future) -> None:
+        queue = self._queues.get(job)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self.waiting -= 1
+            if not queue:
+                del self._queues[job]
+                self._turns.remove(job)
+            self._publish()
+
+    def release(self) -> None:
+        """Hands the slot to the next job's oldest waiter, or frees it."""
+        while self._turns:
+            job = self._turns.popleft()
+            queue = self._queues[job]
+            waiter = queue.popleft()
+            self.waiting -= 1
+            if queue:
+                self._turns.append(job)
+            else:
+                del self._queues[job]
+            if not waiter.done():
+                waiter.set_result(None)
+                self._publish()
+                return
+        self.in_flight -= 1
+        self._publish()
+
+
+class SchedulerLease:
+    """Handle of an admitted call; `report_tokens` settles the token estimate once usage is known."""
+    def __init__(self, queue: _ProviderQueue, estimated_tokens: int):
+        self._queue = queue
+        self.estimated_tokens = estimated_tokens
+
+    def report_tokens(self, used: int) -> None:
+        if self._queue.tokens is not None:
+            self._queue.tokens.credit(self.estimated_tokens - used)
+            self.estimated_tokens = used
+
+
+class Scheduler:
+    """
+    Process-wide admission control for provider calls. Every call goes through
+    `slot`, which waits for a free concurrency slot of the provider (shared
+    fairly between analysis jobs, see `job_scope`), then for its requests-per-
+    second and tokens-per-minute budgets:
+
+        async with scheduler.slot("openrouter", tokens=estimate_tokens(prompt)) as lease:
+            completion = await client.chat.completions.create(...)
+            lease.report_tokens(completion.usage.total_tokens)
+    """
+    def __init__(self, limits: Optional[Dict[str, ProviderLimits]] = None):
+        self._limits = dict(limits or {})
+        self._queues: Dict[str, _ProviderQueue] = {}
+
+    def _queue(self, provider: str) -> _ProviderQueue:
+        if provider not in self._queues:
+            limits = self._limits.get(provider) or ProviderLimits.from_env(provider)
+            self._queues[provider] = _ProviderQueue(provider, limits)
+        return self._queues[provider]
+
+    @asynccontextmanager
+    async def slot(self, provider: str, tokens: int = 0) -> AsyncIterator[SchedulerLease]:
+        queue = self._queue(provider)
+        started = time.monotonic()
+        await queue.acquire()
+        try:
+            if queue.requests is not None:
+                await queue.requests.acquire()
+            if queue.tokens is not None and tokens:
+                await queue.tokens.acquire(tokens)
+            metrics.observe("scheduler_wait_seconds", time.monotonic() - started, provider=provider)
+            metrics.increment("scheduler_admitted_total", provider=provider)
+            yield SchedulerLease(queue, tokens)
+        finally:
+            queue.release()
+
+    @asynccontextmanager
+    async def slots(self, *requests: Tuple[str, int]) -> AsyncIterator[Dict[str, SchedulerLease]]:
+        """
+        Holds slots of several providers at once, e.g. an MCP server and the model
+        driving it. They are always taken in SLOT_RANKS order, then by provider name,
+        so two calls that need the same providers never each hold what the other is
+        waiting for, and the scarce slot is waited for before the plentiful one.
+
+            async with scheduler.slots(("linkedin_mcp", 0), ("anthropic", tokens)) as leases:
+                ...
+                leases["anthropic"].report_tokens(used)
+        """
+        async with AsyncExitStack() as stack:
+            leases = {}
+            for provider, tokens in sorted(requests, key=lambda r: (SLOT_RANKS.get(r[0], DEFAULT_SLOT_RANK), r[0])):
+                leases[provider] = await stack.enter_async_context(self.slot(provider, tokens))
+            yield leases
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            provider: {
+                "in_flight": queue.in_flight,
+                "waiting": queue.waiting,
+                "jobs_waiting": len(queue._queues),
+                "concurrency": queue.limits.concurrency,
+                "requests_per_second": queue.limits.requests_per_second,
+                "tokens_per_minute": queue.limits.tokens_per_minute,
+            }
+            for provider, queue in sorted(self._queues.items())
+        }
+
+
+# Shared by every agent in the process
+scheduler = Scheduler()
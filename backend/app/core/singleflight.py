@@ -0,0 +1,86 @@
+# /Complete workflow/core/singleflight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.deadline import bounded_timeout
+
+# Receives (event_name, data) for every event published by a flight.
+EventCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class _Flight:
+    """One in-flight call, the callers waiting on it and the events it has published."""
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.events: list[tuple[str, Dict[str, Any]]] = []
+        self.listeners: list[EventCallback] = []
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        self.events.append((event, data))
+        for listener in list(self.listeners):
+            listener(event, data)
+
+    def attach(self, listener: Optional[EventCallback]) -> None:
+        """Replays the events published so far to a late joiner, then follows new ones."""
+        if listener is None:
+            return
+        for event, data in self.events:
+            listener(event, data)
+        self.listeners.append(listener)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single execution. The first
+    caller starts the work; callers arriving while it is in flight wait on the same
+    task and receive the same result (or exception). Events the work publishes are
+    forwarded to every caller, including ones that join late. Each caller waits no
+    longer than its own deadline (see deadline_scope), even when the work it joined
+    was started under a later one; a caller whose deadline passes gets
+    asyncio.TimeoutError while the work goes on for the others.
+
+    The shared result object is returned to every caller, so callers that mutate it
+    must copy it first.
+    """
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[EventCallback], Awaitable[Any]],
+        on_event: Optional[EventCallback] = None,
+    ) -> Any:
+        """
+        Runs `fn(emit)` unless a call with the same key is already running, in which
+        case the running call's result is awaited instead.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.ensure_future(fn(flight.emit))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            print(f"  -> [SingleFlight] Joining in-flight work for {key[:80]}")
+
+        flight.attach(on_event)
+        flight.waiters += 1
+        try:
+            # shield() so one caller being cancelled or timing out does not cancel the shared work
+            return await asyncio.wait_for(asyncio.shield(flight.task), bounded_timeout(None))
+        finally:
+            flight.waiters -= 1
+            if on_event in flight.listeners:
+                flight.listeners.remove(on_event)
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller went away; nobody needs the result any more
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
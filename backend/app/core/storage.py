@@ -0,0 +1,217 @@
+# /Complete workflow/core/storage.py
+import argparse
+import base64
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    type TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    received_at TEXT NOT NULL,
+    PRIMARY KEY (type, id)
+);
+-- Covering indexes for the metadata listing; (type, id) break ties on received_at
+CREATE INDEX IF NOT EXISTS idx_records_received_at ON records (received_at, type, id);
+CREATE INDEX IF NOT EXISTS idx_records_type_received_at ON records (type, received_at, id);
+CREATE TABLE IF NOT EXISTS id_sequences (
+    type TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+"""
+
+# Matches the legacy data_storage file names, e.g. "prospects_12.json"
+LEGACY_FILENAME_PATTERN = re.compile(r"^(?P<type>[A-Za-z]+)_(?P<id>\d+)\.json$")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def normalize_timestamp(timestamp: str) -> str:
+    """
+    An ISO timestamp in the form received_at is stored in: naive local time, as
+    written by datetime.now(). Timezone-aware values are converted, so the text
+    comparisons of the range filters follow time order.
+    """
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat()
+
+
+def encode_cursor(received_at: str, data_type: str, data_id: int) -> str:
+    """Encodes the sort key of the last returned record as an opaque cursor."""
+    raw = json.dumps([received_at, data_type, data_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, int]:
+    try:
+        received_at, data_type, data_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(received_at), str(data_type), int(data_id)
+    except Exception:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+
+
+class DataStore:
+    """
+    SQLite (WAL mode) storage for the setupinfo and prospects records received by
+    the API. IDs are allocated per record type inside a write transaction, so
+    concurrent writers never get the same ID.
+    """
+    def __init__(self, db_path: str = "data_storage/unicorn_radar.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection per thread; sqlite3 connections must not be shared.
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None lets us control transactions explicitly
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def insert(self, data_type: str, data: Dict[str, Any], received_at: Optional[str] = None) -> Dict[str, Any]:
+        """Stores a record under the next ID for its type and returns the stored record."""
+        received_at = normalize_timestamp(received_at) if received_at else datetime.now().isoformat()
+        conn = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front, making allocate + insert atomic
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO id_sequences (type, last_id) VALUES (?, 1) "
+                "ON CONFLICT(type) DO UPDATE SET last_id = last_id + 1",
+                (data_type,)
+            )
+            (new_id,) = conn.execute("SELECT last_id FROM id_sequences WHERE type = ?", (data_type,)).fetchone()
+            conn.execute(
+                "INSERT INTO records (type, id, data, received_at) VALUES (?, ?, ?, ?)",
+                (data_type, new_id, json.dumps(data, ensure_ascii=False), received_at)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {"id": str(new_id), "type": data_type, "data": data, "received_at": received_at}
+
+    def get(self, data_type: str, data_id: str) -> Optional[Dict[str, Any]]:
+        """Looks up a record by type and ID. Returns None when it does not exist."""
+        if not str(data_id).isdigit():
+            return None
+        row = self._connection().execute(
+            "SELECT data, received_at FROM records WHERE type = ? AND id = ?",
+            (data_type, int(data_id))
+        ).fetchone()
+        if row is None:
+            return None
+        return {"id": str(data_id), "type": data_type, "data": json.loads(row[0]), "received_at": row[1]}
+
+    def list_records(
+        self,
+        data_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[list[Dict[str, Any]], Optional[str]]:
+        """
+        Lists record metadata newest first, one page at a time. Filters by type and
+        by an inclusive received_at range given as ISO timestamps, with or without
+        an offset. Pages are read by seeking in the covering
+        indexes, so the cost depends on `limit`, not on the number of stored records.
+
+        Returns the page and the cursor of the next page (None on the last page).
+        """
+        conditions, params = [], []
+        if data_type:
+            conditions.append("type = ?")
+            params.append(data_type)
+        if since:
+            conditions.append("received_at >= ?")
+            params.append(normalize_timestamp(since))
+        if until:
+            conditions.append("received_at <= ?")
+            params.append(normalize_timestamp(until))
+        if cursor:
+            conditions.append("(received_at, type, id) < (?, ?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Fetch one extra row to know whether another page follows
+        rows = self._connection().execute(
+            f"SELECT id, type, received_at FROM records {where} "
+            "ORDER BY received_at DESC, type DESC, id DESC LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last_id, last_type, last_received_at = page[-1]
+            next_cursor = encode_cursor(last_received_at, last_type, last_id)
+        return [{"id": str(row[0]), "type": row[1], "received_at": row[2]} for row in page], next_cursor
+
+    def import_json_directory(self, directory: str) -> int:
+        """
+        One-off importer for the legacy `<type>_<id>.json` files. Records keep their
+        original IDs; files already imported are skipped. Returns the number imported.
+        """
+        imported = 0
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for filename in sorted(os.listdir(directory)):
+                match = LEGACY_FILENAME_PATTERN.match(filename)
+                if not match:
+                    continue
+                try:
+                    with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                        stored_data = json.load(f)
+                except Exception as e:
+                    print(f"Skipping unreadable file {filename}: {e}")
+                    continue
+
+                data_type = stored_data.get("type", match.group("type"))
+                data_id = int(stored_data.get("id", match.group("id")))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO records (type, id, data, received_at) VALUES (?, ?, ?, ?)",
+                    (data_type, data_id, json.dumps(stored_data.get("data", {}), ensure_ascii=False),
+                     stored_data.get("received_at") or datetime.now().isoformat())
+                )
+                imported += cursor.rowcount
+                # Keep the sequence ahead of every imported ID
+                conn.execute(
+                    "INSERT INTO id_sequences (type, last_id) VALUES (?, ?) "
+                    "ON CONFLICT(type) DO UPDATE SET last_id = MAX(last_id, excluded.last_id)",
+                    (data_type, data_id)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import legacy data_storage JSON files into the SQLite data store.")
+    parser.add_argument("directory", nargs="?", default="data_storage", help="Directory containing <type>_<id>.json files")
+    parser.add_argument("--db", default=os.getenv("DATA_STORE_PATH", "data_storage/unicorn_radar.db"), help="Path of the SQLite database")
+    args = parser.parse_args()
+
+    store = DataStore(args.db)
+    count = store.import_json_directory(args.directory)
+    print(f"Imported {count} records from {args.directory} into {args.db}")
@@ -2,22 +2,65 @@
 import os
 import sys
 import asyncio
+import copy
 import json
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Awaitable, Callable, Optional
 
 # Adjust imports to use the new OpenAlex agent
 from app.agents.linkedin_agent import create_linkedin_agent, fetch_profile_via_agent
 from app.agents.openalex_agent import fetch_openalex_data # CORRECTED IMPORT
 from app.agents.github_agent import GithubAgent
+from app.core.checkpoints import current_checkpoints, source_stage
+from app.core.deadline import bounded_timeout
+from app.core.enrichment_cache import EnrichmentCache, enrichment_cache_key
+from app.core.mcp_pool import MCPServerPool
+from app.core.singleflight import SingleFlight
+
+# Default per-source timeouts in seconds. Each can be overridden through the
+# matching environment variable or the `source_timeouts` constructor argument.
+DEFAULT_SOURCE_TIMEOUTS = {
+    "linkedin_analysis": float(os.getenv("LINKEDIN_TIMEOUT_SECONDS", "90")),
+    "github_analysis": float(os.getenv("GITHUB_TIMEOUT_SECONDS", "120")),
+    "openalex_analysis": float(os.getenv("OPENALEX_TIMEOUT_SECONDS", "45")),
+}
+
+# Receives (event_name, data) for every partial result produced by the workflow.
+EventCallback = Callable[[str, Dict[str, Any]], None]
+
+# Process-wide, so founders shared between concurrent requests are analysed once.
+founder_flights = SingleFlight()
+
+def missing_sources(analysis: Dict[str, Any]) -> Dict[str, str]:
+    """Sources of a founder analysis that returned no data, with the reason for each."""
+    return {
+        key: result.get("status", "error")
+        for key, result in analysis.items()
+        if isinstance(result, dict) and "error" in result
+    }
+
+def founder_flight_key(founder_data: Dict[str, Any]) -> Optional[str]:
+    """Identifies a founder by the cache keys of every source that applies to them."""
+    keys = []
+    if founder_data.get("linkedin"):
+        keys.append(enrichment_cache_key("linkedin_analysis", founder_data))
+    if founder_data.get("github"):
+        keys.append(enrichment_cache_key("github_analysis", founder_data))
+    if founder_data.get("university"):
+        keys.append(enrichment_cache_key("openalex_analysis", founder_data))
+    return "|".join(keys) if keys else None
 
 class FounderAnalysisOrchestrator:
     """
     Orchestrates the founder data gathering workflow using specialized agents.
     """
-    def __init__(self, openrouter_api_key: str, tavily_api_key: str):
+    def __init__(self, openrouter_api_key: str, tavily_api_key: str, source_timeouts: Optional[Dict[str, float]] = None, cache: Optional[EnrichmentCache] = None, linkedin_agent=None, linkedin_pool: Optional[MCPServerPool] = None):
         print("Initializing agents...")
-        # Pydantic-AI / Gemini based agents
-        self.linkedin_agent = create_linkedin_agent()
+        # Pydantic-AI / Gemini based agents. A prebuilt agent lets callers keep its
+        # MCP server running across orchestrator runs; with a pool, each run leases
+        # a warm server from it instead.
+        self.linkedin_pool = linkedin_pool
+        self.linkedin_agent = linkedin_agent or create_linkedin_agent(pooled=linkedin_pool is not None)
         # The OpenAlex agent is now just a function call, no initialization needed.
         
         # OpenRouter based agent
@@ -25,14 +68,18 @@ class FounderAnalysisOrchestrator:
             openrouter_api_key=openrouter_api_key,
             tavily_api_key=tavily_api_key
         )
+        self.source_timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        # Optional persistent cache of per-founder source results
+        self.cache = cache
         print("All agents initialized.")
 
-    async def run(self, prospect_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def run(self, prospect_data: Dict[str, Any], on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
         """
         Asynchronously processes a list of founders to gather data from various sources.
+        If given, `on_event` is called with each source result as soon as it arrives.
         """
         founders_list = prospect_data.get("data", {}).get("teamList", [])
-        all_founder_tasks = [self._process_founder(founder) for founder in founders_list]
+        all_founder_tasks = [self._process_founder(founder, on_event) for founder in founders_list]
         processed_founders = await asyncio.gather(*all_founder_tasks)
         
         prospect_data["data"]["teamList"] = processed_founders
@@ -40,61 +87,110 @@ class FounderAnalysisOrchestrator:
         
         return prospect_data
 
-    async def _process_founder(self, founder_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _run_source(self, key: str, coro: Awaitable[Any]) -> Any:
         """
-        Gathers analysis for a single founder by running all relevant tasks concurrently.
+        Awaits a single source with its configured timeout, cut short by the
+        analysis deadline if one is set. Timeouts and errors are turned into result
+        entries so that one source never fails the others.
+        """
+        configured = self.source_timeouts.get(key)
+        timeout = bounded_timeout(configured)
+        # The deadline, not the source's own timeout, is what limits this run
+        by_deadline = timeout is not None and (configured is None or timeout < configured)
+        if by_deadline and timeout <= 0:
+            coro.close()
+            print(f"  -> SKIPPED {key}: the analysis deadline has passed")
+            return {"error": "Skipped because the analysis deadline had passed", "status": "deadline_exceeded"}
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            if by_deadline:
+                print(f"  -> CANCELLED {key} at the analysis deadline after {timeout:.1f}s")
+                return {"error": f"Cancelled at the analysis deadline after {timeout:.1f} seconds", "status": "deadline_exceeded"}
+            print(f"  -> TIMEOUT for {key} after {timeout}s")
+            return {"error": f"Timed out after {timeout} seconds", "status": "timeout"}
+        except Exception as e:
+            print(f"  -> ERROR for {key}: {e}")
+            return {"error": str(e), "status": "error"}
+
+        print(f"  -> {key} finished in {time.monotonic() - started:.1f}s")
+        # Handle both Pydantic models and regular dicts
+        if hasattr(result, 'model_dump'):
+            return result.model_dump()
+        return result
+
+    async def _fetch_source(self, founder_data: Dict[str, Any], key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Serves a source from the job's checkpoint or the enrichment cache when
+        possible, otherwise runs it.
+        """
+        checkpoints = current_checkpoints.get()
+        if checkpoints is not None:
+            saved = checkpoints.load(source_stage(founder_data.get("id"), key))
+            if saved is not None:
+                print(f"  -> [Checkpoint] Reusing {key} for {founder_data.get('name')}")
+                return saved
+        cache_key = enrichment_cache_key(key, founder_data) if self.cache else None
+        if cache_key is None:
+            return await self._run_source(key, fetch())
+        return await self.cache.get_or_fetch(key, cache_key, lambda: self._run_source(key, fetch()))
+
+    async def _run_and_emit_source(self, founder_data: Dict[str, Any], key: str, fetch: Callable[[], Awaitable[Any]], emit: EventCallback) -> Any:
+        """Runs one source and publishes its result as a `source_result` event."""
+        result = await self._fetch_source(founder_data, key, fetch)
+        emit("source_result", {"source": key, "result": result})
+        return result
+
+    async def _gather_sources(self, founder_data: Dict[str, Any], emit: EventCallback) -> Dict[str, Any]:
+        """
+        Runs every source that applies to the founder concurrently and returns the
+        results keyed by source.
         """
         founder_name = founder_data.get("name", "Unknown Founder")
-        print(f"\n--- Processing Founder: {founder_name} ---")
         tasks = {}
-        
-        # Process each task sequentially
-        results = []
-        task_keys = []
 
         if founder_data.get("linkedin"):
             print(f"  -> Processing LinkedIn: {founder_data['linkedin']}")
-            try:
-                result = await fetch_profile_via_agent(self.linkedin_agent, founder_data["linkedin"])
-                results.append(result)
-                task_keys.append("linkedin_analysis")
-            except Exception as e:
-                results.append(e)
-                task_keys.append("linkedin_analysis")
+            tasks["linkedin_analysis"] = lambda: fetch_profile_via_agent(self.linkedin_agent, founder_data["linkedin"], pool=self.linkedin_pool)
 
         if founder_data.get("github"):
             print(f"  -> Processing GitHub: {founder_data['github']}")
-            try:
-                result = await asyncio.to_thread(self.github_agent.analyze_profile, founder_data["github"])
-                results.append(result)
-                task_keys.append("github_analysis")
-            except Exception as e:
-                results.append(e)
-                task_keys.append("github_analysis")
+            tasks["github_analysis"] = lambda: self.github_agent.aanalyze_profile(founder_data["github"])
 
         if founder_data.get("university"):
             print(f"  -> Processing OpenAlex: {founder_name} at {founder_data['university']}")
-            try:
-                result = await fetch_openalex_data(founder_name, founder_data["university"])
-                results.append(result)
-                task_keys.append("openalex_analysis")
-            except Exception as e:
-                results.append(e)
-                task_keys.append("openalex_analysis")
-
-        founder_data["analysis"] = {}
-        
-        for i, result in enumerate(results):
-            key = task_keys[i]
-            if isinstance(result, Exception):
-                print(f"  -> ERROR for {key}: {result}")
-                founder_data["analysis"][key] = {"error": str(result)}
-            else:
-                # Handle both Pydantic models and regular dicts
-                if hasattr(result, 'model_dump'):
-                    founder_data["analysis"][key] = result.model_dump()
-                else:
-                    founder_data["analysis"][key] = result
+            tasks["openalex_analysis"] = lambda: fetch_openalex_data(founder_name, founder_data["university"])
+
+        results = await asyncio.gather(*(
+            self._run_and_emit_source(founder_data, key, fetch, emit) for key, fetch in tasks.items()
+        ))
+        return dict(zip(tasks.keys(), results))
+
+    async def _process_founder(self, founder_data: Dict[str, Any], on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+        """
+        Gathers analysis for a single founder by running all relevant tasks concurrently.
+        Concurrent requests for the same founder share one run of the sources.
+        """
+        founder_name = founder_data.get("name", "Unknown Founder")
+        print(f"\n--- Processing Founder: {founder_name} ---")
+
+        def relay(event: str, data: Dict[str, Any]):
+            # Shared events carry no founder identity; add this caller's own
+            if on_event:
+                on_event(event, {"founder_id": founder_data.get("id"), "founder_name": founder_name, **data})
+
+        flight_key = founder_flight_key(founder_data)
+        if flight_key:
+            analysis = await founder_flights.do(flight_key, lambda emit: self._gather_sources(founder_data, emit), on_event=relay)
+        else:
+            analysis = await self._gather_sources(founder_data, relay)
+
+        # The analysis may be shared with other callers, so never mutate it in place
+        founder_data["analysis"] = copy.deepcopy(analysis)
+        # Tells the report which sources are absent rather than empty
+        founder_data["missing_sources"] = missing_sources(analysis)
+        relay("founder_complete", {"analysis": founder_data["analysis"]})
         
         print(f"--- Finished Processing Founder: {founder_name} ---")
-        return founder_data
\ No newline at end of file
+        return founder_data
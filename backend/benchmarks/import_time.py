@@ -0,0 +1,75 @@
+# /Complete workflow/benchmarks/import_time.py
+"""
+Cold import-time report for the server and other backend modules, based on
+`python -X importtime`. Each run imports the module in a fresh interpreter.
+
+    cd backend
+    python benchmarks/import_time.py                        # fastapi_server
+    python benchmarks/import_time.py app.agents.github_agent --top 15 --runs 5
+    AGENT_STARTUP=eager python benchmarks/import_time.py    # compare startup modes
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Provider SDKs that should not be loaded just by importing the server
+PROVIDER_SDKS = ["pydantic_ai", "openai", "anthropic", "tavily", "google.generativeai", "mcp"]
+
+
+def import_time(module: str) -> Tuple[float, Dict[str, int], set]:
+    """
+    Imports `module` in a fresh interpreter. Returns the wall time in seconds, the
+    self microseconds per root package and the names of all loaded modules.
+    """
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_ROOT, capture_output=True, text=True, env=os.environ.copy(),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    packages: Dict[str, int] = {}
+    modules = set()
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.add(name)
+        # Self times add up without double counting nested imports
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    return float(result.stdout.strip().splitlines()[-1]), packages, modules
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("module", nargs="?", default="fastapi_server")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to average over")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    args = parser.parse_args(argv)
+
+    timings, packages, modules = [], {}, set()
+    for _ in range(args.runs):
+        seconds, packages, modules = import_time(args.module)
+        timings.append(seconds)
+
+    print(f"import {args.module}: median {statistics.median(timings) * 1000:.0f} ms over {args.runs} run(s)"
+          f" (min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms)")
+    print("\nSlowest packages by own import time (last run):")
+    for name, micros in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    loaded = [sdk for sdk in PROVIDER_SDKS if sdk in modules]
+    print(f"\nProvider SDKs loaded at import: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
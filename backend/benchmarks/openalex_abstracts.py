@@ -0,0 +1,127 @@
+# /Complete workflow/benchmarks/openalex_abstracts.py
+"""
+Micro-benchmark of abstract reconstruction from OpenAlex inverted indexes: the
+previous sort-based version against app.agents.openalex_abstracts.
+
+Payloads are saved OpenAlex /works responses (JSON with a `results` list), or
+are fetched when --fetch is given. Without either, indexes are built from the
+repository's own markdown so the script still runs offline.
+
+    cd backend
+    python benchmarks/openalex_abstracts.py --fetch "machine learning" --pages 3
+    python benchmarks/openalex_abstracts.py works_page1.json works_page2.json
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_ROOT)
+
+from app.agents.openalex_abstracts import reconstruct_abstract, reconstruct_abstracts  # noqa: E402
+
+
+def reconstruct_sorted(inverted_index):
+    """The implementation this module replaced."""
+    if not inverted_index:
+        return None
+    word_positions = [(pos, word) for word, positions in inverted_index.items() for pos in positions]
+    word_positions.sort()
+    return ' '.join([word for pos, word in word_positions])
+
+
+def load_payloads(paths: List[str]) -> List[Dict[str, list]]:
+    indexes = []
+    for path in paths:
+        with open(path) as f:
+            works = json.load(f).get("results", [])
+        indexes.extend(w["abstract_inverted_index"] for w in works if w.get("abstract_inverted_index"))
+    return indexes
+
+
+def fetch_payloads(search: str, pages: int) -> List[Dict[str, list]]:
+    import httpx
+
+    indexes = []
+    params = {"search": search, "per-page": 200, "select": "id,abstract_inverted_index", "filter": "has_abstract:true"}
+    if os.getenv("OPENALEX_MAILTO"):
+        params["mailto"] = os.getenv("OPENALEX_MAILTO")
+    with httpx.Client(timeout=30.0) as client:
+        for page in range(1, pages + 1):
+            response = client.get("https://api.openalex.org/works", params={**params, "page": page})
+            response.raise_for_status()
+            indexes.extend(w["abstract_inverted_index"] for w in response.json()["results"] if w.get("abstract_inverted_index"))
+    return indexes
+
+
+def offline_payloads(count: int = 400) -> List[Dict[str, list]]:
+    words = " ".join(
+        open(path, errors="ignore").read()
+        for path in glob.glob(os.path.join(BACKEND_ROOT, "..", "**", "*.md"), recursive=True)
+    ).split()
+    rng = random.Random(0)
+    indexes = []
+    for _ in range(count):
+        # Typical abstracts run to 150-300 tokens
+        length = rng.randint(150, 300)
+        start = rng.randrange(max(1, len(words) - length))
+        index: Dict[str, list] = {}
+        for pos, word in enumerate(words[start:start + length]):
+            index.setdefault(word, []).append(pos)
+        indexes.append(index)
+    return indexes
+
+
+def best_of(fn, repeat: int) -> Tuple[float, float]:
+    """Fastest and median wall time of `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), statistics.median(timings)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("payloads", nargs="*", help="saved OpenAlex /works responses")
+    parser.add_argument("--fetch", metavar="SEARCH", help="download works matching SEARCH from OpenAlex")
+    parser.add_argument("--pages", type=int, default=2, help="pages of 200 works to download")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    if args.fetch:
+        indexes, source = fetch_payloads(args.fetch, args.pages), f"OpenAlex search '{args.fetch}'"
+    elif args.payloads:
+        indexes, source = load_payloads(args.payloads), ", ".join(args.payloads)
+    else:
+        indexes, source = offline_payloads(), "offline indexes built from the repository's markdown"
+    if not indexes:
+        raise SystemExit("No abstracts in the payloads.")
+
+    expected = [reconstruct_sorted(index) for index in indexes]
+    assert [reconstruct_abstract(index) for index in indexes] == expected
+    assert reconstruct_abstracts(indexes) == expected
+
+    tokens = sum(len(p) for index in indexes for p in index.values())
+    print(f"{len(indexes)} abstracts, {tokens / len(indexes):.0f} tokens on average ({source})")
+    baseline = None
+    for name, fn in (
+        ("sorted (previous)", lambda: [reconstruct_sorted(index) for index in indexes]),
+        ("slots", lambda: [reconstruct_abstract(index) for index in indexes]),
+        ("slots, batch", lambda: reconstruct_abstracts(indexes)),
+    ):
+        fastest, median = best_of(fn, args.repeat)
+        baseline = baseline or fastest
+        per_work = fastest / len(indexes) * 1e6
+        print(f"  {name:<18} {per_work:7.1f} us/abstract  (median {median * 1000:.1f} ms)  x{baseline / fastest:.2f}")
+
+
+if __name__ == "__main__":
+    main()
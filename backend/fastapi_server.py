@@ -1,24 +1,111 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from contextlib import asynccontextmanager
+import asyncio
 import os
 from dotenv import load_dotenv
 import json
 from datetime import datetime
 
-# Import the agentic workflow
-from app.agentic_workflow_main import run_founder_analysis
-
-# Load environment variables
+# Load environment variables before the app modules read their settings
 load_dotenv()
 
+# Import the agentic workflow. The agents and provider SDKs are imported when the
+# agents are first built, not when this module is imported.
+from app.agentic_workflow_main import load_api_keys, run_founder_analysis
+from app.core.jobs import AnalysisJob, AnalysisJobManager, JobQueueFullError
+from app.core.checkpoints import CheckpointStore, checkpoint_scope, get_checkpoint_store
+from app.core.metrics import metrics
+from app.core.resilience import breaker_states
+from app.core.scheduler import job_scope, scheduler
+from app.core.storage import DataStore, InvalidCursorError
+
+if TYPE_CHECKING:
+    from app.core.agent_registry import AgentRegistry
+
+# "eager" builds the shared agents at startup; "lazy" on the first analysis job
+AGENT_STARTUP = os.getenv("AGENT_STARTUP", "eager").lower()
+
+# Interrupted jobs older than this are not resumed; finished ones are kept this long
+CHECKPOINT_RESUME_MAX_AGE_SECONDS = float(os.getenv("CHECKPOINT_RESUME_MAX_AGE_SECONDS", str(24 * 60 * 60)))
+CHECKPOINT_RETENTION_SECONDS = float(os.getenv("CHECKPOINT_RETENTION_SECONDS", str(7 * 24 * 60 * 60)))
+
+async def start_agents() -> Optional["AgentRegistry"]:
+    """Builds the agents and MCP servers once so every analysis can reuse them"""
+    from app.core.agent_registry import AgentRegistry
+
+    try:
+        openrouter_api_key, tavily_api_key = load_api_keys()
+        agents = AgentRegistry(
+            openrouter_api_key=openrouter_api_key,
+            tavily_api_key=tavily_api_key,
+            health_check_interval=float(os.getenv("AGENT_HEALTH_CHECK_INTERVAL", "30"))
+        )
+        await agents.start()
+        return agents
+    except Exception as e:
+        print(f"Warning: Could not start shared agents, they will be built per request: {e}")
+        return None
+
+async def get_agents() -> Optional["AgentRegistry"]:
+    """Returns the shared agents, starting them on first use in lazy startup mode"""
+    async with app.state.agents_lock:
+        if not app.state.agents_started:
+            app.state.agents_started = True
+            app.state.agents = await start_agents()
+    return app.state.agents
+
+def resume_interrupted_jobs(job_manager: AnalysisJobManager, checkpoints: Optional[CheckpointStore]) -> None:
+    """Queues again, under their old ids, the analysis jobs a restart interrupted"""
+    if checkpoints is None:
+        return
+    checkpoints.prune(CHECKPOINT_RETENTION_SECONDS)
+    for job_id, saved in checkpoints.unfinished_jobs(max_age_seconds=CHECKPOINT_RESUME_MAX_AGE_SECONDS):
+        try:
+            request = ProspectsRequest.model_validate(saved["request"])
+            job_manager.submit(saved["payload"], context=request, job_id=job_id)
+        except JobQueueFullError:
+            print(f"Warning: Job queue is full, analysis job {job_id} was not resumed")
+            break
+        except Exception as e:
+            print(f"Warning: Could not resume analysis job {job_id}: {e}")
+            checkpoints.finish_job(job_id, "failed")
+            continue
+        print(f"Resuming interrupted analysis job {job_id} ({len(checkpoints.stages(job_id))} stages checkpointed)")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Opens the data store, starts the shared agents and the analysis worker pool on startup"""
+    app.state.data_store = DataStore(os.getenv("DATA_STORE_PATH", "data_storage/unicorn_radar.db"))
+    app.state.checkpoints = get_checkpoint_store()
+
+    app.state.agents = None
+    app.state.agents_started = False
+    app.state.agents_lock = asyncio.Lock()
+    if AGENT_STARTUP != "lazy":
+        await get_agents()
+
+    app.state.job_manager = AnalysisJobManager(
+        runner=run_analysis_job,
+        max_workers=int(os.getenv("ANALYSIS_WORKERS", "2")),
+        max_queue_size=int(os.getenv("ANALYSIS_QUEUE_SIZE", "100"))
+    )
+    app.state.job_manager.start()
+    resume_interrupted_jobs(app.state.job_manager, app.state.checkpoints)
+    yield
+    await app.state.job_manager.stop()
+    if app.state.agents:
+        await app.state.agents.stop()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Antropic API Server",
     description="A FastAPI server for the Antropic project",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -35,6 +122,7 @@ class HealthResponse(BaseModel):
     status: str
     timestamp: str
     message: str
+    agents: Dict[str, Any] = None
 
 class AgentRequest(BaseModel):
     agent_id: str
@@ -110,6 +198,8 @@ class AnalysisResponse(BaseModel):
     researchDepth: ResearchDepth
     founderHighlights: list[FounderHighlight]
     interviewHighlights: list[InterviewHighlight]
+    # Founder sources that returned no data (timeout, deadline or error)
+    missingSources: list[Dict[str, Any]] = []
 
 # Root endpoint
 @app.get("/")
@@ -124,13 +214,32 @@ async def root():
 # Health check endpoint
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint, including the state of the shared agents"""
+    if app.state.agents:
+        agents = app.state.agents.status
+    elif AGENT_STARTUP == "lazy" and not app.state.agents_started:
+        agents = {"linkedin_mcp": "not started (lazy startup)"}
+    else:
+        agents = {"linkedin_mcp": "not started"}
+    healthy = agents.get("linkedin_mcp") == "running" or not app.state.agents_started
     return HealthResponse(
-        status="healthy",
+        status="healthy" if healthy else "degraded",
         timestamp=datetime.now().isoformat(),
-        message="Server is running properly"
+        message="Server is running properly" if healthy else "Shared agents are not running",
+        agents=agents
     )
 
+# Metrics endpoint
+@app.get("/api/metrics")
+async def get_metrics():
+    """Get provider call counters, circuit breaker states and scheduler queues"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "circuit_breakers": breaker_states(),
+        "scheduler": scheduler.stats(),
+        **metrics.snapshot()
+    }
+
 # API info endpoint
 @app.get("/api/info")
 async def api_info():
@@ -142,14 +251,18 @@ async def api_info():
             {"path": "/", "method": "GET", "description": "Root endpoint"},
             {"path": "/health", "method": "GET", "description": "Health check"},
             {"path": "/api/info", "method": "GET", "description": "API information"},
+            {"path": "/api/metrics", "method": "GET", "description": "Provider call metrics and circuit breaker states"},
             {"path": "/api/agent/{agent_id}", "method": "GET", "description": "Get agent information"},
             {"path": "/api/calls", "method": "POST", "description": "Get last call for agent"},
             {"path": "/api/setupinfo", "method": "POST", "description": "Receive setupinfo JSON data"},
             {"path": "/api/prospects", "method": "POST", "description": "Receive prospects JSON data"},
             {"path": "/api/setupinfo/{data_id}", "method": "GET", "description": "Get setupinfo by ID"},
             {"path": "/api/prospects/{data_id}", "method": "GET", "description": "Get prospects by ID"},
-            {"path": "/api/data", "method": "GET", "description": "List all stored data"},
-            {"path": "/api/analyse", "method": "POST", "description": "Run founder analysis workflow"}
+            {"path": "/api/data", "method": "GET", "description": "List stored data (cursor-paginated)"},
+            {"path": "/api/analyse", "method": "POST", "description": "Submit a founder analysis job"},
+            {"path": "/api/analyse/{job_id}", "method": "GET", "description": "Get analysis job status and progress"},
+            {"path": "/api/analyse/{job_id}/events", "method": "GET", "description": "Stream analysis job events (SSE)"},
+            {"path": "/api/analyse/{job_id}/result", "method": "GET", "description": "Get analysis job result"}
         ]
     }
 
@@ -197,52 +310,17 @@ async def get_agent_calls(request: AgentRequest):
             message="Failed to retrieve agent calls"
         )
 
-# Helper function to get next data number
-def get_next_data_number(data_type: str):
-    """Get the next incremental data number for setupinfo or prospects"""
-    os.makedirs("data_storage", exist_ok=True)
-    
-    # Find existing files of this type
-    existing_files = []
-    for filename in os.listdir("data_storage"):
-        if filename.startswith(f"{data_type}_") and filename.endswith(".json"):
-            try:
-                number = int(filename.replace(f"{data_type}_", "").replace(".json", ""))
-                existing_files.append(number)
-            except ValueError:
-                continue
-    
-    # Return next number (starting from 1)
-    return max(existing_files) + 1 if existing_files else 1
-
 # SetupInfo endpoint
 @app.post("/api/setupinfo", response_model=DataResponse)
 async def receive_setupinfo(setupinfo: SetupInfo):
     """Receive and store setupinfo JSON data"""
     try:
-        # Generate incremental ID
-        data_number = get_next_data_number("setupinfo")
-        data_id = str(data_number)
-        
-        # Prepare data for storage
-        storage_data = {
-            "id": data_id,
-            "type": "setupinfo",
-            "data": setupinfo.data,
-            "received_at": datetime.now().isoformat()
-        }
-        
-        # Save to incremental JSON file
-        try:
-            filename = f"data_storage/setupinfo_{data_id}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(storage_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Warning: Could not save setupinfo to file: {e}")
+        # Store under the next incremental ID
+        stored_data = app.state.data_store.insert("setupinfo", setupinfo.data)
         
         return DataResponse(
             success=True,
-            id=data_id,
+            id=stored_data["id"],
             message="SetupInfo data received successfully",
             data=setupinfo.data
         )
@@ -255,14 +333,11 @@ async def receive_setupinfo(setupinfo: SetupInfo):
 async def get_setupinfo(data_id: str):
     """Retrieve setupinfo data by ID"""
     try:
-        filename = f"data_storage/setupinfo_{data_id}.json"
+        stored_data = app.state.data_store.get("setupinfo", data_id)
         
-        if not os.path.exists(filename):
+        if stored_data is None:
             raise HTTPException(status_code=404, detail="SetupInfo data not found")
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            stored_data = json.load(f)
-        
         return DataResponse(
             success=True,
             id=data_id,
@@ -280,14 +355,11 @@ async def get_setupinfo(data_id: str):
 async def get_prospects(data_id: str):
     """Retrieve prospects data by ID"""
     try:
-        filename = f"data_storage/prospects_{data_id}.json"
+        stored_data = app.state.data_store.get("prospects", data_id)
         
-        if not os.path.exists(filename):
+        if stored_data is None:
             raise HTTPException(status_code=404, detail="Prospects data not found")
         
-        with open(filename, 'r', encoding='utf-8') as f:
-            stored_data = json.load(f)
-        
         return DataResponse(
             success=True,
             id=data_id,
@@ -302,36 +374,35 @@ async def get_prospects(data_id: str):
 
 # List all stored data
 @app.get("/api/data")
-async def list_all_data():
-    """List all stored setupinfo and prospects data"""
+async def list_all_data(
+    type: Optional[str] = Query(default=None, description="Only list records of this type"),
+    since: Optional[datetime] = Query(default=None, description="Only records received at or after this time"),
+    until: Optional[datetime] = Query(default=None, description="Only records received at or before this time"),
+    cursor: Optional[str] = Query(default=None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(default=50, ge=1, le=500, description="Maximum number of records to return")
+):
+    """List stored setupinfo and prospects data, newest first, one page at a time"""
     try:
-        data_dir = "data_storage"
-        if not os.path.exists(data_dir):
-            return {"success": True, "data": [], "message": "No data found"}
-        
-        all_data = []
-        for filename in os.listdir(data_dir):
-            if filename.endswith('.json'):
-                try:
-                    with open(os.path.join(data_dir, filename), 'r', encoding='utf-8') as f:
-                        stored_data = json.load(f)
-                        all_data.append({
-                            "id": stored_data["id"],
-                            "type": stored_data["type"],
-                            "received_at": stored_data["received_at"],
-                            "filename": filename
-                        })
-                except Exception as e:
-                    print(f"Error reading data {filename}: {e}")
-                    continue
+        page, next_cursor = app.state.data_store.list_records(
+            data_type=type,
+            since=since.isoformat() if since else None,
+            until=until.isoformat() if until else None,
+            cursor=cursor,
+            limit=limit
+        )
+        if not page:
+            return {"success": True, "data": [], "next_cursor": None, "message": "No data found"}
         
         return {
             "success": True,
-            "data": sorted(all_data, key=lambda x: x["received_at"], reverse=True),
-            "count": len(all_data),
-            "message": f"Found {len(all_data)} data entries"
+            "data": page,
+            "count": len(page),
+            "next_cursor": next_cursor,
+            "message": f"Found {len(page)} data entries"
         }
     
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list data: {str(e)}")
 
@@ -363,29 +434,12 @@ async def custom_404_handler(request: Request, exc):
 async def receive_prospects(prospects: Prospects):
     """Receive and store prospects JSON data"""
     try:
-        # Generate incremental ID
-        data_number = get_next_data_number("prospects")
-        data_id = str(data_number)
-        
-        # Prepare data for storage
-        storage_data = {
-            "id": data_id,
-            "type": "prospects",
-            "data": prospects.data,
-            "received_at": datetime.now().isoformat()
-        }
-        
-        # Save to incremental JSON file
-        try:
-            filename = f"data_storage/prospects_{data_id}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(storage_data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Warning: Could not save prospects to file: {e}")
+        # Store under the next incremental ID
+        stored_data = app.state.data_store.insert("prospects", prospects.data)
         
         return DataResponse(
             success=True,
-            id=data_id,
+            id=stored_data["id"],
             message="Prospects data received successfully",
             data=prospects.data
         )
@@ -394,143 +448,230 @@ async def receive_prospects(prospects: Prospects):
         raise HTTPException(status_code=500, detail=f"Failed to process prospects: {str(e)}")
 
 # MAIN FASTAPI FLOW - INTEGRATED WITH AGENTIC WORKFLOW
-@app.post("/api/analyse")
-async def analyze_prospects(request: ProspectsRequest):
-    """
-    Main endpoint that triggers the agentic workflow with real POST request data
-    """
-    try:
-        print("=" * 50)
-        print("RECEIVED ANALYSIS REQUEST")
-        print("=" * 50)
-        
-        # Convert the POST request data to the format expected by the workflow
-        workflow_data = {
-            "id": "frontend_request",
-            "type": "prospects", 
-            "data": {
-                "startupInfo": {
-                    "name": request.data.startupInfo.name,
-                    "product": request.data.startupInfo.product,
-                    "founded": request.data.startupInfo.founded,
-                    "mission": request.data.startupInfo.mission,
-                    "businessModel": request.data.startupInfo.businessModel,
-                    "pitchDeck": request.data.startupInfo.pitchDeck,
-                    "isManual": request.data.startupInfo.isManual
-                },
-                "teamList": [
-                    {
-                        "id": prospect.id,
-                        "name": prospect.name,
-                        "email": prospect.email,
-                        "github": prospect.github or "",
-                        "linkedin": prospect.linkedin,
-                        "university": prospect.university or "",
-                        "notes": prospect.notes or ""
-                    }
-                    for prospect in request.data.teamList
-                ]
+def build_workflow_data(request: ProspectsRequest) -> Dict[str, Any]:
+    """Convert the POST request data to the format expected by the workflow"""
+    return {
+        "id": "frontend_request",
+        "type": "prospects", 
+        "data": {
+            "startupInfo": {
+                "name": request.data.startupInfo.name,
+                "product": request.data.startupInfo.product,
+                "founded": request.data.startupInfo.founded,
+                "mission": request.data.startupInfo.mission,
+                "businessModel": request.data.startupInfo.businessModel,
+                "pitchDeck": request.data.startupInfo.pitchDeck,
+                "isManual": request.data.startupInfo.isManual
             },
-            "received_at": datetime.now().isoformat()
-        }
-        
-        # Log the data being processed
-        print(f"Processing startup: {request.data.startupInfo.name}")
-        print(f"Team size: {len(request.data.teamList)}")
-        for i, prospect in enumerate(request.data.teamList, 1):
-            print(f"  {i}. {prospect.name} - {prospect.linkedin}")
-        
-        # Run the agentic workflow with the POST request data
-        print("\n--- STARTING AGENTIC WORKFLOW ---")
-        analysis_results = await run_founder_analysis(
-            prospect_data=workflow_data,
-            interview_file="output_samples/sample_interview_analysis_input.json"
+            "teamList": [
+                {
+                    "id": prospect.id,
+                    "name": prospect.name,
+                    "email": prospect.email,
+                    "github": prospect.github or "",
+                    "linkedin": prospect.linkedin,
+                    "university": prospect.university or "",
+                    "notes": prospect.notes or ""
+                }
+                for prospect in request.data.teamList
+            ]
+        },
+        "received_at": datetime.now().isoformat()
+    }
+
+def build_analysis_response(request: ProspectsRequest, analysis_results: Dict[str, Any]) -> AnalysisResponse:
+    """Convert the workflow results to the expected API response format"""
+    # Extract the analysis report from the results
+    if "analysis_report" in analysis_results and "error" not in analysis_results["analysis_report"]:
+        return AnalysisResponse(
+            overallScore=analysis_results["analysis_report"].get("overallScore", 8.5),
+            disruptionProbability=analysis_results["analysis_report"].get("disruptionProbability", 7.2),
+            teamSynergy=analysis_results["analysis_report"].get("teamSynergy", 9.1),
+            complementaryScore=analysis_results["analysis_report"].get("complementaryScore", 8.8),
+            researchDepth=ResearchDepth(
+                hIndex=analysis_results["analysis_report"].get("researchDepth", {}).get("hIndex", 15)
+            ),
+            founderHighlights=[
+                FounderHighlight(
+                    name=highlight.get("name", ""),
+                    highlights=highlight.get("highlights", []),
+                    comments=highlight.get("comments", "")
+                )
+                for highlight in analysis_results["analysis_report"].get("founderHighlights", [])
+            ],
+            interviewHighlights=[
+                InterviewHighlight(
+                    question=highlight.get("question", ""),
+                    summary=highlight.get("summary", ""),
+                    keyInsights=highlight.get("keyInsights", []),
+                    score=highlight.get("score", 0.0),
+                    person=highlight.get("person", "")
+                )
+                for highlight in analysis_results["analysis_report"].get("interviewHighlights", [])
+            ],
+            missingSources=analysis_results.get("missing_sources", [])
         )
-        
-        print("--- WORKFLOW COMPLETED ---")
-        
-        # Extract the analysis report from the results
-        if "analysis_report" in analysis_results and "error" not in analysis_results["analysis_report"]:
-            # Convert the workflow results to the expected API response format
-            response = AnalysisResponse(
-                overallScore=analysis_results["analysis_report"].get("overallScore", 8.5),
-                disruptionProbability=analysis_results["analysis_report"].get("disruptionProbability", 7.2),
-                teamSynergy=analysis_results["analysis_report"].get("teamSynergy", 9.1),
-                complementaryScore=analysis_results["analysis_report"].get("complementaryScore", 8.8),
-                researchDepth=ResearchDepth(
-                    hIndex=analysis_results["analysis_report"].get("researchDepth", {}).get("hIndex", 15)
-                ),
-                founderHighlights=[
-                    FounderHighlight(
-                        name=highlight.get("name", ""),
-                        highlights=highlight.get("highlights", []),
-                        comments=highlight.get("comments", "")
-                    )
-                    for highlight in analysis_results["analysis_report"].get("founderHighlights", [])
-                ],
-                interviewHighlights=[
-                    InterviewHighlight(
-                        question=highlight.get("question", ""),
-                        summary=highlight.get("summary", ""),
-                        keyInsights=highlight.get("keyInsights", []),
-                        score=highlight.get("score", 0.0),
-                        person=highlight.get("person", "")
-                    )
-                    for highlight in analysis_results["analysis_report"].get("interviewHighlights", [])
-                ]
+
+    # Fallback response if workflow fails
+    print("WARNING: Analysis report generation failed, using fallback response")
+    return AnalysisResponse(
+        overallScore=8.0,
+        disruptionProbability=7.0,
+        teamSynergy=8.5,
+        complementaryScore=8.0,
+        researchDepth=ResearchDepth(hIndex=10),
+        founderHighlights=[
+            FounderHighlight(
+                name=prospect.name,
+                highlights=[f"Analysis in progress for {prospect.name}"],
+                comments="Workflow analysis pending"
             )
-        else:
-            # Fallback response if workflow fails
-            print("WARNING: Analysis report generation failed, using fallback response")
-            response = AnalysisResponse(
-                overallScore=8.0,
-                disruptionProbability=7.0,
-                teamSynergy=8.5,
-                complementaryScore=8.0,
-                researchDepth=ResearchDepth(hIndex=10),
-                founderHighlights=[
-                    FounderHighlight(
-                        name=prospect.name,
-                        highlights=[f"Analysis in progress for {prospect.name}"],
-                        comments="Workflow analysis pending"
-                    )
-                    for prospect in request.data.teamList
-                ],
-                interviewHighlights=[
-                    InterviewHighlight(
-                        question="Sample analysis question",
-                        summary="Analysis completed with limited data",
-                        keyInsights=["Workflow processing completed", "Further analysis recommended"],
-                        score=7.5,
-                        person=prospect.name
-                    )
-                    for prospect in request.data.teamList[:2]  # Limit to first 2
-                ]
+            for prospect in request.data.teamList
+        ],
+        interviewHighlights=[
+            InterviewHighlight(
+                question="Sample analysis question",
+                summary="Analysis completed with limited data",
+                keyInsights=["Workflow processing completed", "Further analysis recommended"],
+                score=7.5,
+                person=prospect.name
             )
-        
-        # Save the complete results for debugging
-        try:
-            os.makedirs("output_samples", exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            results_file = f"output_samples/api_analysis_results_{timestamp}.json"
-            with open(results_file, "w") as f:
-                json.dump(analysis_results, f, indent=2)
-            print(f"Complete analysis results saved to: {results_file}")
-        except Exception as e:
-            print(f"Warning: Could not save results to file: {e}")
-        
-        print("=" * 50)
-        print("ANALYSIS COMPLETED SUCCESSFULLY")
-        print("=" * 50)
-        
-        return response
-        
+            for prospect in request.data.teamList[:2]  # Limit to first 2
+        ],
+        missingSources=analysis_results.get("missing_sources", [])
+    )
+
+def save_analysis_results(analysis_results: Dict[str, Any]):
+    """Save the complete results for debugging"""
+    try:
+        os.makedirs("output_samples", exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_file = f"output_samples/api_analysis_results_{timestamp}.json"
+        with open(results_file, "w") as f:
+            json.dump(analysis_results, f, indent=2)
+        print(f"Complete analysis results saved to: {results_file}")
     except Exception as e:
-        print(f"ERROR in analysis workflow: {e}")
+        print(f"Warning: Could not save results to file: {e}")
+
+async def run_analysis_job(job: AnalysisJob) -> Dict[str, Any]:
+    """
+    Runs the agentic workflow for a queued job and returns the API response payload
+    """
+    request: ProspectsRequest = job.context
+    print("=" * 50)
+    print(f"STARTING ANALYSIS JOB {job.id}")
+    print("=" * 50)
+
+    # Log the data being processed
+    print(f"Processing startup: {request.data.startupInfo.name}")
+    print(f"Team size: {len(request.data.teamList)}")
+    for i, prospect in enumerate(request.data.teamList, 1):
+        print(f"  {i}. {prospect.name} - {prospect.linkedin}")
+
+    # Run the agentic workflow with the POST request data
+    print("\n--- STARTING AGENTIC WORKFLOW ---")
+    agents = await get_agents()
+    checkpoints = app.state.checkpoints
+    # Provider calls made for this job queue fairly against other jobs' calls, and
+    # stages a previous run of the job finished are not run again
+    try:
+        with job_scope(job.id), checkpoint_scope(checkpoints, job.id):
+            analysis_results = await run_founder_analysis(
+                prospect_data=job.payload,
+                interview_file="output_samples/sample_interview_analysis_input.json",
+                on_event=job.record_event,
+                orchestrator=agents.orchestrator if agents else None,
+                report_agent=agents.report_agent if agents else None
+            )
+    except Exception:
+        if checkpoints is not None:
+            checkpoints.finish_job(job.id, "failed")
+        raise
+    if checkpoints is not None:
+        checkpoints.finish_job(job.id, "completed")
+    print("--- WORKFLOW COMPLETED ---")
+
+    response = build_analysis_response(request, analysis_results)
+    save_analysis_results(analysis_results)
+
+    print("=" * 50)
+    print(f"ANALYSIS JOB {job.id} COMPLETED SUCCESSFULLY")
+    print("=" * 50)
+    return response.model_dump()
+
+def get_job_or_404(job_id: str) -> AnalysisJob:
+    job = app.state.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return job
+
+@app.post("/api/analyse", status_code=202)
+async def analyze_prospects(request: ProspectsRequest):
+    """
+    Submits an agentic workflow job for the POST request data and returns its job id
+    """
+    try:
+        job = app.state.job_manager.submit(build_workflow_data(request), context=request)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if app.state.checkpoints is not None:
+        # Enough to run the job again if the server restarts before it finishes
+        app.state.checkpoints.start_job(job.id, {"request": request.model_dump(), "payload": job.payload})
+
+    print(f"Queued analysis job {job.id} for startup: {request.data.startupInfo.name}")
+    return {
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/analyse/{job.id}",
+        "events_url": f"/api/analyse/{job.id}/events",
+        "result_url": f"/api/analyse/{job.id}/result"
+    }
+
+@app.get("/api/analyse/{job_id}")
+async def get_analysis_status(job_id: str):
+    """Get the status and per-stage progress of an analysis job"""
+    return get_job_or_404(job_id).to_dict()
+
+@app.get("/api/analyse/{job_id}/events")
+async def stream_analysis_events(job_id: str, last_event_id: Optional[str] = Header(default=None)):
+    """
+    Stream the partial results of an analysis job as server-sent events: each source
+    result per founder, then the interview merge, the report and the final result.
+    Reconnecting clients resume after the Last-Event-ID header they send.
+    """
+    job = get_job_or_404(job_id)
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+
+    async def event_source():
+        # Tell the browser how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        async for event in job.stream_events(after=after):
+            if event is None:
+                # SSE comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            payload = json.dumps(event["data"], default=str)
+            yield f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/analyse/{job_id}/result", response_model=AnalysisResponse)
+async def get_analysis_result(job_id: str):
+    """Get the result of a completed analysis job"""
+    job = get_job_or_404(job_id)
+    if job.status == "failed":
         raise HTTPException(
             status_code=500, 
-            detail=f"Failed to process analysis request: {str(e)}"
+            detail=f"Failed to process analysis request: {job.error}"
         )
+    if not job.done:
+        return JSONResponse(status_code=202, content=job.to_dict())
+    return job.result
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Backend modules import each other as `app.*`, so put backend/ on the path.
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(BACKEND_ROOT)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from app.agentic_workflow_main import run_founder_analysis
+from app.core.checkpoints import CheckpointStore, checkpoint_scope, source_stage
+from app.core.workflow import FounderAnalysisOrchestrator
+
+
+def payload():
+    return {"data": {"teamList": [{"id": "1", "name": "Jane Doe", "github": "https://github.com/jane"}]}}
+
+
+class FakeOrchestrator:
+    """Fetches the GitHub source through the real checkpoint-aware path."""
+    def __init__(self):
+        self.fetches = 0
+        self.orchestrator = FounderAnalysisOrchestrator.__new__(FounderAnalysisOrchestrator)
+        self.orchestrator.source_timeouts = {}
+        self.orchestrator.cache = None
+
+    async def fetch(self):
+        self.fetches += 1
+        return {"repos": 3}
+
+    async def run(self, prospect_data, on_event=None):
+        for founder in prospect_data["data"]["teamList"]:
+            result = await self.orchestrator._fetch_source(founder, "github_analysis", self.fetch)
+            on_event("source_result", {"founder_id": founder["id"], "source": "github_analysis", "result": result})
+            founder["analysis"] = {"github_analysis": result}
+        return prospect_data
+
+
+def test_store_tracks_unfinished_jobs(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.start_job("a", {"payload": 1})
+    store.start_job("b", {"payload": 2})
+    store.save("a", "report", {"score": 1})
+    store.finish_job("b")
+
+    assert store.unfinished_jobs() == [("a", {"payload": 1})]
+    assert store.load("a", "report") == {"score": 1}
+    assert store.load("a", "interview_merge") is None
+    # Restarting a job keeps what it already finished
+    store.start_job("a", {"payload": 1})
+    assert store.stages("a") == ["report"]
+
+    assert store.prune(older_than_seconds=3600) == 0
+    time.sleep(0.01)
+    assert store.prune(older_than_seconds=0) == 2
+    assert store.unfinished_jobs() == []
+    assert store.load("a", "report") is None
+
+
+def test_resumed_job_skips_finished_stages(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    interview_file = tmp_path / "interviews.json"
+    interview_file.write_text('[{"id": "1", "summary": "Strong"}]')
+    orchestrator = FakeOrchestrator()
+
+    # The first run got as far as the interview merge before the restart
+    store.save("job", source_stage("1", "github_analysis"), {"repos": 3})
+    store.save("job", "interview_merge", [{"founder_id": "1", "interview_analysis": {"summary": "Saved"}}])
+    store.save("job", "report", {"startup_name": "Acme"})
+
+    async def scenario():
+        with checkpoint_scope(store, "job"):
+            return await run_founder_analysis(payload(), str(interview_file), orchestrator=orchestrator, deadline_seconds=0)
+
+    output = asyncio.run(scenario())
+    assert orchestrator.fetches == 0
+    assert output["data"]["teamList"][0]["interview_analysis"] == {"summary": "Saved"}
+    assert output["analysis_report"] == {"startup_name": "Acme"}
+
+
+def test_stage_results_are_saved_as_they_arrive(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    orchestrator = FakeOrchestrator()
+    # A saved report keeps the test away from the real report agent
+    store.save("job", "report", {"startup_name": "Acme"})
+    events = []
+
+    async def scenario():
+        with checkpoint_scope(store, "job"):
+            await run_founder_analysis(
+                payload(), str(tmp_path / "missing.json"), on_event=lambda event, data: events.append(event),
+                orchestrator=orchestrator, deadline_seconds=0
+            )
+
+    asyncio.run(scenario())
+    assert orchestrator.fetches == 1
+    assert store.load("job", source_stage("1", "github_analysis")) == {"repos": 3}
+    assert store.load("job", "interview_merge") == [{"founder_id": "1", "interview_analysis": None}]
+    # Callers still receive every event
+    assert "source_result" in events and "report" in events
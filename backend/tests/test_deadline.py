@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+
+from app import agentic_workflow_main
+from app.agents import analysis_report_agent
+from app.core import resilience
+from app.core.deadline import bounded_timeout, deadline_scope, remaining
+from app.core.metrics import metrics
+from app.core.resilience import RetryPolicy, call_with_retries
+from app.core.workflow import FounderAnalysisOrchestrator, missing_sources
+
+
+def orchestrator(**timeouts):
+    # Skips __init__, which builds the real agents
+    instance = FounderAnalysisOrchestrator.__new__(FounderAnalysisOrchestrator)
+    instance.source_timeouts = timeouts
+    instance.cache = None
+    return instance
+
+
+def test_nested_scopes_never_extend_the_deadline():
+    assert remaining() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert 9 < remaining() <= 10
+        with deadline_scope(reserve=4):
+            assert 5 < remaining() <= 6
+            assert bounded_timeout(30) <= 6
+            assert bounded_timeout(1) == 1
+    assert remaining() is None
+    assert bounded_timeout(30) == 30
+
+
+def test_source_is_cancelled_at_the_deadline():
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def scenario():
+        with deadline_scope(0.05):
+            return await orchestrator(github_analysis=120)._run_source("github_analysis", slow())
+
+    result = asyncio.run(scenario())
+    assert result["status"] == "deadline_exceeded"
+
+
+def test_source_is_skipped_once_the_deadline_has_passed():
+    async def never_awaited():
+        raise AssertionError("should not run")
+
+    async def scenario():
+        with deadline_scope(0.01, reserve=1):
+            return await orchestrator(openalex_analysis=45)._run_source("openalex_analysis", never_awaited())
+
+    assert asyncio.run(scenario())["status"] == "deadline_exceeded"
+
+
+def test_own_timeout_still_reported_as_timeout():
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def scenario():
+        with deadline_scope(60):
+            return await orchestrator(linkedin_analysis=0.02)._run_source("linkedin_analysis", slow())
+
+    assert asyncio.run(scenario())["status"] == "timeout"
+
+
+def test_missing_sources_lists_error_entries():
+    analysis = {
+        "linkedin_analysis": {"name": "Jane"},
+        "github_analysis": {"error": "Cancelled", "status": "deadline_exceeded"},
+        "openalex_analysis": {"error": "No author found"},
+    }
+    assert missing_sources(analysis) == {"github_analysis": "deadline_exceeded", "openalex_analysis": "error"}
+
+
+def test_report_prompt_lists_missing_sources_once(monkeypatch):
+    prompts = []
+
+    async def fake_run_analysis_agent(agent, teams_data, missing_sources=None):
+        prompts.append(teams_data + analysis_report_agent.missing_sources_note(missing_sources or []))
+        return type("Report", (), {"dict": lambda self: {"startup_name": "Acme"}})()
+
+    monkeypatch.setattr(analysis_report_agent, "run_analysis_agent", fake_run_analysis_agent)
+    missing = {"github_analysis": "deadline_exceeded"}
+    final_output = {
+        "data": {"teamList": [{"id": "1", "name": "Jane", "missing_sources": missing}]},
+        "missing_sources": [{"founder_id": "1", "founder_name": "Jane", "source": "github_analysis", "reason": "deadline_exceeded"}],
+    }
+
+    report = asyncio.run(agentic_workflow_main._generate_report(final_output, report_agent=object()))
+    assert report == {"startup_name": "Acme"}
+    assert prompts[0].count("deadline_exceeded") == 1
+    assert json.loads(prompts[0].split("\n\n")[0]) == [{"id": "1", "name": "Jane"}]
+    # The founder data returned to the caller keeps its own list
+    assert final_output["data"]["teamList"][0]["missing_sources"] == missing
+
+
+def test_no_retry_that_would_start_after_the_deadline(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    metrics.reset()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise TimeoutError("slow provider")
+
+    async def scenario():
+        with deadline_scope(0.5):
+            await call_with_retries("p", failing, RetryPolicy(max_attempts=5, base_delay=10, max_delay=10))
+
+    # Always back off for the full 10 seconds, well past the deadline
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+    with pytest.raises(TimeoutError):
+        asyncio.run(scenario())
+    assert len(calls) == 1
+    assert metrics.get("llm_retries_total", provider="p") == 0
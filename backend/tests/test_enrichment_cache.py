@@ -0,0 +1,69 @@
+import asyncio
+
+from app.core.enrichment_cache import EnrichmentCache, canonicalize_url, enrichment_cache_key
+
+
+def test_canonicalize_url_ignores_scheme_host_prefix_case_and_query():
+    assert canonicalize_url("https://www.LinkedIn.com/in/Yann-LeCun/?trk=abc") == "linkedin.com/in/yann-lecun"
+    assert canonicalize_url("linkedin.com/in/yann-lecun") == "linkedin.com/in/yann-lecun"
+    assert canonicalize_url("http://github.com/Karpathy/") == "github.com/karpathy"
+
+
+def test_openalex_key_uses_normalised_name_and_affiliation():
+    a = enrichment_cache_key("openalex_analysis", {"name": "José  García", "university": "Universidad de Málaga"})
+    b = enrichment_cache_key("openalex_analysis", {"name": "jose garcia", "university": "universidad de malaga"})
+    assert a == b
+    assert enrichment_cache_key("github_analysis", {"name": "x", "github": ""}) is None
+
+
+def test_stale_hit_is_served_and_refreshed_in_background(tmp_path):
+    """Fresh hits skip the fetch; stale hits return the old value and revalidate."""
+    calls = []
+
+    async def scenario():
+        cache = EnrichmentCache(str(tmp_path / "cache.db"), ttls={"github_analysis": 60})
+
+        async def fetch():
+            calls.append(1)
+            return {"value": len(calls)}
+
+        assert await cache.get_or_fetch("github_analysis", "k", fetch) == {"value": 1}
+        assert await cache.get_or_fetch("github_analysis", "k", fetch) == {"value": 1}
+        assert len(calls) == 1
+
+        # Expire the entry, then expect the stale value plus a background refresh
+        cache.ttls["github_analysis"] = -1
+        cache.store.set("k", {"value": 1}, ttl=-1)
+        assert await cache.get_or_fetch("github_analysis", "k", fetch) == {"value": 1}
+        await asyncio.gather(*cache._refresh_tasks)
+        assert len(calls) == 2
+        assert cache.store.get("k", allow_expired=True).value == {"value": 2}
+
+    asyncio.run(scenario())
+
+
+def test_errors_are_not_cached(tmp_path):
+    async def scenario():
+        cache = EnrichmentCache(str(tmp_path / "cache.db"))
+
+        async def failing_fetch():
+            return {"error": "boom"}
+
+        await cache.get_or_fetch("linkedin_analysis", "k", failing_fetch)
+        assert cache.store.get("k", allow_expired=True) is None
+
+    asyncio.run(scenario())
+
+
+def test_disk_cache_evicts_least_recently_used_entries(tmp_path):
+    from app.core.cache import DiskCache
+
+    cache = DiskCache(str(tmp_path / "lru.db"), max_bytes=100)
+    cache.set("a", "x" * 40, ttl=60)
+    cache.set("b", "x" * 40, ttl=60)
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.set("c", "x" * 40, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.total_bytes() <= 100
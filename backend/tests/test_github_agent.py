@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("openai")
+pytest.importorskip("tavily")
+
+from app.agents.github_agent import GithubAgent  # noqa: E402
+from app.agents.github_api import GitHubAPIClient  # noqa: E402
+from app.core import resilience  # noqa: E402
+from app.core.base_openrouter_agent import BaseOpenRouterAgent  # noqa: E402
+
+ANALYSIS = {"User_Profile": "Graph engine author", "key_languages": ["Rust"]}
+
+
+def completion(content):
+    return {
+        "id": "gen-1", "object": "chat.completion", "created": 0, "model": "anthropic/claude-3.7-sonnet",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 30, "total_tokens": 150},
+    }
+
+
+class StubOpenRouter:
+    """httpx transport handler answering chat completions, optionally failing first."""
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503, json={"error": "overloaded"})
+        return httpx.Response(200, json=completion(json.dumps(ANALYSIS)))
+
+
+@pytest.fixture
+def openrouter(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    # No backoff between retries
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: 0.0)
+
+    def install(handler):
+        BaseOpenRouterAgent._shared_http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return handler
+
+    yield install
+    BaseOpenRouterAgent._shared_http_client = None
+
+
+def test_async_requests_share_one_pool_and_retry(openrouter):
+    stub = openrouter(StubOpenRouter(failures=1))
+    first, second = BaseOpenRouterAgent(api_key="key-1"), BaseOpenRouterAgent(api_key="key-2")
+
+    async def scenario():
+        return await asyncio.gather(
+            first._asend_llm_request([{"role": "user", "content": "hi"}]),
+            second._asend_llm_request([{"role": "user", "content": "hello"}]),
+        )
+
+    assert asyncio.run(scenario()) == [ANALYSIS, ANALYSIS]
+    # One 503 retried, then one completion per agent, all over the shared client
+    assert len(stub.requests) == 3
+    assert first.async_client._client is second.async_client._client is BaseOpenRouterAgent._shared_http_client
+    assert stub.requests[-1].url.path == "/api/v1/chat/completions"
+    assert {r.headers["authorization"] for r in stub.requests} == {"Bearer key-1", "Bearer key-2"}
+
+
+def github_api_handler(request):
+    """GraphQL fails, so the client falls back to the REST user and repos endpoints."""
+    if request.method == "POST":
+        return httpx.Response(200, json={"data": {"user": None}, "errors": [{"type": "OTHER", "message": "unavailable"}]})
+    if request.url.path.endswith("/repos"):
+        return httpx.Response(200, json=[])
+    return httpx.Response(200, json={"login": "janedoe", "name": "Jane Doe"})
+
+
+def test_sync_entry_point_runs_the_async_analysis(openrouter):
+    stub = openrouter(StubOpenRouter())
+    github = httpx.AsyncClient(transport=httpx.MockTransport(github_api_handler))
+    agent = GithubAgent(
+        openrouter_api_key="key", tavily_api_key="tavily-key",
+        github_api=GitHubAPIClient(token="token", base_url="https://api.github.test", http_client=github),
+    )
+
+    assert agent.analyze_profile("https://github.com/janedoe") == ANALYSIS
+    messages = json.loads(stub.requests[0].content)["messages"]
+    assert "Jane Doe" in messages[-1]["content"]
+    # The loop-bound pool is closed with the loop and rebuilt on next use
+    assert BaseOpenRouterAgent._shared_http_client is None
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from app.agents.github_api import GitHubAPIClient, format_profile_context  # noqa: E402
+from app.core.cache import DiskCache  # noqa: E402
+
+REST_RESPONSES = {
+    "/users/janedoe": {"login": "janedoe", "name": "Jane Doe", "bio": "Builds graphs", "followers": 42, "following": 3, "public_repos": 3},
+    "/users/janedoe/repos": [
+        {"name": "fast-graph", "html_url": "https://github.com/janedoe/fast-graph", "stargazers_count": 120, "forks_count": 4, "language": "Rust", "fork": False},
+        {"name": "forked", "html_url": "https://github.com/janedoe/forked", "stargazers_count": 999, "language": "C", "fork": True},
+        {"name": "dotfiles", "html_url": "https://github.com/janedoe/dotfiles", "stargazers_count": 3, "language": "Shell", "fork": False},
+    ],
+    "/repos/janedoe/fast-graph/languages": {"Rust": 9000, "Python": 100},
+    "/repos/janedoe/dotfiles/languages": {"Shell": 500},
+}
+
+GRAPHQL_USER = {
+    "login": "janedoe", "name": "Jane Doe", "bio": None, "company": "Acme", "location": "Berlin",
+    "followers": {"totalCount": 42}, "following": {"totalCount": 3},
+    "pinnedItems": {"nodes": [{
+        "name": "fast-graph", "url": "https://github.com/janedoe/fast-graph", "description": "Graph engine",
+        "stargazerCount": 120, "forkCount": 4, "primaryLanguage": {"name": "Rust"},
+        "languages": {"edges": [{"size": 9000, "node": {"name": "Rust"}}]},
+    }]},
+    "repositories": {"totalCount": 2, "nodes": [{
+        "name": "fast-graph", "url": "https://github.com/janedoe/fast-graph", "description": "Graph engine",
+        "stargazerCount": 120, "forkCount": 4, "primaryLanguage": {"name": "Rust"},
+        "languages": {"edges": [{"size": 9000, "node": {"name": "Rust"}}]},
+    }, {
+        "name": "dotfiles", "url": "https://github.com/janedoe/dotfiles", "description": None,
+        "stargazerCount": 3, "forkCount": 0, "primaryLanguage": {"name": "Shell"},
+        "languages": {"edges": [{"size": 500, "node": {"name": "Shell"}}]},
+    }]},
+    "contributionsCollection": {"contributionCalendar": {"totalContributions": 512}},
+}
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    graphql_status = 200
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        etag = f'"{path}-v1"'
+        StubGitHub.requests.append(("GET", path, self.headers.get("If-None-Match")))
+        if path not in REST_RESPONSES:
+            return self._send(404, {"message": "Not Found"})
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304)
+        self._send(200, REST_RESPONSES[path], {"ETag": etag})
+
+    def do_POST(self):
+        StubGitHub.requests.append(("POST", self.path, self.headers.get("Authorization")))
+        if StubGitHub.graphql_status != 200:
+            return self._send(StubGitHub.graphql_status, {"message": "unavailable"})
+        self._send(200, {"data": {"user": GRAPHQL_USER}})
+
+
+@pytest.fixture
+def stub_server():
+    StubGitHub.graphql_status = 200
+    StubGitHub.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_graphql_profile_in_one_request(stub_server):
+    async def scenario():
+        client = GitHubAPIClient(token="t", base_url=stub_server)
+        try:
+            return await client.fetch_profile("janedoe")
+        finally:
+            await client.aclose()
+
+    profile = asyncio.run(scenario())
+    assert StubGitHub.requests == [("POST", "/graphql", "Bearer t")]
+    assert profile["source"] == "graphql"
+    assert profile["total_stars"] == 123
+    assert profile["contributions_last_year"] == 512
+    assert [repo["name"] for repo in profile["pinned_repositories"]] == ["fast-graph"]
+    assert profile["top_languages"] == ["Rust", "Shell"]
+    assert "fast-graph (https://github.com/janedoe/fast-graph)" in format_profile_context(profile)
+
+
+def test_graphql_profiles_are_cached_per_login(stub_server, tmp_path):
+    async def scenario():
+        client = GitHubAPIClient(token="t", base_url=stub_server, etag_cache=DiskCache(str(tmp_path / "cache.db")))
+        try:
+            return await client.fetch_profile("janedoe"), await client.fetch_profile("JaneDoe")
+        finally:
+            await client.aclose()
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    # The second lookup spends no rate limit
+    assert StubGitHub.requests == [("POST", "/graphql", "Bearer t")]
+
+
+def test_rest_fallback_revalidates_with_etags(stub_server, tmp_path):
+    StubGitHub.graphql_status = 502
+
+    async def scenario():
+        client = GitHubAPIClient(token="t", base_url=stub_server, etag_cache=DiskCache(str(tmp_path / "etags.db")))
+        try:
+            return await client.fetch_profile("janedoe"), await client.fetch_profile("janedoe")
+        finally:
+            await client.aclose()
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert first["source"] == "rest"
+    # Forks are excluded; the most starred repository comes first
+    assert [repo["name"] for repo in first["top_repositories"]] == ["fast-graph", "dotfiles"]
+    assert first["total_stars"] == 123
+
+    rest_requests = [r for r in StubGitHub.requests if r[0] == "GET"]
+    assert len(rest_requests) == 8
+    # The second profile fetch only revalidated the cached responses
+    assert all(etag is None for _, _, etag in rest_requests[:4])
+    assert all(etag is not None for _, _, etag in rest_requests[4:])
@@ -0,0 +1,53 @@
+from app.agents.github_repo_parser import extract_repo_urls, parse_star_count
+
+MARKDOWN_PROFILE = """
+# Jane Doe janedoe
+[README](https://github.com/janedoe/janedoe)
+Follow [42 followers](https://github.com/janedoe?tab=followers)
+
+## Pinned
+1. [fast-graph](https://github.com/janedoe/fast-graph) Public
+   Graph engine in Rust  Rust ⭐ 120
+2. [dotfiles](https://github.com/JaneDoe/dotfiles/tree/main) Public
+   Shell ★ 3
+
+1,234 contributions in the last year
+
+Other activity: [old-site](https://github.com/janedoe/old-site) 2 stars,
+[ml-kit](https://github.com/janedoe/ml-kit) 1.5k stars,
+[someone-else](https://github.com/otheruser/project)
+"""
+
+HTML_PROFILE = """
+<a href="/janedoe/repositories">Repositories</a>
+<h2>Popular repositories</h2>
+<a href="/janedoe/alpha">alpha</a> <a href="/janedoe/alpha/stargazers"><svg></svg> 17</a>
+<a href="/janedoe/beta.git">beta</a>
+"""
+
+
+def test_pinned_repositories_come_first_then_by_stars():
+    urls = extract_repo_urls(MARKDOWN_PROFILE, "https://github.com/janedoe/")
+    assert urls == [
+        "https://github.com/janedoe/fast-graph",
+        "https://github.com/JaneDoe/dotfiles",
+        "https://github.com/janedoe/ml-kit",
+        "https://github.com/janedoe/old-site",
+    ]
+
+
+def test_relative_html_links_and_limits():
+    assert extract_repo_urls(HTML_PROFILE, "github.com/janedoe") == [
+        "https://github.com/janedoe/alpha",
+        "https://github.com/janedoe/beta",
+    ]
+    assert extract_repo_urls(MARKDOWN_PROFILE, "https://github.com/janedoe", max_repos=1) == [
+        "https://github.com/janedoe/fast-graph",
+    ]
+    assert extract_repo_urls("no links here", "https://github.com/janedoe") == []
+
+
+def test_parse_star_count():
+    assert parse_star_count("1,024") == 1024
+    assert parse_star_count("1.5k") == 1500
+    assert parse_star_count("2M") == 2000000
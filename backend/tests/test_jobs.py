@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from app.core.jobs import AnalysisJob, AnalysisJobManager, JobQueueFullError
+
+
+def test_jobs_run_on_a_fixed_number_of_workers():
+    async def scenario():
+        running, peak = 0, 0
+
+        async def runner(job):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"echo": job.payload["n"]}
+
+        manager = AnalysisJobManager(runner, max_workers=2)
+        manager.start()
+        jobs = [manager.submit({"n": n}) for n in range(5)]
+        await manager.queue.join()
+        await manager.stop()
+        return jobs, peak
+
+    jobs, peak = asyncio.run(scenario())
+    assert peak == 2
+    assert [job.status for job in jobs] == ["completed"] * 5
+    assert [job.result for job in jobs] == [{"echo": n} for n in range(5)]
+    assert jobs[0].events[0]["event"] == "status" and jobs[0].events[-1]["event"] == "completed"
+
+
+def test_full_queue_rejects_submissions():
+    async def scenario():
+        manager = AnalysisJobManager(lambda job: asyncio.sleep(0), max_queue_size=2)
+        # No workers are started, so nothing drains the queue
+        manager.submit({})
+        manager.submit({})
+        with pytest.raises(JobQueueFullError):
+            manager.submit({})
+        return manager
+
+    assert len(asyncio.run(scenario()).jobs) == 2
+
+
+def test_failed_job_marks_unfinished_stages_failed():
+    async def scenario():
+        async def runner(job):
+            job.record_event("stage", {"stage": "enrichment", "status": "completed"})
+            job.record_event("stage", {"stage": "interview_merge", "status": "running"})
+            raise RuntimeError("interview file unreadable")
+
+        manager = AnalysisJobManager(runner, max_workers=1)
+        manager.start()
+        job = manager.submit({})
+        await manager.queue.join()
+        await manager.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "failed"
+    assert job.error == "interview file unreadable"
+    assert job.stages == {"enrichment": "completed", "interview_merge": "failed", "report": "failed"}
+    assert job.to_dict()["finished_at"] is not None
+
+
+def test_cancelled_job_is_failed():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def runner(job):
+            job.record_event("stage", {"stage": "enrichment", "status": "running"})
+            started.set()
+            await asyncio.sleep(10)
+
+        manager = AnalysisJobManager(runner, max_workers=1)
+        manager.start()
+        job = manager.submit({})
+        await started.wait()
+        await manager.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job.status == "failed" and job.error == "Job was cancelled."
+    assert job.stages["enrichment"] == "failed"
+
+
+def test_only_finished_jobs_are_evicted():
+    async def scenario():
+        manager = AnalysisJobManager(lambda job: asyncio.sleep(0), max_retained_jobs=2)
+        old = manager.submit({})
+        old.status = "completed"
+        running = manager.submit({})
+        running.status = "running"
+        newest = manager.submit({})
+        return manager, old, running, newest
+
+    manager, old, running, newest = asyncio.run(scenario())
+    assert manager.get(old.id) is None
+    assert manager.get(running.id) is running and manager.get(newest.id) is newest
+
+
+def test_explicit_job_id_is_kept():
+    assert AnalysisJob({}, job_id="resumed").id == "resumed"
+
+
+def test_stream_replays_after_last_event_id_and_ends_with_the_job():
+    async def scenario():
+        job = AnalysisJob({})
+        for n in range(3):
+            job.record_event("source_result", {"n": n})
+
+        async def finish():
+            await asyncio.sleep(0.01)
+            job.record_event("report", {"n": 3})
+            job.status = "completed"
+            job.record_event("completed", {"result": {}})
+
+        finisher = asyncio.create_task(finish())
+        # A client reconnecting after event 2 only gets what it missed
+        received = [event async for event in job.stream_events(after=2, heartbeat=5)]
+        await finisher
+        return received
+
+    received = asyncio.run(scenario())
+    assert [event["id"] for event in received] == [3, 4, 5]
+    assert [event["event"] for event in received] == ["source_result", "report", "completed"]
+
+
+def test_stream_sends_heartbeats_while_idle():
+    async def scenario():
+        job = AnalysisJob({})
+        stream = job.stream_events(heartbeat=0.01)
+        first = await stream.__anext__()
+        job.record_event("status", {"status": "running"})
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is None
+    assert second["event"] == "status"
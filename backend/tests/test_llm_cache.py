@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from app.core import llm_cache
+from app.core.llm_cache import LLMResponseCache, generate_json_cached, llm_cache_key
+from app.core.metrics import metrics
+
+
+def test_key_is_stable_and_content_addressed():
+    messages = [{"role": "user", "content": "hi"}]
+    key = llm_cache_key("m", messages=messages, response_format={"type": "json_object"})
+    assert key == llm_cache_key("m", response_format={"type": "json_object"}, messages=list(messages))
+    assert key != llm_cache_key("other-model", messages=messages, response_format={"type": "json_object"})
+    assert key != llm_cache_key("m", messages=[{"role": "user", "content": "hello"}], response_format={"type": "json_object"})
+
+
+def test_namespaces_have_their_own_ttls_and_count_hits(tmp_path):
+    metrics.reset()
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), ttls={"fast": 3600, "gone": -1})
+    key = llm_cache_key("m", prompt="p")
+
+    assert cache.get("fast", key) is None
+    cache.set("fast", key, {"score": 7})
+    cache.set("gone", key, {"score": 1})
+
+    assert cache.get("fast", key) == {"score": 7}
+    assert cache.get("gone", key) is None
+    assert metrics.get("llm_cache_hits_total", namespace="fast") == 1
+    assert metrics.get("llm_cache_misses_total", namespace="fast") == 1
+    assert metrics.get("llm_cache_misses_total", namespace="gone") == 1
+
+
+class FakeGeminiModel:
+    """Stands in for genai.GenerativeModel, answering with a fenced JSON block."""
+    def __init__(self, model_name, text):
+        self.model_name = model_name
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        return type("Response", (), {"text": self.text})()
+
+
+def test_gemini_json_is_parsed_and_cached_per_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: cache)
+    cache = LLMResponseCache(str(tmp_path / "llm.db"))
+    config = {"temperature": 0.1}
+    flash = FakeGeminiModel("models/gemini-1.5-flash", '```json\n{"score": 8}\n```')
+    pro = FakeGeminiModel("models/gemini-1.5-pro", '{"score": 9}')
+
+    assert generate_json_cached(flash, "prompt", config) == {"score": 8}
+    assert generate_json_cached(flash, "prompt", config) == {"score": 8}
+    assert flash.calls == 1
+    # Same request to another model is not served from the first model's entry
+    assert generate_json_cached(pro, "prompt", config) == {"score": 9}
+    assert pro.calls == 1
+
+
+def test_gemini_non_json_answer_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: cache)
+    cache = LLMResponseCache(str(tmp_path / "llm.db"))
+    model = FakeGeminiModel("models/gemini-1.5-flash", "Sorry, I cannot help with that.")
+
+    with pytest.raises(json.JSONDecodeError) as error:
+        generate_json_cached(model, "prompt", {})
+    assert error.value.doc == "Sorry, I cannot help with that."
+    with pytest.raises(json.JSONDecodeError):
+        generate_json_cached(model, "prompt", {})
+    assert model.calls == 2
@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+
+from app.agents.linkedin_agent import fetch_profile_via_agent
+from app.core import resilience
+from app.core.agent_registry import AgentRegistry, linkedin_pool_status
+from app.core.mcp_pool import MCPServerPool
+
+
+class FakeServer:
+    """Stands in for an MCPServerStdio: a context manager whose tools can be listed."""
+    created = []
+
+    def __init__(self):
+        self.entered = 0
+        self.closed = False
+        self.crashed = False
+        self.list_calls = 0
+        FakeServer.created.append(self)
+
+    async def __aenter__(self):
+        self.entered += 1
+        return self
+
+    async def __aexit__(self, *args):
+        self.closed = True
+
+    async def refresh_tools(self):
+        self.list_calls += 1
+        if self.crashed:
+            raise ConnectionError("process exited")
+        return ["get_person_profile"]
+
+
+def make_pool(**kwargs) -> MCPServerPool:
+    FakeServer.created = []
+    return MCPServerPool("test", FakeServer, **kwargs)
+
+
+def test_leases_share_warm_servers_up_to_max_size():
+    async def scenario():
+        pool = make_pool(max_size=2, min_size=1)
+        await pool.start()
+        in_use = []
+
+        async def run(i):
+            async with pool.lease() as server:
+                in_use.append(server)
+                await asyncio.sleep(0.01)
+                assert len({id(s) for s in in_use}) <= 2
+                in_use.remove(server)
+
+        await asyncio.gather(*(run(i) for i in range(6)))
+        stats = pool.stats()
+        await pool.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert len(FakeServer.created) == 2
+    assert stats["size"] == 2 and stats["idle"] == 2 and stats["waiting"] == 0
+    # Each process is started once and its tools listed once to warm the cache
+    assert all(server.entered == 1 and server.list_calls == 1 for server in FakeServer.created)
+    assert all(server.closed for server in FakeServer.created)
+
+
+def test_crashed_server_is_replaced():
+    async def scenario():
+        pool = make_pool(max_size=1, min_size=1)
+        await pool.start()
+        try:
+            async with pool.lease() as server:
+                server.crashed = True
+                raise RuntimeError("run failed")
+        except RuntimeError:
+            pass
+        async with pool.lease() as server:
+            replacement = server
+        stats = pool.stats()
+        await pool.stop()
+        return replacement, stats
+
+    replacement, stats = asyncio.run(scenario())
+    first = FakeServer.created[0]
+    assert first.closed and replacement is not first
+    assert stats["replacements"] == 1 and stats["size"] == 1
+
+
+def test_idle_servers_are_evicted_down_to_min_size():
+    async def scenario():
+        pool = make_pool(max_size=3, min_size=1, idle_timeout=0)
+        await pool.start()
+
+        async def hold():
+            async with pool.lease():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(hold(), hold(), hold())
+        assert pool.stats()["size"] == 3
+        await asyncio.sleep(0.001)
+        evicted = await pool.evict_idle()
+        stats = pool.stats()
+        await pool.stop()
+        return evicted, stats
+
+    evicted, stats = asyncio.run(scenario())
+    assert evicted == 2
+    assert stats["size"] == 1
+
+
+def test_cancelled_lease_does_not_return_its_server():
+    async def scenario():
+        pool = make_pool(max_size=1, min_size=1)
+        await pool.start()
+        started = asyncio.Event()
+
+        async def abandoned_call():
+            async with pool.lease():
+                started.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(abandoned_call())
+        await started.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        async with pool.lease() as server:
+            next_server = server
+        stats = pool.stats()
+        await pool.stop()
+        return next_server, stats
+
+    next_server, stats = asyncio.run(scenario())
+    first = FakeServer.created[0]
+    # The process may still be busy with the abandoned call, so it is closed, not reused
+    assert first.closed and next_server is not first
+    assert stats["replacements"] == 1 and stats["size"] == 1
+
+
+class DownServer(FakeServer):
+    """A server whose container cannot start."""
+    async def __aenter__(self):
+        raise ConnectionError("docker daemon not running")
+
+
+def test_mcp_outage_does_not_open_the_anthropic_circuit(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: 0.0)
+
+    async def scenario():
+        pool = MCPServerPool("linkedin", DownServer, min_size=0)
+        with pytest.raises(ConnectionError):
+            await fetch_profile_via_agent(agent=None, url="https://www.linkedin.com/in/jane", pool=pool)
+
+    asyncio.run(scenario())
+    assert "anthropic" not in resilience._breakers
+    assert resilience._breakers["linkedin_mcp"].failures == resilience.RetryPolicy().max_attempts
+
+
+def test_registry_reports_failing_server_starts_as_degraded():
+    async def scenario():
+        registry = AgentRegistry(openrouter_api_key="key", tavily_api_key="tavily-key")
+        registry.linkedin_pool = make_pool(min_size=0)
+        statuses = [(await registry.check_health())["linkedin_mcp"]]
+
+        registry.linkedin_pool.factory = DownServer
+        with pytest.raises(ConnectionError):
+            async with registry.linkedin_pool.lease():
+                pass
+        statuses.append((await registry.check_health())["linkedin_mcp"])
+
+        # A server that starts again clears it
+        registry.linkedin_pool.factory = FakeServer
+        async with registry.linkedin_pool.lease():
+            pass
+        statuses.append((await registry.check_health())["linkedin_mcp"])
+        await registry.linkedin_pool.stop()
+        return statuses
+
+    assert asyncio.run(scenario()) == ["running", "degraded: last 1 server start(s) failed", "running"]
+    # A pool meant to keep servers warm that has none left is degraded too
+    empty = {"idle": 0, "in_use": 0, "min_size": 1, "start_failures": 0}
+    assert linkedin_pool_status(empty) == "degraded: no live servers"
@@ -0,0 +1,72 @@
+import random
+
+from app.agents.openalex_abstracts import reconstruct_abstract, reconstruct_abstracts
+
+
+def reconstruct_sorted(inverted_index):
+    # The previous implementation, as the reference
+    if not inverted_index:
+        return None
+    word_positions = [(pos, word) for word, positions in inverted_index.items() for pos in positions]
+    word_positions.sort()
+    return ' '.join([word for pos, word in word_positions])
+
+
+def inverted(text):
+    index = {}
+    for pos, word in enumerate(text.split()):
+        index.setdefault(word, []).append(pos)
+    return index
+
+
+def test_dense_index():
+    text = "the cat sat on the mat and the dog sat too"
+    assert reconstruct_abstract(inverted(text)) == text
+
+
+def test_gaps_are_skipped():
+    assert reconstruct_abstract({"hello": [0], "world": [5]}) == "hello world"
+
+
+def test_duplicate_positions_keep_every_word():
+    index = {"beta": [1], "alpha": [1], "start": [0]}
+    assert reconstruct_abstract(index) == "start alpha beta" == reconstruct_sorted(index)
+
+
+def test_sparse_outlier_position_is_sorted_not_allocated():
+    assert reconstruct_abstract({"a": [0], "b": [10 ** 9]}) == "a b"
+
+
+def test_empty_string_tokens_are_kept():
+    index = {"": [1], "a": [0], "b": [4]}
+    assert reconstruct_abstract(index) == "a  b" == reconstruct_sorted(index)
+
+
+def test_negative_positions_are_sorted():
+    index = {"a": [0], "b": [-1]}
+    assert reconstruct_abstract(index) == "b a" == reconstruct_sorted(index)
+
+
+def test_empty():
+    assert reconstruct_abstract(None) is None
+    assert reconstruct_abstract({}) is None
+    assert reconstruct_abstract({"orphan": []}) is None
+
+
+def test_matches_sorted_version_on_random_indexes():
+    rng = random.Random(7)
+    vocabulary = ["w%d" % i for i in range(40)] + [""]
+    indexes = []
+    for _ in range(200):
+        size = rng.randint(1, 60)
+        index = {}
+        for pos in rng.sample(range(size * 2), size) if rng.random() < 0.3 else range(size):
+            index.setdefault(rng.choice(vocabulary), []).append(pos)
+        if rng.random() < 0.2:
+            index.setdefault(rng.choice(vocabulary), []).append(0)
+        if rng.random() < 0.1:
+            index.setdefault(rng.choice(vocabulary), []).append(-rng.randint(1, size))
+        indexes.append(index)
+    expected = [reconstruct_sorted(index) for index in indexes]
+    assert [reconstruct_abstract(index) for index in indexes] == expected
+    assert reconstruct_abstracts(indexes + [None]) == expected + [None]
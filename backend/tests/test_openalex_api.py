@@ -0,0 +1,246 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from app.agents import openalex_api  # noqa: E402
+from app.agents.openalex_api import OpenAlexClient, RateLimiter, create_openalex_client  # noqa: E402
+from app.agents.openalex_institutions import InstitutionIndex  # noqa: E402
+
+AUTHOR = {
+    "id": "https://openalex.org/A1",
+    "display_name": "Ada Lovelace",
+    "works_count": 3,
+    "cited_by_count": 70,
+    "summary_stats": {"h_index": 2, "i10_index": 1},
+    "last_known_institutions": [{"display_name": "University of London"}],
+}
+WORKS = [
+    {"id": "https://openalex.org/W1", "title": "Engines", "cited_by_count": 50,
+     "abstract_inverted_index": {"Analytical": [0], "engines": [1], "compute.": [2]}},
+    {"id": "https://openalex.org/W2", "title": "Notes", "cited_by_count": 20, "abstract_inverted_index": None},
+]
+
+# Three works per page; W1 and W2 (the most cited) are on different pages
+STREAM_PAGES = {
+    "*": {"meta": {"next_cursor": "p2"}, "results": [
+        {"id": "https://openalex.org/W3", "cited_by_count": 3, "publication_year": 2021},
+        {"id": "https://openalex.org/W1", "cited_by_count": 50, "publication_year": 2020},
+        {"id": "https://openalex.org/W4", "cited_by_count": 0, "publication_year": 2022},
+    ]},
+    "p2": {"meta": {"next_cursor": None}, "results": [
+        {"id": "https://openalex.org/W2", "cited_by_count": 20, "publication_year": 2019},
+        {"id": "https://openalex.org/W5", "cited_by_count": 2, "publication_year": 2018},
+    ]},
+}
+
+
+class StubOpenAlex(BaseHTTPRequestHandler):
+    requests: list = []
+    abstracts_status = 200
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        StubOpenAlex.requests.append((url.path, query))
+        if url.path == "/authors" and "filter" in query:
+            body = {"results": [AUTHOR] if query["filter"] == ["last_known_institutions.id:I7"] else []}
+        elif url.path == "/authors":
+            body = {"results": [{"id": "https://openalex.org/A0", "display_name": "Ada L.", "last_known_institutions": []}, AUTHOR]}
+        elif url.path == "/institutions" and query["search"] == ["Nowhere College"]:
+            body = {"results": []}
+        elif url.path == "/institutions":
+            body = {"results": [{"id": "https://openalex.org/I7", "display_name": "University of London", "works_count": 9}]}
+        elif url.path == "/works" and "cursor" in query:
+            body = STREAM_PAGES[query["cursor"][0]]
+        elif url.path == "/works" and query.get("filter", [""])[0].startswith("openalex:") and StubOpenAlex.abstracts_status != 200:
+            self.send_response(StubOpenAlex.abstracts_status)
+            self.end_headers()
+            return
+        elif url.path == "/works" and query.get("filter", [""])[0].startswith("openalex:"):
+            ids = query["filter"][0][len("openalex:"):].split("|")
+            body = {"results": [w for w in WORKS if w["id"].split("/")[-1] in ids]}
+        elif url.path == "/works":
+            body = {"results": WORKS}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def stub_server():
+    StubOpenAlex.requests = []
+    StubOpenAlex.abstracts_status = 200
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAlex)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_fetch_author_data(stub_server):
+    async def scenario():
+        client = OpenAlexClient(mailto="team@example.com", base_url=stub_server, max_requests_per_second=0)
+        try:
+            return await client.fetch_author_data("Ada Lovelace", "university of london", top_n_publications=2)
+        finally:
+            await client.aclose()
+
+    data = asyncio.run(scenario())
+    # The affiliation picks the second search result
+    assert data["author_metrics"]["openalex_id"] == "https://openalex.org/A1"
+    assert data["author_metrics"]["h_index"] == 2
+    assert data["author_metrics"]["last_known_institution"] == "University of London"
+    assert data["top_publications"] == [
+        {"title": "Engines", "abstract": "Analytical engines compute.", "cited_by_count": 50},
+        {"title": "Notes", "abstract": "Abstract not available.", "cited_by_count": 20},
+    ]
+    # The search hit carries the metrics and the works listing the abstracts
+    assert [path for path, _ in StubOpenAlex.requests] == ["/authors", "/works"]
+    assert StubOpenAlex.requests[1][1]["select"] == ["id,title,cited_by_count,abstract_inverted_index"]
+    assert all(query["mailto"] == ["team@example.com"] for _, query in StubOpenAlex.requests)
+
+
+def test_affiliation_filter_runs_server_side(stub_server):
+    async def scenario():
+        client = OpenAlexClient(base_url=stub_server, max_requests_per_second=0, institutions=InstitutionIndex())
+        try:
+            first = await client.search_author("Ada Lovelace", "London")
+            second = await client.search_author("Ada Lovelace", "university of london")
+            return first, second
+        finally:
+            await client.aclose()
+
+    first, second = asyncio.run(scenario())
+    assert first["id"] == second["id"] == "https://openalex.org/A1"
+    # The institution is searched once, then resolved from the index
+    assert [path for path, _ in StubOpenAlex.requests] == ["/institutions", "/authors", "/authors"]
+    assert StubOpenAlex.requests[1][1]["filter"] == ["last_known_institutions.id:I7"]
+    assert StubOpenAlex.requests[1][1]["per-page"] == ["1"]
+
+
+def test_unknown_institution_is_searched_once(stub_server):
+    async def scenario():
+        client = OpenAlexClient(base_url=stub_server, max_requests_per_second=0, institutions=InstitutionIndex())
+        try:
+            for _ in range(2):
+                await client.search_author("Ada Lovelace", "Nowhere College")
+        finally:
+            await client.aclose()
+
+    asyncio.run(scenario())
+    # The miss is remembered, so the second search goes straight to the name search
+    assert [path for path, _ in StubOpenAlex.requests] == ["/institutions", "/authors", "/authors"]
+
+
+def test_unrelated_institution_hit_is_not_used_as_a_filter(stub_server):
+    async def scenario():
+        client = OpenAlexClient(base_url=stub_server, max_requests_per_second=0, institutions=InstitutionIndex())
+        try:
+            return await client.search_author("Ada Lovelace", "Imperial College")
+        finally:
+            await client.aclose()
+
+    # The institution search only finds the University of London
+    author = asyncio.run(scenario())
+    assert author["id"] == "https://openalex.org/A0"
+    assert [path for path, _ in StubOpenAlex.requests] == ["/institutions", "/authors"]
+    assert "filter" not in StubOpenAlex.requests[1][1]
+
+
+def test_streaming_mode_pages_through_all_works(stub_server):
+    async def scenario():
+        client = OpenAlexClient(base_url=stub_server, max_requests_per_second=0)
+        try:
+            return await client.fetch_author_data("Ada Lovelace", top_n_publications=2, stream_works=True)
+        finally:
+            await client.aclose()
+
+    data = asyncio.run(scenario())
+    assert data["research_metrics"]["works_counted"] == 5
+    assert data["research_metrics"]["total_citations"] == 75
+    assert data["research_metrics"]["h_index"] == 3
+    assert data["research_metrics"]["i10_index"] == 2
+    # The top works' abstracts come from one batched lookup by id
+    assert [p["abstract"] for p in data["top_publications"]] == ["Analytical engines compute.", "Abstract not available."]
+    assert [query.get("cursor") for path, query in StubOpenAlex.requests if "cursor" in query] == [["*"], ["p2"]]
+    assert StubOpenAlex.requests[-1][1]["filter"] == ["openalex:W1|W2"]
+    assert len(StubOpenAlex.requests) == 4
+
+
+def test_streamed_metrics_survive_a_failed_abstract_lookup(stub_server):
+    StubOpenAlex.abstracts_status = 400
+
+    async def scenario():
+        client = OpenAlexClient(base_url=stub_server, max_requests_per_second=0)
+        try:
+            return await client.fetch_author_data("Ada Lovelace", top_n_publications=2, stream_works=True)
+        finally:
+            await client.aclose()
+
+    data = asyncio.run(scenario())
+    assert data["research_metrics"]["works_counted"] == 5
+    assert data["top_publications"] == [
+        {"title": None, "abstract": "Abstract not available.", "cited_by_count": 50},
+        {"title": None, "abstract": "Abstract not available.", "cited_by_count": 20},
+    ]
+
+
+def test_unknown_author(stub_server):
+    async def scenario():
+        client = OpenAlexClient(base_url=stub_server + "/missing", max_requests_per_second=0)
+        try:
+            return await client.fetch_author_data("Nobody")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(scenario()) == {"error": "Author 'Nobody' not found."}
+
+
+def test_factory_builds_a_configured_client_each_call(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(openalex_api, "_default_client", None)
+    monkeypatch.setenv("OPENALEX_MAILTO", "team@example.com")
+    monkeypatch.setenv("OPENALEX_API_URL", stub_server)
+    monkeypatch.setenv("OPENALEX_MAX_RPS", "0")
+    monkeypatch.setenv("OPENALEX_INSTITUTIONS_CACHE_PATH", str(tmp_path / "institutions.db"))
+
+    async def scenario():
+        client = create_openalex_client()
+        try:
+            return client, await client.search_author("Ada Lovelace", "University of London")
+        finally:
+            await client.aclose()
+
+    client, author = asyncio.run(scenario())
+    assert (client.mailto, client.base_url) == ("team@example.com", stub_server)
+    # Its own index resolves the affiliation, and the shared client is never built
+    assert author["id"] == "https://openalex.org/A1"
+    assert StubOpenAlex.requests[1][1]["filter"] == ["last_known_institutions.id:I7"]
+    assert openalex_api._default_client is None
+    assert create_openalex_client() is not client
+
+
+def test_rate_limiter_spaces_requests():
+    async def scenario():
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+        return time.monotonic() - start
+
+    # Six slots at 50 per second: the last one starts 5 intervals (0.1s) after the first
+    assert asyncio.run(scenario()) >= 0.09
+
@@ -0,0 +1,65 @@
+from app.agents.openalex_institutions import InstitutionIndex
+from app.core.cache import DiskCache
+
+CAMBRIDGE = {
+    "id": "https://openalex.org/I241749", "display_name": "University of Cambridge",
+    "ror": "https://ror.org/013meh722", "works_count": 500000,
+    "display_name_alternatives": ["Cambridge University"],
+}
+HOSPITALS = {"id": "https://openalex.org/I2799", "display_name": "Cambridge University Hospitals NHS Foundation Trust", "works_count": 20000}
+MIT = {
+    "id": "https://openalex.org/I63966007", "display_name": "Massachusetts Institute of Technology",
+    "works_count": 400000, "display_name_acronyms": ["MIT"],
+}
+
+
+def build(cache=None):
+    index = InstitutionIndex(cache=cache)
+    for record in (CAMBRIDGE, HOSPITALS, MIT):
+        index.add(record)
+    return index
+
+
+def test_free_text_variants_resolve_to_one_institution():
+    index = build()
+    for text in ("University of Cambridge", "Cambridge", "cambridge university", "The University of Cambridge", "Univeristy of Cambrige"):
+        assert index.resolve(text)["id"] == "I241749", text
+    assert index.resolve("MIT")["id"] == "I63966007"
+    assert index.resolve("Massachusetts Inst. of Technology")["id"] == "I63966007"
+
+
+def test_unknown_names_do_not_match():
+    index = build()
+    assert index.resolve("University of Oxford") is None
+    assert index.resolve("") is None
+
+
+def test_remembered_resolutions_survive_restarts(tmp_path):
+    cache = DiskCache(str(tmp_path / "institutions.db"))
+    build(cache).remember("Judge Business School", {"id": "I241749", "display_name": "University of Cambridge", "ror": None, "works_count": 1})
+    assert InstitutionIndex(cache=cache).resolve("judge business school")["id"] == "I241749"
+
+
+def test_names_sharing_no_word_prefix_are_not_scanned(monkeypatch):
+    index = build()
+    import app.agents.openalex_institutions as module
+
+    def fail(*args, **kwargs):
+        raise AssertionError("fuzzy matching ran over unrelated names")
+
+    monkeypatch.setattr(module.difflib, "get_close_matches", fail)
+    assert index.resolve("Sorbonne") is None
+
+
+def test_misses_are_remembered_for_a_while(tmp_path):
+    index = build()
+    index.remember_miss("Unknown Polytechnic", ttl=60)
+    assert index.known_miss("unknown  polytechnic")
+    index.remember_miss("Gone Polytechnic", ttl=-1)
+    assert not index.known_miss("Gone Polytechnic")
+
+    cache = DiskCache(str(tmp_path / "institutions.db"))
+    build(cache).remember_miss("Unknown Polytechnic")
+    restarted = InstitutionIndex(cache=cache)
+    assert restarted.known_miss("Unknown Polytechnic")
+    assert restarted.resolve("Unknown Polytechnic") is None
@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+
+from app.agents.openalex_snapshot import OpenAlexSnapshot
+
+
+def write_partition(root, entity, updated, records):
+    directory = os.path.join(root, entity, f"updated_date={updated}")
+    os.makedirs(directory, exist_ok=True)
+    with gzip.open(os.path.join(directory, "part_000.gz"), "wt", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def author(author_id, name, institution, works_count=2, summary_stats=None):
+    return {
+        "id": f"https://openalex.org/{author_id}",
+        "display_name": name,
+        "display_name_alternatives": [name.split()[0][0] + ". " + name.split()[-1]],
+        "works_count": works_count,
+        "cited_by_count": 40,
+        "summary_stats": summary_stats,
+        "last_known_institutions": [{"id": f"https://openalex.org/I{author_id}", "display_name": institution}],
+    }
+
+
+def work(work_id, title, cited, author_ids, abstract=None):
+    return {
+        "id": f"https://openalex.org/{work_id}",
+        "title": title,
+        "publication_year": 2020,
+        "cited_by_count": cited,
+        "abstract_inverted_index": abstract,
+        "authorships": [{"author": {"id": f"https://openalex.org/{a}"}} for a in author_ids],
+    }
+
+
+def build(tmp_path):
+    root = str(tmp_path / "snapshot")
+    write_partition(root, "authors", "2024-01-01", [
+        author("A1", "Jane Doe", "University of Cambridge", summary_stats={"h_index": 7, "i10_index": 3}),
+        author("A2", "Jane Doe", "Stanford University", works_count=50),
+    ])
+    write_partition(root, "works", "2024-01-01", [
+        work("W1", "Graphs", 30, ["A1"], {"Fast": [0], "graphs.": [1]}),
+        work("W2", "Trees", 12, ["A1", "A2"]),
+    ])
+    snapshot = OpenAlexSnapshot(str(tmp_path / "snapshot.db"))
+    return root, snapshot
+
+
+def test_lookup_by_name_and_institution(tmp_path):
+    root, snapshot = build(tmp_path)
+    assert snapshot.ingest(root) == {"partitions": 2, "authors": 2, "works": 2}
+
+    data = snapshot.author_data("jane  DOE", "cambridge")
+    assert data["author_metrics"]["openalex_id"] == "https://openalex.org/A1"
+    assert data["author_metrics"]["h_index"] == 7
+    assert data["top_publications"] == [
+        {"title": "Graphs", "abstract": "Fast graphs.", "cited_by_count": 30},
+        {"title": "Trees", "abstract": "Abstract not available.", "cited_by_count": 12},
+    ]
+    # Without an affiliation the author with the most works wins
+    assert snapshot.author_data("Jane Doe")["author_metrics"]["openalex_id"] == "https://openalex.org/A2"
+    # Alternative names are indexed too
+    assert snapshot.find_author("J. Doe", "Cambridge")["id"] == "A1"
+    assert snapshot.author_data("John Smith") is None
+
+
+def test_missing_summary_stats_are_computed_from_works(tmp_path):
+    root, snapshot = build(tmp_path)
+    snapshot.ingest(root)
+    assert snapshot.find_author("Jane Doe", "Stanford")["h_index"] == 1
+
+
+def test_incremental_ingest_only_reads_new_partitions(tmp_path):
+    root, snapshot = build(tmp_path)
+    snapshot.ingest(root)
+    write_partition(root, "works", "2024-02-01", [work("W1", "Graphs (revised)", 45, ["A1"])])
+
+    assert snapshot.ingest(root) == {"partitions": 1, "authors": 0, "works": 1}
+    assert snapshot.stats() == {"authors": 2, "works": 2, "partitions": 3}
+    assert snapshot.top_works("A1", 1)[0]["title"] == "Graphs (revised)"
+
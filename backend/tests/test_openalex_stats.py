@@ -0,0 +1,47 @@
+import math
+import random
+
+from app.agents.openalex_stats import CitationStats
+
+
+def h_index(citations):
+    ranked = sorted(citations, reverse=True)
+    return sum(1 for rank, cited in enumerate(ranked, start=1) if cited >= rank)
+
+
+def test_matches_batch_computation_in_any_order():
+    rng = random.Random(3)
+    works = [
+        {"id": f"W{i}", "cited_by_count": int(rng.paretovariate(1.2)) - 1, "publication_year": rng.randint(2000, 2024)}
+        for i in range(2000)
+    ]
+    stats = CitationStats(top_n=5, current_year=2024)
+    for work in works:
+        stats.add(work)
+
+    citations = [w["cited_by_count"] for w in works]
+    summary = stats.summary()
+    assert summary["works_counted"] == 2000
+    assert summary["total_citations"] == sum(citations)
+    assert summary["h_index"] == h_index(citations)
+    assert summary["i10_index"] == sum(1 for c in citations if c >= 10)
+    assert [w["cited_by_count"] for w in stats.top_works()] == sorted(citations, reverse=True)[:5]
+    # The h-index heap holds h counts, not every work
+    assert len(stats._h_heap) == summary["h_index"]
+
+
+def test_year_aggregates_and_recency_weighting():
+    stats = CitationStats(current_year=2024, half_life_years=5)
+    stats.add({"cited_by_count": 100, "publication_year": 2024, "counts_by_year": [{"year": 2024, "cited_by_count": 60}, {"year": 2023, "cited_by_count": 40}]})
+    stats.add({"cited_by_count": 100, "publication_year": 2019, "counts_by_year": [{"year": 2024, "cited_by_count": 5}]})
+
+    summary = stats.summary()
+    assert summary["citations_per_year"] == {2023: 40, 2024: 65}
+    assert summary["works_per_year"] == {2019: 1, 2024: 1}
+    # A five-year-old work counts half
+    assert math.isclose(summary["recency_weighted_impact"], 150.0)
+
+
+def test_empty():
+    assert CitationStats().summary()["h_index"] == 0
+    assert CitationStats().top_works() == []
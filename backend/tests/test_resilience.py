@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.core import resilience
+from app.core.metrics import metrics
+from app.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retries,
+    call_with_retries_sync,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(headers or {})
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: None)
+    metrics.reset()
+
+
+def test_retries_transient_errors_then_succeeds():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise FakeHTTPError(503)
+        return "ok"
+
+    assert call_with_retries_sync("p", flaky, RetryPolicy(max_attempts=4, base_delay=0)) == "ok"
+    assert metrics.get("llm_attempts_total", provider="p") == 3
+    assert metrics.get("llm_retries_total", provider="p") == 2
+    assert metrics.get("llm_give_ups_total", provider="p") == 0
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise FakeHTTPError(400)
+
+    with pytest.raises(FakeHTTPError):
+        call_with_retries_sync("p", bad_request, RetryPolicy(max_attempts=4, base_delay=0))
+    assert len(calls) == 1
+    assert metrics.get("llm_give_ups_total", provider="p") == 1
+
+
+def test_retry_after_sets_the_minimum_delay():
+    error = FakeHTTPError(429, {"retry-after": "7"})
+    assert is_retryable(error)
+    assert retry_after_seconds(error) == 7
+    assert RetryPolicy(base_delay=0.1, max_delay=30).delay(1, retry_after=7) == 7
+    # Coming back before the provider asked to would only waste an attempt
+    assert RetryPolicy(base_delay=0.1, max_delay=5).delay(1, retry_after=7) is None
+
+
+def test_retry_after_longer_than_max_delay_gives_up():
+    calls = []
+
+    def rate_limited():
+        calls.append(1)
+        raise FakeHTTPError(429, {"retry-after": "60"})
+
+    with pytest.raises(FakeHTTPError):
+        call_with_retries_sync("p", rate_limited, RetryPolicy(max_attempts=4, base_delay=0, max_delay=30))
+    assert len(calls) == 1
+    assert metrics.get("llm_retries_total", provider="p") == 0
+    assert metrics.get("llm_give_ups_total", provider="p") == 1
+
+
+def test_circuit_opens_after_consecutive_failures_and_fails_fast(monkeypatch):
+    breaker = CircuitBreaker("p", failure_threshold=2, reset_timeout=60)
+    monkeypatch.setitem(resilience._breakers, "p", breaker)
+    calls = []
+
+    async def down():
+        calls.append(1)
+        raise FakeHTTPError(502)
+
+    async def scenario():
+        with pytest.raises(FakeHTTPError):
+            await call_with_retries("p", down, RetryPolicy(max_attempts=2, base_delay=0))
+        with pytest.raises(CircuitOpenError):
+            await call_with_retries("p", down, RetryPolicy(max_attempts=2, base_delay=0))
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert breaker.state == "open"
+
+
+def test_half_open_trial_call_closes_the_circuit(monkeypatch):
+    breaker = CircuitBreaker("p", failure_threshold=1, reset_timeout=0)
+    monkeypatch.setitem(resilience._breakers, "p", breaker)
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    assert call_with_retries_sync("p", lambda: "ok") == "ok"
+    assert breaker.state == "closed"
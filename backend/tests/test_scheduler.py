@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+from app.core.scheduler import ProviderLimits, Scheduler, TokenBucket, job_scope
+
+
+def test_concurrency_cap():
+    scheduler = Scheduler({"p": ProviderLimits(concurrency=2)})
+    running, peak = 0, 0
+
+    async def call():
+        nonlocal running, peak
+        async with scheduler.slot("p"):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def scenario():
+        await asyncio.gather(*(call() for _ in range(8)))
+
+    asyncio.run(scenario())
+    assert peak == 2
+    assert scheduler.stats()["p"]["in_flight"] == 0
+
+
+def test_jobs_are_served_in_turn():
+    scheduler = Scheduler({"p": ProviderLimits(concurrency=1)})
+    order = []
+
+    async def call(job, n):
+        with job_scope(job):
+            async with scheduler.slot("p"):
+                order.append(f"{job}{n}")
+                await asyncio.sleep(0.005)
+
+    async def scenario():
+        big = [asyncio.create_task(call("a", n)) for n in range(4)]
+        await asyncio.sleep(0)
+        small = asyncio.create_task(call("b", 0))
+        await asyncio.gather(*big, small)
+
+    asyncio.run(scenario())
+    # Job b arrived behind four calls of job a but only waits for one of them
+    assert order == ["a0", "a1", "b0", "a2", "a3"]
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    scheduler = Scheduler({"p": ProviderLimits(concurrency=1)})
+
+    async def scenario():
+        async def hold():
+            async with scheduler.slot("p"):
+                await asyncio.sleep(0.02)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0.005)
+        assert scheduler.stats()["p"]["waiting"] == 1
+        waiter.cancel()
+        await asyncio.gather(holder, waiter, return_exceptions=True)
+        return scheduler.stats()["p"]
+
+    assert asyncio.run(scenario())["in_flight"] == 0
+
+
+def test_token_bucket_spaces_requests():
+    async def scenario():
+        bucket = TokenBucket(rate=100, capacity=1)
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # One unit is available at once, the other five refill at 100 per second
+    assert asyncio.run(scenario()) >= 0.045
+
+
+def test_tokens_per_minute_budget_is_settled_with_actual_usage():
+    scheduler = Scheduler({"llm": ProviderLimits(tokens_per_minute=600)})
+
+    async def scenario():
+        async with scheduler.slot("llm", tokens=500) as lease:
+            lease.report_tokens(100)
+
+    asyncio.run(scenario())
+    # 500 were reserved, 400 of them returned
+    assert 499 <= scheduler._queues["llm"].tokens.balance <= 501
+
+
+def test_multi_provider_slots_are_taken_in_a_fixed_order():
+    scheduler = Scheduler({"anthropic": ProviderLimits(concurrency=1), "linkedin_mcp": ProviderLimits(concurrency=1)})
+    done = []
+
+    async def call(name, order):
+        async with scheduler.slots(*order) as leases:
+            assert set(leases) == {"anthropic", "linkedin_mcp"}
+            await asyncio.sleep(0.005)
+            done.append(name)
+
+    async def scenario():
+        # Opposite request orders would deadlock if slots were taken as listed
+        await asyncio.wait_for(asyncio.gather(
+            call("a", [("linkedin_mcp", 0), ("anthropic", 10)]),
+            call("b", [("anthropic", 10), ("linkedin_mcp", 0)]),
+        ), timeout=1)
+
+    asyncio.run(scenario())
+    assert sorted(done) == ["a", "b"]
+    assert scheduler.stats()["anthropic"]["in_flight"] == 0
+
+
+def test_calls_queued_for_an_mcp_server_hold_no_model_slot():
+    scheduler = Scheduler({"anthropic": ProviderLimits(concurrency=2), "linkedin_mcp": ProviderLimits(concurrency=1)})
+    release = None
+
+    async def mcp_call():
+        async with scheduler.slots(("anthropic", 10), ("linkedin_mcp", 0)):
+            await release.wait()
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        mcp_calls = [asyncio.create_task(mcp_call()) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        # One call has the server and a model slot, the other waits for the server only
+        assert scheduler.stats()["linkedin_mcp"]["waiting"] == 1
+        assert scheduler.stats()["anthropic"]["in_flight"] == 1
+        async with scheduler.slot("anthropic"):
+            pass
+        release.set()
+        await asyncio.gather(*mcp_calls)
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=1))
+    assert scheduler.stats()["anthropic"]["in_flight"] == 0
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import deadline_scope
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution_and_its_events():
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+        release = asyncio.Event()
+        runs = []
+
+        async def work(emit):
+            runs.append(1)
+            emit("progress", {"step": 1})
+            started.set()
+            await release.wait()
+            return {"answer": 42}
+
+        first_events, second_events = [], []
+        first = asyncio.create_task(flights.do("k", work, on_event=lambda e, d: first_events.append(e)))
+        await started.wait()
+        # Joins while the first call is in flight and gets the earlier event replayed
+        second = asyncio.create_task(flights.do("k", work, on_event=lambda e, d: second_events.append(e)))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first == {"answer": 42}
+        assert await second == {"answer": 42}
+        assert len(runs) == 1
+        assert first_events == second_events == ["progress"]
+        assert not flights.in_flight("k")
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work(emit):
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flights.do("k", work))
+        follower = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == "done"
+
+    asyncio.run(scenario())
+
+
+def test_joiner_stops_waiting_at_its_own_deadline():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work(emit):
+            await release.wait()
+            return "done"
+
+        async def call(deadline):
+            with deadline_scope(deadline):
+                return await flights.do("k", work)
+
+        leader = asyncio.create_task(call(10))
+        await asyncio.sleep(0)
+        # Joins the leader's run with a much shorter budget of its own
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(call(0.05), timeout=1)
+        assert flights.in_flight("k")
+        release.set()
+        assert await leader == "done"
+
+    asyncio.run(scenario())
@@ -0,0 +1,105 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.core.storage import DataStore
+
+
+def test_insert_allocates_incremental_ids_per_type(tmp_path):
+    """IDs start at 1 and increase independently for each record type."""
+    store = DataStore(str(tmp_path / "store.db"))
+
+    assert store.insert("prospects", {"name": "a"})["id"] == "1"
+    assert store.insert("prospects", {"name": "b"})["id"] == "2"
+    assert store.insert("setupinfo", {"name": "c"})["id"] == "1"
+
+    record = store.get("prospects", "2")
+    assert record["data"] == {"name": "b"}
+    assert store.get("prospects", "3") is None
+    assert store.get("prospects", "not-a-number") is None
+
+
+def test_concurrent_inserts_never_share_an_id(tmp_path):
+    """Parallel writers must each get a distinct ID."""
+    store = DataStore(str(tmp_path / "store.db"))
+    ids = []
+    lock = threading.Lock()
+
+    def writer():
+        for _ in range(20):
+            record = store.insert("prospects", {})
+            with lock:
+                ids.append(record["id"])
+
+    threads = [threading.Thread(target=writer) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(int(i) for i in ids) == list(range(1, 101))
+
+
+def test_import_json_directory_keeps_ids_and_advances_sequence(tmp_path):
+    """Legacy files keep their IDs and new inserts continue after them."""
+    legacy_dir = tmp_path / "data_storage"
+    legacy_dir.mkdir()
+    for data_id in (2, 7):
+        (legacy_dir / f"prospects_{data_id}.json").write_text(json.dumps({
+            "id": str(data_id),
+            "type": "prospects",
+            "data": {"n": data_id},
+            "received_at": f"2025-09-2{data_id % 10}T10:00:00",
+        }))
+    (legacy_dir / "notes.txt").write_text("ignored")
+
+    store = DataStore(str(tmp_path / "store.db"))
+    assert store.import_json_directory(str(legacy_dir)) == 2
+    # Importing again is a no-op
+    assert store.import_json_directory(str(legacy_dir)) == 0
+
+    assert store.get("prospects", "7")["data"] == {"n": 7}
+    assert store.insert("prospects", {})["id"] == "8"
+
+
+def test_list_records_pages_with_cursor_and_filters(tmp_path):
+    """Pages follow each other without gaps or repeats and honour the filters."""
+    store = DataStore(str(tmp_path / "store.db"))
+    for day in range(1, 8):
+        store.insert("prospects", {}, received_at=f"2025-09-0{day}T10:00:00")
+        store.insert("setupinfo", {}, received_at=f"2025-09-0{day}T10:00:00")
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.list_records(limit=4, cursor=cursor)
+        seen.extend((r["received_at"], r["type"], r["id"]) for r in page)
+        if cursor is None:
+            break
+    assert len(seen) == 14
+    assert seen == sorted(seen, reverse=True)
+
+    page, cursor = store.list_records(
+        data_type="prospects", since="2025-09-03T00:00:00", until="2025-09-05T23:59:59", limit=10
+    )
+    assert [r["id"] for r in page] == ["5", "4", "3"]
+    assert all(r["type"] == "prospects" for r in page)
+    assert cursor is None
+
+
+def test_range_filters_compare_offset_timestamps_by_time(tmp_path):
+    store = DataStore(str(tmp_path / "store.db"))
+    for hour in (8, 10, 12):
+        store.insert("prospects", {}, received_at=f"2025-09-03T{hour:02d}:00:00")
+
+    # 10:00 local time, written with a +02:00 offset and then in UTC
+    local_ten = datetime(2025, 9, 3, 10).astimezone()
+    for offset in (timezone(timedelta(hours=2)), timezone.utc):
+        since = local_ten.astimezone(offset).isoformat()
+        page, _ = store.list_records(since=since)
+        assert [r["received_at"] for r in page] == ["2025-09-03T12:00:00", "2025-09-03T10:00:00"]
+        page, _ = store.list_records(until=since)
+        assert [r["received_at"] for r in page] == ["2025-09-03T10:00:00", "2025-09-03T08:00:00"]
+
+    # Offset timestamps given at insert time are stored in the same form
+    record = store.insert("prospects", {}, received_at=local_ten.astimezone(timezone.utc).isoformat())
+    assert record["received_at"] == "2025-09-03T10:00:00"
@@ -5,6 +5,8 @@ import { useToast } from "@/hooks/use-toast";
 import { useNavigate } from "react-router-dom";
 import { StartupInfo, Prospect } from "./TeamList";
 
+const API_URL = "http://127.0.0.1:8000";
+
 interface PredictionPanelProps {
   startupInfo: StartupInfo,
   prospects: Prospect[],
@@ -23,7 +25,7 @@ export function AnalysisButton({ startupInfo, prospects, hasProspects }: Predict
     });
     
     try {
-      const response = await fetch('http://127.0.0.1:8000/api/analyse', {
+      const response = await fetch(`${API_URL}/api/analyse`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'  // Added this header
@@ -37,17 +39,54 @@ export function AnalysisButton({ startupInfo, prospects, hasProspects }: Predict
       });
 
       if (response.ok) {
-        const result = await response.json();
-        console.log('Success:', result);
-        
-        toast({
-          title: "Analysis Complete",
-          description: "Redirecting to report..."
+        const { job_id } = await response.json();
+
+        // Follow the job's partial results as they are produced
+        const events = new EventSource(`${API_URL}/api/analyse/${job_id}/events`);
+
+        events.addEventListener("founder_complete", (event) => {
+          const { founder_name } = JSON.parse((event as MessageEvent).data);
+          toast({
+            title: "Founder Research Ready",
+            description: `Finished gathering data for ${founder_name}`
+          });
+        });
+
+        events.addEventListener("completed", (event) => {
+          events.close();
+          const { result } = JSON.parse((event as MessageEvent).data);
+          console.log('Success:', result);
+
+          toast({
+            title: "Analysis Complete",
+            description: "Redirecting to report..."
+          });
+
+          // Navigate to report page with results
+          console.log(JSON.stringify(result));
+          navigate("/ReportPending", { state: { analysisResult: result } });
+        });
+
+        events.onerror = () => {
+          // Dropped connections are retried by the browser, resuming after the
+          // last event; a closed stream (e.g. an unknown job id) is final
+          if (events.readyState !== EventSource.CLOSED) return;
+          events.close();
+          toast({
+            title: "Analysis Unavailable",
+            description: "Lost track of the analysis job. Please start it again.",
+            variant: "destructive"
+          });
+        };
+
+        events.addEventListener("failed", (event) => {
+          events.close();
+          const { error } = JSON.parse((event as MessageEvent).data);
+          toast({
+            title: "Analysis Failed",
+            description: error
+          });
         });
-        
-        // Navigate to report page with results
-        console.log(JSON.stringify(result));
-        navigate("/ReportPending", { state: { analysisResult: result } });
       }
 
     } catch (e) {